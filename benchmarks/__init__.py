@@ -0,0 +1,4 @@
+"""Performance benchmarks for cowsim.
+
+See `benchmarks/README.md` for how to run them.
+"""
@@ -0,0 +1,373 @@
+from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.entity.population import Population
+from cowsim.environment.cowpen import CowPen
+from cowsim.environment.pipeline import Pipeline
+from cowsim.environment.report import COLUMNAR_FORMAT
+from typing import Callable
+import cowsim
+import gc
+import numpy as np
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+# Herd sizes timed by default.
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+# Steps run before timing, so that the recorder holds data and the herd has
+# settled.
+WARMUP_STEPS = 2
+
+# Phases of CowPen.step, keyed by benchmark name.
+PHASES = {
+    "recording": lambda cowpen: cowpen._recording_phase(),
+    "feeding": lambda cowpen: cowpen._feeding_phase(),
+    "reproduction": lambda cowpen: cowpen._reproduction_phase(),
+    "energy_expenditure": lambda cowpen: cowpen._energy_expenditure_phase(),
+    "population_pruning": lambda cowpen: cowpen._population_pruning_phase(),
+    "milk_production": lambda cowpen: cowpen._milk_production_phase(),
+    "methane_production": lambda cowpen: cowpen._methane_production_phase(),
+    "step": lambda cowpen: cowpen.step(),
+    "fused_step": lambda cowpen: cowpen.step(),
+}
+
+# Benchmarks run on a cow pen stepping through its fused Pipeline, with the
+# default chunk size. Only available in VECTORIZED_MODE.
+PIPELINE_BENCHMARKS = ["fused_step"]
+
+# Benchmark name of the report.
+REPORT = "report"
+BENCHMARKS = [*PHASES, REPORT]
+
+
+def make_cowpen(
+    size: int,
+    mode: str = CowPen.VECTORIZED_MODE,
+    seed: int = 0,
+    chunk_size: int = None,
+) -> CowPen:
+    """Create a cow pen with a herd of `size` purple angus, warmed up by
+    WARMUP_STEPS steps.
+
+    The capacity leaves room for the herd to grow, so that timings are not
+    dominated by overpopulation pruning.
+
+    Parameters
+    ----------
+    size : int
+        Initial herd size.
+
+    mode : str
+        Simulation mode of the cow pen.
+
+    seed : int
+        Seed of the cow pen.
+
+    chunk_size : int
+        Chunk size of the fused pipeline of the cow pen, if any.
+
+    Returns
+    -------
+    CowPen
+        The cow pen.
+    """
+    cowpen = CowPen(
+        [(PurpleAngus, size)],
+        max_capacity=2 * size,
+        max_steps=WARMUP_STEPS + 1_000_000,
+        mode=mode,
+        seed=seed,
+        chunk_size=chunk_size,
+    )
+    for _ in range(WARMUP_STEPS):
+        cowpen.step()
+    return cowpen
+
+
+def mode_benchmarks(mode: str) -> [str]:
+    """Benchmarks available in a simulation mode.
+
+    Parameters
+    ----------
+    mode : str
+        Simulation mode of the cow pen.
+
+    Returns
+    -------
+    [str]
+        BENCHMARKS, without PIPELINE_BENCHMARKS outside VECTORIZED_MODE.
+    """
+    if mode == CowPen.VECTORIZED_MODE:
+        return BENCHMARKS
+    return [b for b in BENCHMARKS if b not in PIPELINE_BENCHMARKS]
+
+
+def benchmark_cowpen(
+    benchmark: str, size: int, mode: str = CowPen.VECTORIZED_MODE, seed: int = 0
+) -> CowPen:
+    """Create the warmed up cow pen a benchmark runs on.
+
+    Parameters
+    ----------
+    benchmark : str
+        One of BENCHMARKS.
+
+    size : int
+        Initial herd size.
+
+    mode : str
+        Simulation mode of the cow pen.
+
+    seed : int
+        Seed of the cow pen.
+
+    Returns
+    -------
+    CowPen
+        The cow pen, with a fused pipeline for PIPELINE_BENCHMARKS.
+
+    Raises
+    ------
+    ValueError
+        If the benchmark is not available in the mode.
+    """
+    if benchmark not in mode_benchmarks(mode):
+        raise ValueError(f"Benchmark {benchmark} is not available in {mode} mode")
+    chunk_size = Pipeline.CHUNK_SIZE if benchmark in PIPELINE_BENCHMARKS else None
+    return make_cowpen(size, mode, seed, chunk_size)
+
+
+def benchmark_callable(
+    benchmark: str, report_format: str = COLUMNAR_FORMAT
+) -> Callable[[CowPen], None]:
+    """Function running a benchmark once on a cow pen.
+
+    Parameters
+    ----------
+    benchmark : str
+        One of BENCHMARKS.
+
+    report_format : str
+        Report format written by the REPORT benchmark.
+
+    Returns
+    -------
+    Callable[[CowPen], None]
+        The benchmarked function.
+    """
+    if benchmark != REPORT:
+        return PHASES[benchmark]
+
+    def report(cowpen: CowPen) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cowpen.report(directory, report_format)
+
+    return report
+
+
+def time_benchmark(
+    benchmark: str,
+    size: int,
+    repeat: int = 5,
+    mode: str = CowPen.VECTORIZED_MODE,
+    seed: int = 0,
+    report_format: str = COLUMNAR_FORMAT,
+) -> dict:
+    """Time a benchmark at one herd size.
+
+    Phases mutate the herd, so each repetition runs on the state left by the
+    previous one. Garbage is collected before every repetition.
+
+    Parameters
+    ----------
+    benchmark : str
+        One of BENCHMARKS.
+
+    size : int
+        Initial herd size.
+
+    repeat : int
+        Number of timed repetitions.
+
+    mode : str
+        Simulation mode of the cow pen.
+
+    seed : int
+        Seed of the cow pen.
+
+    report_format : str
+        Report format written by the REPORT benchmark.
+
+    Returns
+    -------
+    dict
+        The benchmark, size and herd size after warming up, with the wall
+        times of each repetition (in seconds) and their min, median, mean and
+        max.
+    """
+    cowpen = benchmark_cowpen(benchmark, size, mode, seed)
+    herd = sum(len(entities) for entities in cowpen._entities.values())
+    function = benchmark_callable(benchmark, report_format)
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function(cowpen)
+        times.append(time.perf_counter() - start)
+
+    return {
+        "benchmark": benchmark,
+        "size": size,
+        "herd": herd,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "max": max(times),
+        "times": times,
+    }
+
+
+def memory_per_cow(size: int, seed: int = 0) -> dict:
+    """Measure the memory held by a herd, per cow.
+
+    The herd is built once as a list of PurpleAngus instances (as in
+    OBJECT_MODE) and once as a Population (as in VECTORIZED_MODE), and the
+    memory allocated by each is traced with tracemalloc.
+
+    Parameters
+    ----------
+    size : int
+        Herd size.
+
+    seed : int
+        Seed of the generated herd.
+
+    Returns
+    -------
+    dict
+        The size and the number of bytes per cow of each representation.
+    """
+    result = {"size": size}
+    for name, build in (
+        ("object", lambda rng: [PurpleAngus.generate(rng) for _ in range(size)]),
+        ("population", lambda rng: make_population(size, rng)),
+    ):
+        rng = np.random.default_rng(seed)
+        gc.collect()
+        tracemalloc.start()
+        herd = build(rng)
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del herd
+        result[f"{name}_bytes_per_cow"] = allocated / size
+    return result
+
+
+def make_population(size: int, rng: np.random.Generator) -> Population:
+    """Generate a Population of `size` purple angus.
+
+    Parameters
+    ----------
+    size : int
+        Herd size.
+
+    rng : np.random.Generator
+        Generator of the herd attributes.
+
+    Returns
+    -------
+    Population
+        The population.
+    """
+    population = Population(PurpleAngus, size)
+    population.extend(
+        np.arange(size, dtype=np.int64), *PurpleAngus.generate_batch(size, rng)
+    )
+    return population
+
+
+def metadata(mode: str, seed: int, repeat: int, report_format: str) -> dict:
+    """Environment and settings of a benchmark run.
+
+    Parameters
+    ----------
+    mode : str
+        Simulation mode benchmarked.
+
+    seed : int
+        Seed of the benchmarked cow pens.
+
+    repeat : int
+        Number of timed repetitions.
+
+    report_format : str
+        Report format benchmarked.
+
+    Returns
+    -------
+    dict
+        JSON serializable description of the run, including the git commit
+        of the working tree if available.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "cowsim": cowsim.__version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "mode": mode,
+        "seed": seed,
+        "repeat": repeat,
+        "report_format": report_format,
+    }
+
+
+def compare(baseline: dict, current: dict) -> [dict]:
+    """Compare the results of two benchmark runs.
+
+    Parameters
+    ----------
+    baseline : dict
+        Results of the reference run, as written by the runner.
+
+    current : dict
+        Results of the run to compare.
+
+    Returns
+    -------
+    [dict]
+        For every benchmark and size in both runs, the baseline and current
+        median times and their ratio (current / baseline, above 1 when the
+        current run is slower).
+    """
+    medians = {(r["benchmark"], r["size"]): r["median"] for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        key = (result["benchmark"], result["size"])
+        if key not in medians:
+            continue
+        rows.append(
+            {
+                "benchmark": key[0],
+                "size": key[1],
+                "baseline": medians[key],
+                "current": result["median"],
+                "ratio": result["median"] / medians[key] if medians[key] else None,
+            }
+        )
+    return rows
@@ -0,0 +1,41 @@
+"""CowPen phase benchmarks for pytest-benchmark.
+
+    pytest benchmarks --benchmark-json results.json
+
+Herd sizes default to those up to 100k. Set COWSIM_BENCHMARK_SIZES to a
+comma-separated list to override them (e.g. "1000,1000000").
+"""
+
+from benchmarks.harness import (
+    BENCHMARKS,
+    DEFAULT_SIZES,
+    benchmark_callable,
+    benchmark_cowpen,
+)
+import os
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [
+    int(size)
+    for size in os.environ.get(
+        "COWSIM_BENCHMARK_SIZES",
+        ",".join(str(size) for size in DEFAULT_SIZES if size <= 100_000),
+    ).split(",")
+]
+
+
+class PhasesTest:
+    """Benchmarks of the CowPen phases."""
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("size", SIZES)
+    @pytest.mark.parametrize("name", BENCHMARKS)
+    def test_benchmark(self, benchmark, name, size):
+        """Time one phase at one herd size."""
+        cowpen = benchmark_cowpen(name, size)
+        benchmark.extra_info["herd"] = sum(
+            len(entities) for entities in cowpen._entities.values()
+        )
+        benchmark(benchmark_callable(name), cowpen)
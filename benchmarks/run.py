@@ -0,0 +1,138 @@
+"""Standalone benchmark runner.
+
+Run from the repository root with cowsim installed (or `source/` on the
+Python path):
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare baseline.json --output results.json
+"""
+
+from benchmarks.harness import (
+    BENCHMARKS,
+    DEFAULT_SIZES,
+    compare,
+    memory_per_cow,
+    metadata,
+    mode_benchmarks,
+    time_benchmark,
+)
+from cowsim.environment.cowpen import CowPen
+from cowsim.environment.report import COLUMNAR_FORMAT, REPORT_FORMATS
+from cowsim.utils import LOG
+import click
+import json
+import logging
+
+
+@click.command()
+@click.option(
+    "-b",
+    "--benchmark",
+    "benchmarks",
+    type=click.Choice(BENCHMARKS),
+    multiple=True,
+    help="Benchmark to run. Defaults to all of those available in the mode.",
+)
+@click.option(
+    "-n",
+    "--size",
+    "sizes",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help=f"Initial herd size to run. Defaults to {DEFAULT_SIZES}.",
+)
+@click.option(
+    "-r",
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=5,
+    help="Number of timed repetitions.",
+)
+@click.option(
+    "-m",
+    "--mode",
+    type=click.Choice(CowPen.MODES),
+    default=CowPen.VECTORIZED_MODE,
+    help="Simulation mode to benchmark.",
+)
+@click.option("--seed", type=click.INT, default=0, help="Seed of the cow pens.")
+@click.option(
+    "-f",
+    "--report-format",
+    "report_format",
+    type=click.Choice(REPORT_FORMATS),
+    default=COLUMNAR_FORMAT,
+    help="Report format written by the report benchmark.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the results as JSON to this file.",
+)
+@click.option(
+    "--compare",
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Compare median times against the JSON results of an earlier run.",
+)
+@click.option(
+    "--memory/--no-memory",
+    "memory",
+    default=False,
+    help="Also measure the memory held per cow by object and Population herds.",
+)
+def main(
+    benchmarks, sizes, repeat, mode, seed, report_format, output, baseline, memory
+):
+    """Time each CowPen phase and the report across herd sizes."""
+    LOG.setLevel(logging.WARNING)
+
+    unavailable = set(benchmarks) - set(mode_benchmarks(mode))
+    if unavailable:
+        raise click.BadParameter(
+            f"not available in {mode} mode: {', '.join(sorted(unavailable))}",
+            param_hint="'--benchmark'",
+        )
+
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        for benchmark in benchmarks or mode_benchmarks(mode):
+            result = time_benchmark(benchmark, size, repeat, mode, seed, report_format)
+            results.append(result)
+            click.echo(
+                f"{benchmark:>20} {size:>9} "
+                f"median {result['median'] * 1e3:10.3f} ms "
+                f"min {result['min'] * 1e3:10.3f} ms"
+            )
+
+    report = {
+        "metadata": metadata(mode, seed, repeat, report_format),
+        "results": results,
+    }
+    if memory:
+        report["memory"] = []
+        for size in sizes or DEFAULT_SIZES:
+            result = memory_per_cow(size, seed)
+            report["memory"].append(result)
+            click.echo(
+                f"{'memory':>20} {size:>9} "
+                f"object {result['object_bytes_per_cow']:8.1f} B/cow "
+                f"population {result['population_bytes_per_cow']:8.1f} B/cow"
+            )
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if baseline is not None:
+        with open(baseline) as file:
+            rows = compare(json.load(file), report)
+        for row in rows:
+            ratio = "n/a" if row["ratio"] is None else f"{row['ratio']:.2f}x"
+            click.echo(f"{row['benchmark']:>20} {row['size']:>9} {ratio:>8}")
+
+
+if __name__ == "__main__":
+    main()
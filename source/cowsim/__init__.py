@@ -0,0 +1,6 @@
+from importlib.metadata import PackageNotFoundError, version
+
+try:
+    __version__ = version("cowsim")
+except PackageNotFoundError:
+    __version__ = "unknown"
@@ -1,14 +1,42 @@
 import click
+from cowsim.utils.logger import (
+    DEFAULT_LEVEL,
+    LEVELS,
+    set_level,
+    start_async_logging,
+    stop_async_logging,
+)
+from .ensemble import ensemble
 from .run import run
+from .sweep import sweep
 
 
 @click.group()
 @click.version_option()
-def root():
+@click.option(
+    "--log-level",
+    "log_level",
+    type=click.Choice(list(LEVELS), case_sensitive=False),
+    default=DEFAULT_LEVEL,
+    help="Set the level of messages that are logged.",
+)
+@click.option(
+    "--async-log/--no-async-log",
+    "async_log",
+    default=False,
+    help="Format and write log messages on a background thread.",
+)
+@click.pass_context
+def root(ctx, log_level, async_log):
     """A simple cow pen simulator."""
-    pass
+    set_level(log_level)
+    if async_log:
+        listener = start_async_logging()
+        ctx.call_on_close(lambda: stop_async_logging(listener))
 
 
 def main():
     root.add_command(run)
+    root.add_command(ensemble)
+    root.add_command(sweep)
     root()
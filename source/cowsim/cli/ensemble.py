@@ -0,0 +1,83 @@
+import click
+from cowsim import engine
+from cowsim.cli.run import ENTITY_CHOICES, ENVIRONMENT_CHOICES
+
+
+@click.command()
+@click.option(
+    "-e",
+    "--environment",
+    type=click.Choice(ENVIRONMENT_CHOICES, case_sensitive=False),
+    default=None,
+    help="Set the simulation environment.",
+)
+@click.option(
+    "-t",
+    "--entity",
+    "entities",
+    type=(str, int),
+    default=None,
+    multiple=True,
+    help=f"Set entities and quantity to run in simulation. Options: {ENTITY_CHOICES}",
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    "output_dir",
+    type=click.Path(exists=False),
+    default="./data",
+    help="Output directory for the ensemble summaries.",
+)
+@click.option(
+    "-c",
+    "--capacity",
+    "capacity",
+    type=click.INT,
+    default=100,
+    help="Set the max capacity of the environment.",
+)
+@click.option(
+    "-s",
+    "--steps",
+    "steps",
+    type=click.INT,
+    default=365,
+    help="Set the number of simulation steps to run.",
+)
+@click.option(
+    "-n",
+    "--replicates",
+    "replicates",
+    type=click.IntRange(min=1),
+    default=10,
+    help="Set the number of independent replicates to run.",
+)
+@click.option(
+    "--seed",
+    "seed",
+    type=click.INT,
+    default=None,
+    help="Seed the ensemble so that its replicates can be reproduced.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Set the number of worker processes. Defaults to the number of CPUs.",
+)
+def ensemble(
+    environment, entities, output_dir, capacity, steps, replicates, seed, workers
+):
+    """Run independent replicates of a simulation in parallel and summarize them."""
+    engine.ensemble(
+        environment=environment,
+        entities=entities,
+        output_dir=output_dir,
+        capacity=capacity,
+        steps=steps,
+        replicates=replicates,
+        seed=seed,
+        workers=workers,
+    )
@@ -2,6 +2,7 @@ import click
 from cowsim import engine
 from cowsim.entity.cow.purple_angus import PurpleAngus
 from cowsim.environment.cowpen import CowPen
+from cowsim.environment.report import CSV_FORMAT, REPORT_FORMATS
 
 ENVIRONMENT_CHOICES = [CowPen.name]
 ENTITY_CHOICES = [PurpleAngus.name]
@@ -48,12 +49,152 @@ ENTITY_CHOICES = [PurpleAngus.name]
     default=365,
     help="Set the number of simulation steps to run.",
 )
-def run(environment, entities, output_dir, capacity, steps):
+@click.option(
+    "--stream/--no-stream",
+    "stream",
+    default=False,
+    help="Stream per-step data to long-format CSVs in the output directory during the run.",
+)
+@click.option(
+    "-f",
+    "--report-format",
+    "report_format",
+    type=click.Choice(REPORT_FORMATS, case_sensitive=False),
+    default=CSV_FORMAT,
+    help="Set the report format. 'columnar' writes Parquet if pyarrow is installed, or NumPy archives otherwise.",
+)
+@click.option(
+    "--seed",
+    "seed",
+    type=click.INT,
+    default=None,
+    help="Seed the simulation so that it can be reproduced.",
+)
+@click.option(
+    "--checkpoint-every",
+    "checkpoint_every",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Save a checkpoint to the output directory every N steps.",
+)
+@click.option(
+    "--resume/--no-resume",
+    "resume",
+    default=False,
+    help="Resume from the checkpoint in the output directory, if there is one.",
+)
+@click.option(
+    "--timings/--no-timings",
+    "timings",
+    default=False,
+    help="Measure the wall time, allocations and herd size of each phase of each step, and write them to timings.csv in the output directory.",
+)
+@click.option(
+    "--profile/--no-profile",
+    "profile",
+    default=False,
+    help="Implies --timings, and also writes a cProfile dump of the run to profile.pstats in the output directory.",
+)
+@click.option(
+    "--uuids/--no-uuids",
+    "uuids",
+    default=False,
+    help="Also write a mapping of each cow's integer Id to a UUID to uuids.csv in the output directory.",
+)
+@click.option(
+    "--shards",
+    "shards",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Split each herd into N shards whose per-cow phases run on a thread pool.",
+)
+@click.option(
+    "--recording",
+    "recording",
+    type=click.Choice(CowPen.RECORDING_MODES, case_sensitive=False),
+    default=CowPen.FULL_RECORDING,
+    help="Set what is recorded. 'aggregate' only keeps per-step herd totals, means and quantiles instead of every cow's values.",
+)
+@click.option(
+    "--trace-fraction",
+    "trace_fraction",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    default=None,
+    help="With --recording aggregate, also record every value of this fraction of the cows, selected by a hash of their Id.",
+)
+@click.option(
+    "--trace-max",
+    "trace_max",
+    type=click.IntRange(min=0),
+    default=None,
+    help="With --recording aggregate, also record every value of at most N living cows of each type.",
+)
+@click.option(
+    "--backend",
+    "backend",
+    type=click.Choice(engine.BACKENDS, case_sensitive=False),
+    default=CowPen.NUMPY_BACKEND,
+    help="Set the kernels of the per-cow phases. 'python' steps each cow as a Python object, without --shards or --chunk-size. 'numba' fuses energy expenditure, milk and methane production into one compiled pass, and requires numba to be installed.",
+)
+@click.option(
+    "--chunk-size",
+    "chunk_size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Fuse consecutive per-cow phases into a single pass over each herd, in chunks of N cows.",
+)
+def run(
+    environment,
+    entities,
+    output_dir,
+    capacity,
+    steps,
+    stream,
+    report_format,
+    seed,
+    checkpoint_every,
+    resume,
+    timings,
+    profile,
+    uuids,
+    shards,
+    recording,
+    trace_fraction,
+    trace_max,
+    backend,
+    chunk_size,
+):
     """Run a cow pen simulation."""
+    if resume and stream:
+        raise click.UsageError("--resume cannot be combined with --stream.")
+    tracing = trace_fraction is not None or trace_max is not None
+    if tracing and recording != CowPen.AGGREGATE_RECORDING:
+        raise click.UsageError(
+            "--trace-fraction and --trace-max require --recording aggregate."
+        )
+    if backend == engine.PYTHON_BACKEND and (shards > 1 or chunk_size is not None):
+        raise click.UsageError(
+            "--shards and --chunk-size cannot be combined with --backend python."
+        )
+
     engine.run(
         environment=environment,
         entities=entities,
         output_dir=output_dir,
         capacity=capacity,
         steps=steps,
+        stream=stream,
+        report_format=report_format,
+        seed=seed,
+        checkpoint_every=checkpoint_every,
+        resume=resume,
+        timings=timings,
+        profile=profile,
+        uuids=uuids,
+        shards=shards,
+        recording=recording,
+        trace_fraction=trace_fraction,
+        trace_max=trace_max,
+        backend=backend,
+        chunk_size=chunk_size,
     )
@@ -0,0 +1,122 @@
+import click
+from cowsim import engine
+from cowsim.cli.run import ENTITY_CHOICES, ENVIRONMENT_CHOICES
+
+
+@click.command()
+@click.option(
+    "-e",
+    "--environment",
+    type=click.Choice(ENVIRONMENT_CHOICES, case_sensitive=False),
+    default=None,
+    help="Set the simulation environment.",
+)
+@click.option(
+    "-t",
+    "--entity",
+    "entities",
+    type=click.Choice(ENTITY_CHOICES),
+    multiple=True,
+    help="Add an entity type to the initial herd. Defaults to PurpleAngus.",
+)
+@click.option(
+    "-n",
+    "--herd-size",
+    "herd_sizes",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help="Sweep the initial quantity of each entity type. Defaults to 10.",
+)
+@click.option(
+    "-c",
+    "--capacity",
+    "capacities",
+    type=click.INT,
+    multiple=True,
+    help="Sweep the max capacity of the environment. Defaults to 100.",
+)
+@click.option(
+    "--servings",
+    "servings",
+    type=click.IntRange(min=0),
+    multiple=True,
+    help="Sweep the feed servings provided at each step. Defaults to the capacity.",
+)
+@click.option(
+    "-s",
+    "--steps",
+    "steps",
+    type=click.INT,
+    multiple=True,
+    help="Sweep the number of simulation steps to run. Defaults to 365.",
+)
+@click.option(
+    "--seed",
+    "seeds",
+    type=click.INT,
+    multiple=True,
+    help="Sweep the simulation seed. Defaults to 0.",
+)
+@click.option(
+    "--config",
+    "config_file",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Run the configurations listed in a JSON file instead of a grid.",
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    "output_dir",
+    type=click.Path(exists=False),
+    default="./data",
+    help="Output directory for the sweep results.",
+)
+@click.option(
+    "--cache-dir",
+    "cache_dir",
+    type=click.Path(exists=False, file_okay=False),
+    default=None,
+    help="Directory of cached cell results. Defaults to 'cache' in the output directory.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Set the number of worker processes. Defaults to the number of CPUs.",
+)
+def sweep(
+    environment,
+    entities,
+    herd_sizes,
+    capacities,
+    servings,
+    steps,
+    seeds,
+    config_file,
+    output_dir,
+    cache_dir,
+    workers,
+):
+    """Run a grid of simulation configurations, reusing cached results.
+
+    Every option that can be repeated adds values to its sweep dimension, and
+    one simulation is run for every combination of values. Results are
+    cached by configuration, seed and cowsim version, so only new cells are
+    run when a sweep is repeated.
+    """
+    engine.sweep(
+        environment=environment,
+        entities=entities,
+        herd_sizes=herd_sizes,
+        capacities=capacities,
+        servings=servings,
+        steps=steps,
+        seeds=seeds,
+        output_dir=output_dir,
+        config_file=config_file,
+        cache_dir=cache_dir,
+        workers=workers,
+    )
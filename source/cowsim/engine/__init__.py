@@ -1,8 +1,27 @@
+from cowsim.engine.ensemble import run_ensemble
+from cowsim.engine.sweep import ResultCache, cell, grid, run_sweep
 from cowsim.environment.cowpen import CowPen
+from cowsim.environment.profiler import PhaseProfiler
+from cowsim.environment.report import CSV_FORMAT
+from cowsim.environment.sink import CsvSink
 from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.utils import LOG
+import cProfile
+import json
+import logging
+import os
+import pathlib
 
 DEFAULT_PURPLE_ANGUS_POPULATION = 10
 
+CHECKPOINT_FILE = "checkpoint.npz"
+PROFILE_FILE = "profile.pstats"
+
+# Backend running each cow as a Python object, in CowPen.OBJECT_MODE. The
+# other backends are the kernels of CowPen.VECTORIZED_MODE.
+PYTHON_BACKEND = "python"
+BACKENDS = [PYTHON_BACKEND, *CowPen.BACKENDS]
+
 ENVIRONMENT_MAP = {
     CowPen.name: CowPen,
 }
@@ -12,13 +31,7 @@ ENTITY_MAP = {
 }
 
 
-def run(
-    environment: str,
-    entities: ((str, int)),
-    output_dir: str,
-    capacity: int,
-    steps: int,
-) -> None:
+def _resolve(environment: str, entities: (str, int)) -> (type, list):
     if environment is None:
         environment = CowPen.name
 
@@ -32,11 +45,163 @@ def run(
 
     env_cls = ENVIRONMENT_MAP[environment]
     entities = [(ENTITY_MAP[entity[0]], entity[1]) for entity in entities]
+    return env_cls, entities
+
+
+def run(
+    environment: str,
+    entities: (str, int),
+    output_dir: str,
+    capacity: int,
+    steps: int,
+    stream: bool = False,
+    report_format: str = CSV_FORMAT,
+    seed: int = None,
+    checkpoint_every: int = None,
+    resume: bool = False,
+    timings: bool = False,
+    profile: bool = False,
+    uuids: bool = False,
+    shards: int = 1,
+    recording: str = CowPen.FULL_RECORDING,
+    trace_fraction: float = None,
+    trace_max: int = None,
+    backend: str = CowPen.NUMPY_BACKEND,
+    chunk_size: int = None,
+) -> None:
+    env_cls, entities = _resolve(environment, entities)
+    mode = CowPen.VECTORIZED_MODE
+    if backend == PYTHON_BACKEND:
+        mode, backend = CowPen.OBJECT_MODE, CowPen.NUMPY_BACKEND
+    dir_path = pathlib.Path(output_dir)
+    checkpoint_path = dir_path.joinpath(CHECKPOINT_FILE)
+    sink = CsvSink(output_dir) if stream else None
+    profiler = PhaseProfiler() if timings or profile else None
+
+    if resume and checkpoint_path.is_file():
+        LOG.info("Resuming simulation from %s", checkpoint_path)
+        env_instance = env_cls.resume(checkpoint_path, sink=sink, profiler=profiler)
+    else:
+        env_instance = env_cls(
+            entities=entities,
+            max_capacity=capacity,
+            max_steps=steps,
+            sink=sink,
+            seed=seed,
+            mode=mode,
+            profiler=profiler,
+            shards=shards,
+            recording=recording,
+            trace_fraction=trace_fraction,
+            trace_max=trace_max,
+            backend=backend,
+            chunk_size=chunk_size,
+        )
+
+    if not dir_path.is_dir() and (checkpoint_every is not None or profile):
+        os.makedirs(dir_path)
+
+    run_profile = cProfile.Profile() if profile else None
+    if run_profile is not None:
+        run_profile.enable()
+    env_instance.run(checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every)
+    if run_profile is not None:
+        run_profile.disable()
+        run_profile.dump_stats(dir_path.joinpath(PROFILE_FILE))
+        LOG.info("Profile was written to %s", dir_path.joinpath(PROFILE_FILE))
+
+    env_instance.report(output_dir, report_format, uuids=uuids)
+    if profiler is not None and LOG.isEnabledFor(logging.INFO):
+        LOG.info("Time spent per phase:\n%s", profiler.summary().to_string())
+
+
+def ensemble(
+    environment: str,
+    entities: (str, int),
+    output_dir: str,
+    capacity: int,
+    steps: int,
+    replicates: int,
+    seed: int = None,
+    workers: int = None,
+) -> None:
+    env_cls, entities = _resolve(environment, entities)
+
+    def progress(index: int, summary: {str: float}) -> None:
+        LOG.info("Replicate %d finished", index)
+
+    runs, summary = run_ensemble(
+        env_cls,
+        entities,
+        capacity=capacity,
+        steps=steps,
+        replicates=replicates,
+        seed=seed,
+        workers=workers,
+        callback=progress,
+    )
+
+    dir_path = pathlib.Path(output_dir)
+    if not dir_path.is_dir():
+        os.makedirs(dir_path)
+    runs.to_csv(dir_path.joinpath("ensemble_runs.csv"))
+    summary.to_csv(dir_path.joinpath("ensemble_summary.csv"))
+
+
+def sweep(
+    environment: str,
+    entities: [str],
+    herd_sizes: [int],
+    capacities: [int],
+    servings: [int],
+    steps: [int],
+    seeds: [int],
+    output_dir: str,
+    config_file: str = None,
+    cache_dir: str = None,
+    workers: int = None,
+) -> None:
+    if environment is None:
+        environment = CowPen.name
+
+    if config_file is not None:
+        with open(config_file) as file:
+            entries = json.load(file)
+        defaults = {
+            "environment": environment,
+            "entities": [(PurpleAngus.name, DEFAULT_PURPLE_ANGUS_POPULATION)],
+            "capacity": CowPen.DEFAULT_MAX_CAPACITY,
+            "steps": CowPen.DEFAULT_STEPS,
+            "seed": 0,
+        }
+        configs = [cell(**{**defaults, **entry}) for entry in entries]
+    else:
+        configs = grid(
+            environment,
+            list(entities) or [PurpleAngus.name],
+            list(herd_sizes) or [DEFAULT_PURPLE_ANGUS_POPULATION],
+            list(capacities) or [CowPen.DEFAULT_MAX_CAPACITY],
+            list(servings) or [None],
+            list(steps) or [CowPen.DEFAULT_STEPS],
+            list(seeds) or [0],
+        )
+
+    dir_path = pathlib.Path(output_dir)
+    if not dir_path.is_dir():
+        os.makedirs(dir_path)
+    if cache_dir is None:
+        cache_dir = dir_path.joinpath("cache")
+    cache = ResultCache(cache_dir)
+
+    def progress(config: dict, cached: bool) -> None:
+        LOG.info("Cell %s %s", config, "was cached" if cached else "finished")
 
-    env_instance = env_cls(
-        entities=entities,
-        max_capacity=capacity,
-        max_steps=steps,
+    results = run_sweep(
+        configs,
+        ENVIRONMENT_MAP,
+        ENTITY_MAP,
+        cache=cache,
+        workers=workers,
+        callback=progress,
     )
-    env_instance.run()
-    env_instance.report(output_dir)
+    results.to_csv(dir_path.joinpath("sweep_results.csv"), index=False)
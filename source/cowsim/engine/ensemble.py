@@ -0,0 +1,289 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from cowsim.environment import Environment
+from cowsim.entity import Entity
+from cowsim.utils import LOG
+from typing import Callable, Type
+import logging
+import math
+import numpy as np
+import os
+import pandas as pd
+
+
+class SummaryAggregator:
+    """Aggregates run summaries one at a time into per-metric statistics.
+
+    Uses Welford's online algorithm, so summaries can be aggregated as they
+    arrive without being kept in memory.
+
+    Attributes
+    ----------
+    _count : Dict[str, int]
+        Number of summaries that reported each metric.
+
+    _mean : Dict[str, float]
+        Running mean of each metric.
+
+    _m2 : Dict[str, float]
+        Running sum of squared differences from the mean of each metric.
+    """
+
+    # z-score of a two-sided 95% confidence interval.
+    Z_95 = 1.959963984540054
+
+    def __init__(self):
+        """SummaryAggregator constructor."""
+        self._count = {}
+        self._mean = {}
+        self._m2 = {}
+
+    def add(self, summary: {str: float}) -> None:
+        """Add the summary of a single run.
+
+        Parameters
+        ----------
+        summary : Dict[str, float]
+            Value of each metric in the run.
+
+        Returns
+        -------
+        None
+        """
+        for metric, value in summary.items():
+            count = self._count.get(metric, 0) + 1
+            mean = self._mean.get(metric, 0.0)
+            delta = value - mean
+            mean += delta / count
+            self._m2[metric] = self._m2.get(metric, 0.0) + delta * (value - mean)
+            self._mean[metric] = mean
+            self._count[metric] = count
+
+    def result(self) -> pd.DataFrame:
+        """Statistics of every metric over the summaries added so far.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        pd.DataFrame
+            Data frame indexed by metric, with the count, mean, sample
+            standard deviation and the bounds of the normal-approximation 95%
+            confidence interval of the mean.
+        """
+        rows = []
+        for metric, count in self._count.items():
+            mean = self._mean[metric]
+            std = math.sqrt(self._m2[metric] / (count - 1)) if count > 1 else 0.0
+            half_width = SummaryAggregator.Z_95 * std / math.sqrt(count)
+            rows.append(
+                (metric, count, mean, std, mean - half_width, mean + half_width)
+            )
+
+        return pd.DataFrame(
+            rows, columns=["metric", "count", "mean", "std", "ci_low", "ci_high"]
+        ).set_index("metric")
+
+
+def replicate_seeds(seed: int, replicates: int) -> [int]:
+    """Derive an independent seed for each replicate.
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the whole ensemble. If None, fresh entropy is used.
+
+    replicates : int
+        Number of replicates.
+
+    Returns
+    -------
+    [int]
+        One seed per replicate.
+    """
+    return np.random.SeedSequence(seed).generate_state(replicates).tolist()
+
+
+def summary_kwargs(env_cls: Type[Environment]) -> dict:
+    """Keyword arguments of an environment that is only run for its summary.
+
+    Environments with an aggregate recording mode (such as the cow pen) keep
+    their summary totals apart from the recorder, so they are built with it
+    instead of recording every value of every entity.
+
+    Parameters
+    ----------
+    env_cls : Type[Environment]
+        Environment to simulate.
+
+    Returns
+    -------
+    dict
+        Keyword arguments of the environment.
+    """
+    recording = getattr(env_cls, "AGGREGATE_RECORDING", None)
+    return {} if recording is None else {"recording": recording}
+
+
+def run_replicate(
+    env_cls: Type[Environment],
+    entities: [(Type[Entity], int)],
+    capacity: int,
+    steps: int,
+    seed: int,
+    env_kwargs: dict = None,
+) -> {str: float}:
+    """Run a single simulation and summarize it.
+
+    Only the small summary dictionary is returned, so that nothing large has
+    to be sent back from a worker process. Environments are built with
+    `summary_kwargs`, so they do not record data the summary does not use.
+
+    Parameters
+    ----------
+    env_cls : Type[Environment]
+        Environment to simulate.
+
+    entities : [(Type[Entity], int)]
+        Entities and quantities to run in the simulation.
+
+    capacity : int
+        Max capacity of the environment.
+
+    steps : int
+        Number of simulation steps to run.
+
+    seed : int
+        Seed of the replicate. Running the environment with this seed
+        reproduces the replicate.
+
+    env_kwargs : dict
+        Other keyword arguments of the environment, overriding those of
+        `summary_kwargs`.
+
+    Returns
+    -------
+    Dict[str, float]
+        Summary of the run.
+    """
+    env_instance = env_cls(
+        entities=entities,
+        max_capacity=capacity,
+        max_steps=steps,
+        seed=seed,
+        **{**summary_kwargs(env_cls), **(env_kwargs or {})},
+    )
+    env_instance.run()
+    return env_instance.summary()
+
+
+def quiet_worker() -> None:
+    """Keep worker processes from logging every simulation step."""
+    LOG.setLevel(logging.WARNING)
+
+
+def run_ensemble(
+    env_cls: Type[Environment],
+    entities: [(Type[Entity], int)],
+    capacity: int,
+    steps: int,
+    replicates: int,
+    seed: int = None,
+    workers: int = None,
+    callback: Callable[[int, {str: float}], None] = None,
+    env_kwargs: dict = None,
+) -> (pd.DataFrame, pd.DataFrame):
+    """Run independent, seeded replicates of a simulation in parallel.
+
+    Replicates are spread over a pool of worker processes. Each one sends
+    back its summary as soon as it finishes, and the summary is aggregated
+    immediately.
+
+    Parameters
+    ----------
+    env_cls : Type[Environment]
+        Environment to simulate.
+
+    entities : [(Type[Entity], int)]
+        Entities and quantities to run in each simulation.
+
+    capacity : int
+        Max capacity of the environment.
+
+    steps : int
+        Number of simulation steps to run.
+
+    replicates : int
+        Number of replicates to run.
+
+    seed : int
+        Seed of the whole ensemble. If None, fresh entropy is used.
+
+    workers : int
+        Number of worker processes. Defaults to the number of CPUs. With a
+        single worker, replicates run in the calling process.
+
+    callback : Callable[[int, Dict[str, float]], None]
+        Called with the replicate index and summary of each finished run.
+
+    env_kwargs : dict
+        Other keyword arguments of each environment (see `run_replicate`).
+
+    Returns
+    -------
+    (pd.DataFrame, pd.DataFrame)
+        The seed and summary of each replicate (indexed by replicate) and the
+        statistics of each metric over all replicates.
+
+    Raises
+    ------
+    RuntimeError
+        If the number of replicates is non-positive.
+    """
+    if replicates <= 0:
+        raise RuntimeError("Number of replicates is non-positive.")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    seeds = replicate_seeds(seed, replicates)
+    aggregator = SummaryAggregator()
+    summaries = {}
+
+    def collect(index: int, summary: {str: float}) -> None:
+        summaries[index] = {"seed": seeds[index], **summary}
+        aggregator.add(summary)
+        if callback is not None:
+            callback(index, summary)
+
+    if workers == 1:
+        for index, replicate_seed in enumerate(seeds):
+            collect(
+                index,
+                run_replicate(
+                    env_cls, entities, capacity, steps, replicate_seed, env_kwargs
+                ),
+            )
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=quiet_worker
+        ) as executor:
+            futures = {
+                executor.submit(
+                    run_replicate,
+                    env_cls,
+                    entities,
+                    capacity,
+                    steps,
+                    replicate_seed,
+                    env_kwargs,
+                ): index
+                for index, replicate_seed in enumerate(seeds)
+            }
+            for future in as_completed(futures):
+                collect(futures[future], future.result())
+
+    runs = pd.DataFrame.from_dict(summaries, orient="index").sort_index()
+    runs.index.name = "replicate"
+    return runs, aggregator.result()
@@ -0,0 +1,387 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from cowsim.engine.ensemble import quiet_worker, summary_kwargs
+from cowsim.environment import Environment
+from cowsim.entity import Entity
+from typing import Callable, Type
+import cowsim
+import functools
+import hashlib
+import itertools
+import json
+import os
+import pandas as pd
+import pathlib
+
+# Keys of a sweep cell configuration.
+CONFIG_KEYS = ["environment", "entities", "capacity", "servings", "steps", "seed"]
+
+# Prefix of the summary columns of a sweep, which keeps summary metrics such
+# as `steps` from overwriting the configuration columns of the same name.
+RESULT_PREFIX = "result_"
+
+# Version of the cached sweep results. Bump it when a change outside the
+# cowsim sources (a dependency, say) changes the results of a cell.
+RESULTS_VERSION = 1
+
+
+def cell(
+    environment: str,
+    entities: [(str, int)],
+    capacity: int,
+    steps: int,
+    seed: int,
+    servings: int = None,
+) -> dict:
+    """Configuration of a single sweep cell, in canonical form.
+
+    Parameters
+    ----------
+    environment : str
+        Name of the environment to simulate.
+
+    entities : [(str, int)]
+        Name and quantity of each entity type in the initial herd.
+
+    capacity : int
+        Max capacity of the environment.
+
+    steps : int
+        Number of simulation steps to run.
+
+    seed : int
+        Seed of the simulation.
+
+    servings : int
+        Feed servings provided at each step. If None, the environment's
+        default is used.
+
+    Returns
+    -------
+    dict
+        The configuration, with a key for each of CONFIG_KEYS.
+    """
+    return {
+        "environment": environment,
+        "entities": [[name, int(quantity)] for name, quantity in entities],
+        "capacity": int(capacity),
+        "servings": None if servings is None else int(servings),
+        "steps": int(steps),
+        "seed": int(seed),
+    }
+
+
+def grid(
+    environment: str,
+    entities: [str],
+    herd_sizes: [int],
+    capacities: [int],
+    servings: [int],
+    steps: [int],
+    seeds: [int],
+) -> [dict]:
+    """Every combination of the swept parameters.
+
+    Parameters
+    ----------
+    environment : str
+        Name of the environment to simulate.
+
+    entities : [str]
+        Names of the entity types in the initial herd.
+
+    herd_sizes : [int]
+        Initial quantities of each entity type.
+
+    capacities : [int]
+        Max capacities of the environment.
+
+    servings : [int]
+        Feed servings provided at each step. None uses the environment's
+        default.
+
+    steps : [int]
+        Numbers of simulation steps to run.
+
+    seeds : [int]
+        Seeds of the simulation.
+
+    Returns
+    -------
+    [dict]
+        Configuration of each cell.
+    """
+    return [
+        cell(
+            environment,
+            [(name, herd_size) for name in entities],
+            capacity,
+            step_count,
+            seed,
+            serving_count,
+        )
+        for herd_size, capacity, serving_count, step_count, seed in itertools.product(
+            herd_sizes, capacities, servings, steps, seeds
+        )
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """Fingerprint of the cowsim sources.
+
+    The version of an editable install does not change with its sources, so
+    the cache key also covers the path and contents of every module of the
+    package. Computed once per process.
+
+    Returns
+    -------
+    str
+        Hex digest of the Python sources of the cowsim package.
+    """
+    package = pathlib.Path(cowsim.__file__).parent
+    digest = hashlib.sha256()
+    for path in sorted(package.rglob("*.py")):
+        digest.update(path.relative_to(package).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def config_hash(config: dict) -> str:
+    """Cache key of a cell.
+
+    Parameters
+    ----------
+    config : dict
+        Configuration of the cell.
+
+    Returns
+    -------
+    str
+        Hex digest of the configuration (seed included), the cowsim version,
+        `RESULTS_VERSION` and the `code_fingerprint`, so results are
+        recomputed when the code changes.
+    """
+    payload = json.dumps(
+        {
+            "config": config,
+            "version": cowsim.__version__,
+            "results_version": RESULTS_VERSION,
+            "code": code_fingerprint(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of the summaries of finished sweep cells.
+
+    Each summary is stored as a JSON file named after the cell's
+    `config_hash`.
+
+    Attributes
+    ----------
+    _directory : pathlib.Path
+        Directory that the cached summaries are stored in.
+    """
+
+    def __init__(self, directory: str):
+        """ResultCache constructor.
+
+        Parameters
+        ----------
+        directory : str
+            Directory to store the cached summaries in. It is created if it
+            does not exist.
+        """
+        self._directory = pathlib.Path(directory)
+        if not self._directory.is_dir():
+            os.makedirs(self._directory)
+
+    @property
+    def directory(self) -> pathlib.Path:
+        """Directory that the cached summaries are stored in."""
+        return self._directory
+
+    def get(self, key: str) -> {str: float}:
+        """Cached summary of a cell.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the cell.
+
+        Returns
+        -------
+        Dict[str, float]
+            The summary, or None if the cell is not cached.
+        """
+        path = self._directory.joinpath(f"{key}.json")
+        if not path.is_file():
+            return None
+        with open(path) as file:
+            return json.load(file)["summary"]
+
+    def put(self, key: str, config: dict, summary: {str: float}) -> None:
+        """Cache the summary of a cell.
+
+        The file is written under a temporary name and then renamed, so an
+        interrupted sweep never leaves a partial entry behind.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the cell.
+
+        config : dict
+            Configuration of the cell, stored alongside for reference.
+
+        summary : Dict[str, float]
+            Summary of the cell.
+
+        Returns
+        -------
+        None
+        """
+        path = self._directory.joinpath(f"{key}.json")
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as file:
+            json.dump({"config": config, "summary": summary}, file)
+        os.replace(tmp_path, path)
+
+
+def run_cell(
+    env_cls: Type[Environment],
+    entities: [(Type[Entity], int)],
+    config: dict,
+) -> {str: float}:
+    """Run the simulation of a single cell and summarize it.
+
+    The environment is built with `summary_kwargs`, so it does not record
+    data the summary does not use.
+
+    Parameters
+    ----------
+    env_cls : Type[Environment]
+        Environment to simulate.
+
+    entities : [(Type[Entity], int)]
+        Entities and quantities to run in the simulation.
+
+    config : dict
+        Configuration of the cell.
+
+    Returns
+    -------
+    Dict[str, float]
+        Summary of the run.
+    """
+    env_instance = env_cls(
+        entities=entities,
+        max_capacity=config["capacity"],
+        max_steps=config["steps"],
+        seed=config["seed"],
+        **summary_kwargs(env_cls),
+    )
+    if config["servings"] is not None:
+        env_instance.set_feed(env_instance.feed[0], config["servings"])
+    env_instance.run()
+    return env_instance.summary()
+
+
+def run_sweep(
+    configs: [dict],
+    environments: {str: Type[Environment]},
+    entities: {str: Type[Entity]},
+    cache: ResultCache = None,
+    workers: int = None,
+    callback: Callable[[dict, bool], None] = None,
+) -> pd.DataFrame:
+    """Run the cells of a parameter sweep in parallel.
+
+    Cells found in the cache are not run again. Every other cell is run in a
+    pool of worker processes and cached as soon as it finishes.
+
+    Parameters
+    ----------
+    configs : [dict]
+        Configuration of each cell, as returned by `cell`.
+
+    environments : Dict[str, Type[Environment]]
+        Environment class of each environment name.
+
+    entities : Dict[str, Type[Entity]]
+        Entity class of each entity name.
+
+    cache : ResultCache
+        Cache of finished cells, if any.
+
+    workers : int
+        Number of worker processes. Defaults to the number of CPUs. With a
+        single worker, cells run in the calling process.
+
+    callback : Callable[[dict, bool], None]
+        Called with the configuration of each finished cell and whether it
+        was found in the cache.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per cell (in the order of `configs`) with the configuration,
+        whether it was cached and its summary, whose columns are prefixed
+        with `RESULT_PREFIX`. Entities are written as `<name>:<quantity>`
+        joined by spaces.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    summaries = {}
+    cached = {}
+
+    def collect(index: int, summary: {str: float}, from_cache: bool) -> None:
+        summaries[index] = summary
+        cached[index] = from_cache
+        if cache is not None and not from_cache:
+            cache.put(config_hash(configs[index]), configs[index], summary)
+        if callback is not None:
+            callback(configs[index], from_cache)
+
+    pending = []
+    for index, config in enumerate(configs):
+        summary = cache.get(config_hash(config)) if cache is not None else None
+        if summary is not None:
+            collect(index, summary, True)
+        else:
+            pending.append(index)
+
+    def arguments(index: int) -> tuple:
+        config = configs[index]
+        return (
+            environments[config["environment"]],
+            [(entities[name], quantity) for name, quantity in config["entities"]],
+            config,
+        )
+
+    if workers == 1 or len(pending) <= 1:
+        for index in pending:
+            collect(index, run_cell(*arguments(index)), False)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=quiet_worker
+        ) as executor:
+            futures = {
+                executor.submit(run_cell, *arguments(index)): index for index in pending
+            }
+            for future in as_completed(futures):
+                collect(futures[future], future.result(), False)
+
+    rows = []
+    for index, config in enumerate(configs):
+        row = dict(config)
+        row["entities"] = " ".join(f"{name}:{qty}" for name, qty in config["entities"])
+        row["cached"] = cached[index]
+        row.update(
+            {f"{RESULT_PREFIX}{key}": value for key, value in summaries[index].items()}
+        )
+        rows.append(row)
+    return pd.DataFrame(rows)
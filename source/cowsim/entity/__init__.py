@@ -1,6 +1,7 @@
 from abc import abstractmethod
 from enum import Enum
-import uuid
+import itertools
+import numpy as np
 
 from cowsim.utils.named_abc import Named_ABC
 
@@ -32,12 +33,13 @@ class Entity(Named_ABC):
 
     @classmethod
     @abstractmethod
-    def generate(cls) -> "Entity":
+    def generate(cls, rng: np.random.Generator = None) -> "Entity":
         """Randomly generate an instance of a entity.
 
         Parameters
         ----------
-        none
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
 
         Returns
         -------
@@ -48,12 +50,13 @@ class Entity(Named_ABC):
 
     @classmethod
     @abstractmethod
-    def newborn(cls) -> "Entity":
+    def newborn(cls, rng: np.random.Generator = None) -> "Entity":
         """Generates a newborn entity (when two entities reproduce).
 
         Parameters
         ----------
-        none
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
 
         Returns
         -------
@@ -62,10 +65,11 @@ class Entity(Named_ABC):
         """
         ...
 
-
     @classmethod
     @abstractmethod
-    def should_reproduce(cls, entity_a: "Entity", entity_b: "Entity") -> bool:
+    def should_reproduce(
+        cls, entity_a: "Entity", entity_b: "Entity", rng: np.random.Generator = None
+    ) -> bool:
         """Determines if two entities should reproduce.
 
         Parameters
@@ -76,6 +80,9 @@ class Entity(Named_ABC):
         entity_b : Entity
             An arbitrary Entity instance
 
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
         Returns
         -------
         bool
@@ -104,7 +111,7 @@ class Entity(Named_ABC):
         ...
 
     @abstractmethod
-    def expend_calories(self) -> float:
+    def expend_calories(self, rng: np.random.Generator = None) -> float:
         """Calculates and expends entity's calories.
 
         If the calculated caloric expenditure falls below some minimum caloric
@@ -112,7 +119,8 @@ class Entity(Named_ABC):
 
         Parameters
         ----------
-        none
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
 
         Returns
         -------
@@ -144,7 +152,16 @@ class Entity(Named_ABC):
         """
         ...
 
-    def __init__(self, age: int, sex: Sex, calories: float, weight: float):
+    # Instances hold their attributes in slots rather than a __dict__, which
+    # keeps per-object herds small.
+    __slots__ = ("_id", "_age", "_sex", "_calories", "_weight")
+
+    # Identifiers of entities created without one, unique within the process.
+    _fallback_ids = itertools.count()
+
+    def __init__(
+        self, age: int, sex: Sex, calories: float, weight: float, id: int = None
+    ):
         """Entity class constructor.
 
         Parameters
@@ -161,6 +178,10 @@ class Entity(Named_ABC):
         weight : float
             The initial weight of the entity.
 
+        id : int
+            Identifier of the entity. Environments assign their own when the
+            entity joins them.
+
         Raises
         ------
         AssertionError
@@ -171,7 +192,7 @@ class Entity(Named_ABC):
         assert calories is not None
         assert weight is not None
 
-        self._id = uuid.uuid4()
+        self._id = next(Entity._fallback_ids) if id is None else id
 
         self._age = age
         self._sex = sex
@@ -179,13 +200,17 @@ class Entity(Named_ABC):
         self._weight = weight
 
     def __str__(self):
-        return f"{self.__class__.name} [{str(self._id)[:8]}]"
+        return f"{self.__class__.name} [{self._id}]"
 
     @property
-    def id(self) -> uuid.UUID:
-        """Unique identifier for entity."""
+    def id(self) -> int:
+        """Unique identifier for entity within its environment."""
         return self._id
 
+    @id.setter
+    def id(self, value: int) -> None:
+        self._id = value
+
     @property
     def age(self) -> int:
         """Age of entity."""
@@ -1,6 +1,9 @@
 from .. import Entity
 from abc import abstractmethod
+from cowsim.entity.population import Population
+from cowsim.utils.rng import as_generator
 from enum import Enum
+import numpy as np
 
 
 class Emotion(Enum):
@@ -17,6 +20,22 @@ class Emotion(Enum):
     SCARED = 8
     STRESSED = 9
 
+    @classmethod
+    def valence(cls, emotion: "Emotion") -> "Valence":
+        """Classification of an emotion, looked up in EMOTION_VALENCE.
+
+        Parameters
+        ----------
+        emotion : Emotion
+            Emotion in question.
+
+        Returns
+        -------
+        Valence
+            Whether the emotion is positive, neutral or negative.
+        """
+        return VALENCES[EMOTION_VALENCE[emotion.value]]
+
     @classmethod
     def is_positive(cls, emotion: "Emotion") -> bool:
         """Determines if emotion is classfied as positive.
@@ -31,11 +50,7 @@ class Emotion(Enum):
         bool
             True, if the emotion is classified as positive.
         """
-        match emotion:
-            case cls.CONTENT | cls.HAPPY | cls.EXCITED:
-                return True
-            case _:
-                return False
+        return EMOTION_VALENCE[emotion.value] == Valence.POSITIVE.value
 
     @classmethod
     def is_neutral(cls, emotion: "Emotion") -> bool:
@@ -51,11 +66,7 @@ class Emotion(Enum):
         bool
             True, if the emotion is classified as neutral.
         """
-        match emotion:
-            case cls.CURIOUS | cls.MELANCHOLIC | cls.NOSTALGIC:
-                return True
-            case _:
-                return False
+        return EMOTION_VALENCE[emotion.value] == Valence.NEUTRAL.value
 
     @classmethod
     def is_negative(cls, emotion: "Emotion") -> bool:
@@ -71,11 +82,58 @@ class Emotion(Enum):
         bool
             True, if the emotion is classified as negative.
         """
-        match emotion:
-            case cls.TIRED | cls.UPSET | cls.SCARED | cls.STRESSED:
-                return True
-            case _:
-                return False
+        return EMOTION_VALENCE[emotion.value] == Valence.NEGATIVE.value
+
+
+class Valence(Enum):
+    """Enumeration class for classifying emotions."""
+
+    POSITIVE = 0
+    NEUTRAL = 1
+    NEGATIVE = 2
+
+
+# Every emotion and valence, indexed by value.
+EMOTIONS = tuple(Emotion)
+VALENCES = tuple(Valence)
+
+# Valence of each emotion.
+EMOTION_CLASSIFICATION = {
+    Emotion.CONTENT: Valence.POSITIVE,
+    Emotion.HAPPY: Valence.POSITIVE,
+    Emotion.EXCITED: Valence.POSITIVE,
+    Emotion.CURIOUS: Valence.NEUTRAL,
+    Emotion.MELANCHOLIC: Valence.NEUTRAL,
+    Emotion.NOSTALGIC: Valence.NEUTRAL,
+    Emotion.TIRED: Valence.NEGATIVE,
+    Emotion.UPSET: Valence.NEGATIVE,
+    Emotion.SCARED: Valence.NEGATIVE,
+    Emotion.STRESSED: Valence.NEGATIVE,
+}
+
+# Valence value of each emotion, indexed by emotion value.
+EMOTION_VALENCE = np.array(
+    [EMOTION_CLASSIFICATION[e].value for e in EMOTIONS], dtype=np.int8
+)
+
+
+def sample_emotions(count: int, rng: np.random.Generator = None) -> np.ndarray:
+    """Sample emotions uniformly, in bulk.
+
+    Parameters
+    ----------
+    count : int
+        Number of emotions to sample.
+
+    rng : np.random.Generator
+        Generator to draw from. Defaults to the shared default generator.
+
+    Returns
+    -------
+    np.ndarray
+        Emotion value of each sample, as int8.
+    """
+    return as_generator(rng).integers(0, len(EMOTIONS), count, dtype=np.int8)
 
 
 class CauseOfDeath(Enum):
@@ -87,14 +145,317 @@ class CauseOfDeath(Enum):
     OVERWEIGHT = 4
 
 
-class Cow(Entity):
+class BatchFallback:
+    """Bulk interface of a cow species, implemented by looping over the
+    per-instance methods.
+
+    VECTORIZED_MODE simulations call these classmethods on whole Population
+    stores. Species inherit these fallbacks from Cow, so any species runs in
+    that mode, at the cost of materializing every cow as an instance. A
+    species opts into the fast engine by overriding them with array kernels
+    and returning True from `supports_batch`.
+
+    Methods that mutate cows write the calories and weight of the
+    instances back to the population.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """Whether the species implements the bulk interface natively.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        bool
+            False, as the bulk methods loop over per-instance methods.
+        """
+        return False
+
+    @classmethod
+    def generate_batch(
+        cls, count: int, rng: np.random.Generator = None
+    ) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """Randomly generate the attributes of `count` cows, with `generate`.
+
+        Parameters
+        ----------
+        count : int
+            Number of cows to generate.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+            Arrays of age, sex, calories and weight, as accepted by
+            `Population.extend`.
+        """
+        return cls._attributes([cls.generate(rng) for _ in range(count)])
+
+    @classmethod
+    def newborn_batch(
+        cls, count: int, rng: np.random.Generator = None
+    ) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """Generate the attributes of `count` newborns, with `newborn`.
+
+        Parameters
+        ----------
+        count : int
+            Number of newborns to generate.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+            Arrays of age, sex, calories and weight, as accepted by
+            `Population.extend`.
+        """
+        return cls._attributes([cls.newborn(rng) for _ in range(count)])
+
+    @classmethod
+    def fertile_batch(cls, population: Population) -> np.ndarray:
+        """Mask of the cows that may reproduce.
+
+        Parameters
+        ----------
+        population : Population
+            The population.
+
+        Returns
+        -------
+        np.ndarray
+            Every cow, since `should_reproduce` decides which pairs are
+            fertile.
+        """
+        return np.ones(len(population), dtype=bool)
+
+    @classmethod
+    def cause_of_death_batch(cls, population: Population) -> np.ndarray:
+        """Bulk equivalent of `cause_of_death`.
+
+        Parameters
+        ----------
+        population : Population
+            The population.
+
+        Returns
+        -------
+        np.ndarray
+            CauseOfDeath value of each cow, as int8.
+        """
+        return cls._each(population, lambda cow: cow.cause_of_death().value, np.int8)
+
+    @classmethod
+    def expend_calories_batch(
+        cls, population: Population, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Bulk equivalent of `expend_calories`.
+
+        Parameters
+        ----------
+        population : Population
+            The population.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        np.ndarray
+            Caloric expenditure of each cow (in kcal).
+
+        Notes
+        -----
+        This method mutates the population.
+        """
+        return cls._each(population, lambda cow: cow.expend_calories(rng), np.float64)
+
+    @classmethod
+    def caloric_intake_batch(
+        cls, population: Population, kcal: np.ndarray
+    ) -> np.ndarray:
+        """Bulk equivalent of `caloric_intake`.
+
+        Parameters
+        ----------
+        population : Population
+            The population.
+
+        kcal : np.ndarray
+            Calories to be ingested by each cow.
+
+        Returns
+        -------
+        np.ndarray
+            Caloric increase of each cow.
+
+        Notes
+        -----
+        This method mutates the population.
+        """
+        return cls._each(
+            population, lambda cow, k: cow.caloric_intake(k), np.float64, kcal
+        )
+
+    @classmethod
+    def milk_production_batch(
+        cls, population: Population, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Bulk equivalent of `milk_production`.
+
+        Parameters
+        ----------
+        population : Population
+            The population.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        np.ndarray
+            Milk produced by each cow (in liters).
+        """
+        return cls._each(population, lambda cow: cow.milk_production(rng), np.float64)
+
+    @classmethod
+    def methane_production_batch(cls, population: Population) -> np.ndarray:
+        """Bulk equivalent of `methane_production`.
+
+        Parameters
+        ----------
+        population : Population
+            The population.
+
+        Returns
+        -------
+        np.ndarray
+            Methane produced by each cow (in kilograms).
+        """
+        return cls._each(population, lambda cow: cow.methane_production(), np.float64)
+
+    @classmethod
+    def metabolism_batch(
+        cls,
+        population: Population,
+        rng: np.random.Generator,
+        milk: np.ndarray,
+        methane: np.ndarray,
+    ) -> np.ndarray:
+        """Energy expenditure, then milk and methane production, of a
+        population.
+
+        Species may fuse the three into a single pass over the population.
+        By default, `expend_calories_batch`, `milk_production_batch` and
+        `methane_production_batch` run one after the other.
+
+        Parameters
+        ----------
+        population : Population
+            The population.
+
+        rng : np.random.Generator
+            Generator to draw from.
+
+        milk : np.ndarray
+            Output milk production of each cow (in liters).
+
+        methane : np.ndarray
+            Output methane production of each cow (in kilograms).
+
+        Returns
+        -------
+        np.ndarray
+            Caloric expenditure of each cow (in kcal).
+
+        Notes
+        -----
+        This method mutates the population.
+        """
+        expended = cls.expend_calories_batch(population, rng)
+        milk[:] = cls.milk_production_batch(population, rng)
+        methane[:] = cls.methane_production_batch(population)
+        return expended
+
+    @classmethod
+    def _each(
+        cls, population: Population, method, dtype: type, *arrays: np.ndarray
+    ) -> np.ndarray:
+        """Call a per-instance method on every cow of a population.
+
+        Parameters
+        ----------
+        population : Population
+            The population.
+
+        method : Callable
+            Function of a cow and its element of each of `arrays`.
+
+        dtype : type
+            Type of the values returned by `method`.
+
+        arrays : np.ndarray
+            Per-cow arguments of `method`.
+
+        Returns
+        -------
+        np.ndarray
+            Value returned by `method` for each cow.
+        """
+        cows = population.to_entities()
+        values = np.fromiter(
+            (method(*args) for args in zip(cows, *(a.tolist() for a in arrays))),
+            dtype,
+            len(cows),
+        )
+        _, _, calories, weight = cls._attributes(cows)
+        population.calories[:] = calories
+        population.weight[:] = weight
+        return values
+
+    @staticmethod
+    def _attributes(cows: ["Cow"]) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """Attribute arrays of cow instances.
+
+        Parameters
+        ----------
+        cows : [Cow]
+            The cows.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+            Arrays of age, sex, calories and weight.
+        """
+        population = Population.from_entities(Cow, cows)
+        return population.age, population.sex, population.calories, population.weight
+
+
+class Cow(BatchFallback, Entity):
+    """Base class of cow species.
+
+    Besides the per-instance methods, every species provides the bulk
+    interface of BatchFallback, which VECTORIZED_MODE simulations use.
+    """
+
+    __slots__ = ()
+
     @abstractmethod
-    def milk_production(self) -> float:
+    def milk_production(self, rng: np.random.Generator = None) -> float:
         """Calculates milk produced from cow.
 
         Parameters
         ----------
-        none
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
 
         Returns
         -------
@@ -132,3 +493,52 @@ class Cow(Entity):
             The emotion describing the cow's internal state.
         """
         ...
+
+    def sample_emotion(self, rng: np.random.Generator = None) -> Emotion:
+        """Samples the current emotion of cow from a generator, uniformly
+        over EMOTIONS.
+
+        Parameters
+        ----------
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        Emotion
+            The emotion describing the cow's internal state.
+        """
+        return EMOTIONS[as_generator(rng).integers(0, len(EMOTIONS))]
+
+    @classmethod
+    @abstractmethod
+    def should_reproduce(
+        cls,
+        cow_a: "Cow",
+        cow_b: "Cow",
+        rng: np.random.Generator = None,
+        emotions: (Emotion, Emotion) = None,
+    ) -> bool:
+        """Determines if two cows should reproduce.
+
+        Parameters
+        ----------
+        cow_a : Cow
+            An arbitrary Cow instance
+
+        cow_b : Cow
+            An arbitrary Cow instance
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        emotions : (Emotion, Emotion)
+            Emotions of `cow_a` and `cow_b`, if already drawn (e.g. once per
+            step). Otherwise, each cow's emotion is sampled once.
+
+        Returns
+        -------
+        bool
+            True, if cows should reproduce.
+        """
+        ...
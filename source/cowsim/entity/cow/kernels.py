@@ -0,0 +1,106 @@
+from cowsim.utils.jit import jit
+import numpy as np
+
+
+@jit
+def metabolism_kernel(
+    sex: np.ndarray,
+    age: np.ndarray,
+    calories: np.ndarray,
+    weight: np.ndarray,
+    expenditure: np.ndarray,
+    age_expenditure: np.ndarray,
+    milk_sample: np.ndarray,
+    milk: np.ndarray,
+    methane: np.ndarray,
+    male: int,
+    male_expenditure: float,
+    adult_age: int,
+    min_calories: float,
+    max_calories: float,
+    max_weight: float,
+    max_methane: float,
+) -> np.ndarray:
+    """Energy expenditure, weight loss, milk and methane production of a
+    herd, in a single pass over its arrays.
+
+    Follows the same rules, in the same order of floating point operations,
+    as `expend_calories_batch`, `milk_production_batch` and
+    `methane_production_batch` of PurpleAngus, so results are identical.
+
+    Parameters
+    ----------
+    sex : np.ndarray
+        Sex of each cow (as Sex enumeration values).
+
+    age : np.ndarray
+        Age of each cow (in days).
+
+    calories : np.ndarray
+        Caloric level of each cow, updated in place.
+
+    weight : np.ndarray
+        Weight of each cow, updated in place.
+
+    expenditure : np.ndarray
+        Baseline caloric expenditure drawn for each cow.
+
+    age_expenditure : np.ndarray
+        Age-dependent caloric expenditure drawn for each cow.
+
+    milk_sample : np.ndarray
+        Age-dependent milk production drawn for each cow.
+
+    milk : np.ndarray
+        Output milk production of each cow.
+
+    methane : np.ndarray
+        Output methane production of each cow.
+
+    male : int
+        Sex value of males.
+
+    male_expenditure : float
+        Factor of the baseline expenditure of males.
+
+    adult_age : int
+        Age from which cows produce milk.
+
+    min_calories : float
+        Caloric level below which cows lose weight.
+
+    max_calories : float
+        Caloric level of full methane production.
+
+    max_weight : float
+        Weight scaling milk production.
+
+    max_methane : float
+        Methane production at `max_calories`.
+
+    Returns
+    -------
+    np.ndarray
+        Caloric expenditure of each cow.
+    """
+    expended = np.empty(len(calories))
+    for i in range(len(calories)):
+        kcal = expenditure[i]
+        if sex[i] == male:
+            kcal *= male_expenditure
+        kcal += max(age_expenditure[i], 0.0)
+        expended[i] = kcal
+
+        cal = max(calories[i] - kcal, 0.0)
+        calories[i] = cal
+        mass = weight[i]
+        if cal < min_calories:
+            mass -= mass * (min_calories - cal) / min_calories
+            weight[i] = mass
+
+        produced = 0.0
+        if sex[i] != male and age[i] >= adult_age:
+            produced = max(max(milk_sample[i], 0.0) * (1 + mass / max_weight), 0.0)
+        milk[i] = produced
+        methane[i] = max_methane * (cal / max_calories)
+    return expended
@@ -1,11 +1,24 @@
-from ..cow import Cow, CauseOfDeath, Emotion
+from ..cow import (
+    EMOTION_VALENCE,
+    Cow,
+    CauseOfDeath,
+    Emotion,
+    Valence,
+    sample_emotions,
+)
 from cowsim.entity import Sex
+from cowsim.entity.cow.kernels import metabolism_kernel
+from cowsim.entity.curve import AgeCurve
+from cowsim.entity.population import Population
+from cowsim.utils.jit import NUMBA_AVAILABLE
+from cowsim.utils.rng import as_generator
 from enum import Enum
 import numpy as np
-import random
 
 
 class PurpleAngus(Cow):
+    __slots__ = ()
+
     # Age range (in days)
     MIN_AGE = 1
     MAX_AGE = 25 * 365
@@ -30,8 +43,58 @@ class PurpleAngus(Cow):
     # Max bound on methane production (in kilograms)
     MAX_METHANE_PRODUCTION_BOUND = 300 * 2.2
 
+    # Factor of the baseline caloric expenditure of males.
+    MALE_EXPENDITURE_FACTOR = 1.15
+
+    # Age-dependent caloric expenditure on top of the baseline (in kcal).
+    CALORIC_EXPENDITURE_CURVE = AgeCurve.constant(
+        (MIN_CALORIC_BOUND + MAX_CALORIC_BOUND) / 2 * 0.2,
+        (MIN_CALORIC_BOUND + MAX_CALORIC_BOUND) / 2 * 0.2 / 3,
+        MAX_AGE,
+    )
+
+    # Age-dependent milk production (in liters).
+    MILK_PRODUCTION_CURVE = AgeCurve.constant(
+        AVERAGE_MILK_PRODUCTION,
+        AVERAGE_MILK_PRODUCTION / 3,
+        MAX_AGE,
+    )
+
+    # Probability of reproducing given the classification of a cow's emotion.
+    POSITIVE_REPRODUCTION_PROBABILITY = 1.0
+    NEUTRAL_REPRODUCTION_PROBABILITY = 0.66
+    NEGATIVE_REPRODUCTION_PROBABILITY = 0.33
+
+    # Probability of reproducing of each emotion, indexed by emotion value,
+    # for a cow whose emotion is drawn once (PER_STEP_EMOTIONS).
+    EMOTION_REPRODUCTION_PROBABILITY = np.array(
+        [
+            POSITIVE_REPRODUCTION_PROBABILITY,
+            NEUTRAL_REPRODUCTION_PROBABILITY,
+            NEGATIVE_REPRODUCTION_PROBABILITY,
+        ]
+    )[EMOTION_VALENCE]
+
+    # Probability of reproducing of each emotion, indexed by emotion value,
+    # for the second emotion drawn in a trial once the first one was not
+    # positive: neutral emotions give NEUTRAL_REPRODUCTION_PROBABILITY and
+    # any other NEGATIVE_REPRODUCTION_PROBABILITY (see `should_reproduce`).
+    RETRY_REPRODUCTION_PROBABILITY = np.array(
+        [
+            NEGATIVE_REPRODUCTION_PROBABILITY,
+            NEUTRAL_REPRODUCTION_PROBABILITY,
+            NEGATIVE_REPRODUCTION_PROBABILITY,
+        ]
+    )[EMOTION_VALENCE]
+
     @classmethod
-    def should_reproduce(cls, cow_a: Cow, cow_b: Cow) -> bool:
+    def should_reproduce(
+        cls,
+        cow_a: Cow,
+        cow_b: Cow,
+        rng: np.random.Generator = None,
+        emotions: (Emotion, Emotion) = None,
+    ) -> bool:
         """Determines if two cows should reproduce.
 
         The probability of two cows reproducing (given that certain conditions
@@ -45,6 +108,16 @@ class PurpleAngus(Cow):
         cow_b : Cow
             An arbitrary Cow instance
 
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        emotions : (Emotion, Emotion)
+            Emotions of `cow_a` and `cow_b`, if already drawn (e.g. once per
+            step), which give each cow's probability through
+            EMOTION_REPRODUCTION_PROBABILITY. Otherwise, a new emotion is
+            sampled for each valence check: a cow is positive if its first
+            emotion is, and neutral if its second emotion is.
+
         Returns
         -------
         bool
@@ -62,51 +135,68 @@ class PurpleAngus(Cow):
         if cow_a.age < cls.ADULT_AGE or cow_b.age < cls.ADULT_AGE:
             return False
 
-        if cow_a.id == cow_b.id:
+        if cow_a is cow_b:
             return False
 
         if cow_a.sex == cow_b.sex:
             return False
 
-        prob_a = None
-        if Emotion.is_positive(cow_a.emotion):
-            prob_a = 1.0
-        elif Emotion.is_neutral(cow_a.emotion):
-            prob_a = 0.66
+        rng = as_generator(rng)
+        if emotions is None:
+            prob = cls._trial_probability(cow_a, rng) * cls._trial_probability(
+                cow_b, rng
+            )
         else:
-            prob_a = 0.33
+            table = cls.EMOTION_REPRODUCTION_PROBABILITY
+            prob = table[emotions[0].value] * table[emotions[1].value]
 
-        prob_b = None
-        if Emotion.is_positive(cow_b.emotion):
-            prob_b = 1.0
-        elif Emotion.is_neutral(cow_b.emotion):
-            prob_b = 0.66
-        else:
-            prob_b = 0.33
+        return rng.uniform(0, 1) <= prob
 
-        prob = prob_a * prob_b
+    @classmethod
+    def _trial_probability(cls, cow: Cow, rng: np.random.Generator) -> float:
+        """Probability of reproducing of a cow in one `should_reproduce` trial.
 
-        return random.uniform(0, 1) <= prob
+        Parameters
+        ----------
+        cow : Cow
+            The cow.
+
+        rng : np.random.Generator
+            Generator to draw from.
+
+        Returns
+        -------
+        float
+            POSITIVE_REPRODUCTION_PROBABILITY if a first sampled emotion is
+            positive. Otherwise, the probability of a second sampled emotion
+            in RETRY_REPRODUCTION_PROBABILITY.
+        """
+        emotion = cow.sample_emotion(rng)
+        if EMOTION_VALENCE[emotion.value] == Valence.POSITIVE.value:
+            return cls.POSITIVE_REPRODUCTION_PROBABILITY
+        return cls.RETRY_REPRODUCTION_PROBABILITY[cow.sample_emotion(rng).value]
 
     @classmethod
-    def newborn(cls) -> "PurpleAngus":
+    def newborn(cls, rng: np.random.Generator = None) -> "PurpleAngus":
         """Generates a newborn purple angus (when two purple angus reproduce).
 
         Parameters
         ----------
-        none
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
 
         Returns
         -------
         PurpleAngus
             A newborn purple angus.
         """
+        rng = as_generator(rng)
         age = 0
         sex = Sex.FEMALE
-        if random.randint(0, 1) == 0:
+        if rng.integers(0, 2) == 0:
             sex = Sex.MALE
-        calories = random.uniform(cls.MIN_CALORIC_BOUND, cls.MAX_CALORIC_BOUND)
-        weight = random.uniform(cls.MIN_WEIGHT, cls.MAX_WEIGHT)
+        calories = rng.uniform(cls.MIN_CALORIC_BOUND, cls.MAX_CALORIC_BOUND)
+        weight = rng.uniform(cls.MIN_WEIGHT, cls.MAX_WEIGHT)
 
         return cls(
             age=age,
@@ -116,24 +206,26 @@ class PurpleAngus(Cow):
         )
 
     @classmethod
-    def generate(cls) -> "PurpleAngus":
+    def generate(cls, rng: np.random.Generator = None) -> "PurpleAngus":
         """Randomly generate an instance of a PurpleAngus.
 
         Parameters
         ----------
-        none
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
 
         Returns
         -------
         PurpleAngus
             A randomly generated PurpleAngus.
         """
-        age = random.randint(cls.MIN_AGE, cls.MAX_AGE)
+        rng = as_generator(rng)
+        age = int(rng.integers(cls.MIN_AGE, cls.MAX_AGE, endpoint=True))
         sex = Sex.FEMALE
-        if random.randint(0, 1) == 0:
+        if rng.integers(0, 2) == 0:
             sex = Sex.MALE
-        calories = random.uniform(cls.MIN_CALORIC_BOUND, cls.MAX_CALORIC_BOUND)
-        weight = random.uniform(cls.MIN_WEIGHT, cls.MAX_WEIGHT)
+        calories = rng.uniform(cls.MIN_CALORIC_BOUND, cls.MAX_CALORIC_BOUND)
+        weight = rng.uniform(cls.MIN_WEIGHT, cls.MAX_WEIGHT)
 
         return cls(
             age=age,
@@ -142,12 +234,197 @@ class PurpleAngus(Cow):
             weight=weight,
         )
 
-    def __init__(self, age: int, sex: Sex, calories: float, weight: float):
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """Whether the species implements the bulk interface natively.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        bool
+            True, every bulk method is an array kernel.
+        """
+        return True
+
+    @classmethod
+    def generate_batch(
+        cls, count: int, rng: np.random.Generator = None
+    ) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """Randomly generate the attributes of `count` purple angus.
+
+        Follows the same distributions as `generate`.
+
+        Parameters
+        ----------
+        count : int
+            Number of purple angus to generate.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+            Arrays of age, sex, calories and weight, as accepted by
+            `Population.extend`.
+        """
+        rng = as_generator(rng)
+        age = rng.integers(cls.MIN_AGE, cls.MAX_AGE, count, endpoint=True)
+        return (age, *cls._random_attributes(count, rng))
+
+    @classmethod
+    def newborn_batch(
+        cls, count: int, rng: np.random.Generator = None
+    ) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """Generate the attributes of `count` newborn purple angus.
+
+        Follows the same distributions as `newborn`.
+
+        Parameters
+        ----------
+        count : int
+            Number of newborns to generate.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+            Arrays of age, sex, calories and weight, as accepted by
+            `Population.extend`.
+        """
+        age = np.zeros(count, dtype=np.int64)
+        return (age, *cls._random_attributes(count, as_generator(rng)))
+
+    @classmethod
+    def _random_attributes(
+        cls, count: int, rng: np.random.Generator
+    ) -> (np.ndarray, np.ndarray, np.ndarray):
+        """Randomly generate sex, calories and weight of `count` purple angus.
+
+        Parameters
+        ----------
+        count : int
+            Number of purple angus to generate.
+
+        rng : np.random.Generator
+            Generator to draw from.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray)
+            Arrays of sex, calories and weight.
+        """
+        sex = np.where(
+            rng.integers(0, 2, count) == 0, Sex.MALE.value, Sex.FEMALE.value
+        ).astype(np.int8)
+        calories = rng.uniform(cls.MIN_CALORIC_BOUND, cls.MAX_CALORIC_BOUND, count)
+        weight = rng.uniform(cls.MIN_WEIGHT, cls.MAX_WEIGHT, count)
+        return sex, calories, weight
+
+    @classmethod
+    def fertile_batch(cls, population: Population) -> np.ndarray:
+        """Determines which cows of a population are old enough to reproduce.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean mask, True for cows over the adult age.
+        """
+        return population.age >= cls.ADULT_AGE
+
+    @classmethod
+    def reproduction_probability_batch(
+        cls,
+        population: Population,
+        index: np.ndarray,
+        rng: np.random.Generator = None,
+        emotions: np.ndarray = None,
+    ) -> np.ndarray:
+        """Samples the emotional reproduction probability of some cows.
+
+        The probability of two cows reproducing is the product of both of
+        their probabilities.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        index : np.ndarray
+            Positions in the population of the cows to sample.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        emotions : np.ndarray
+            Emotion value of every cow of the population, if already drawn
+            (e.g. once per step). Otherwise, emotions are freshly sampled for
+            each valence check, as in `should_reproduce`.
+
+        Returns
+        -------
+        np.ndarray
+            Probability of each indexed cow, based on its emotion.
+        """
+        if emotions is not None:
+            return cls.EMOTION_REPRODUCTION_PROBABILITY[emotions[index]]
+
+        first = sample_emotions(len(index), rng)
+        prob = cls.EMOTION_REPRODUCTION_PROBABILITY[first]
+        retry = EMOTION_VALENCE[first] != Valence.POSITIVE.value
+        prob[retry] = cls.RETRY_REPRODUCTION_PROBABILITY[
+            sample_emotions(np.count_nonzero(retry), rng)
+        ]
+        return prob
+
+    @classmethod
+    def expected_reproduction_probability(cls) -> float:
+        """Expected probability that a single `should_reproduce` call succeeds
+        for two eligible cows.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        float
+            Success probability of one `should_reproduce` trial.
+
+        Notes
+        -----
+        `should_reproduce` samples a new emotion each time it classifies one,
+        so a cow is positive with the positive share of emotions, neutral
+        with the neutral share of the remaining draws, and negative otherwise.
+        """
+        positive = sum(Emotion.is_positive(e) for e in Emotion) / len(Emotion)
+        neutral = sum(Emotion.is_neutral(e) for e in Emotion) / len(Emotion)
+        expected_prob = (
+            positive * cls.POSITIVE_REPRODUCTION_PROBABILITY
+            + (1 - positive) * neutral * cls.NEUTRAL_REPRODUCTION_PROBABILITY
+            + (1 - positive) * (1 - neutral) * cls.NEGATIVE_REPRODUCTION_PROBABILITY
+        )
+        return expected_prob**2
+
+    def __init__(
+        self, age: int, sex: Sex, calories: float, weight: float, id: int = None
+    ):
         super().__init__(
             age=age,
             sex=sex,
             calories=calories,
             weight=weight,
+            id=id,
         )
 
     def cause_of_death(self) -> Enum:
@@ -177,7 +454,7 @@ class PurpleAngus(Cow):
 
         return CauseOfDeath.NOT_DEAD
 
-    def expend_calories(self) -> float:
+    def expend_calories(self, rng: np.random.Generator = None) -> float:
         """Calculates and expends entity's calories.
 
         If the calculated caloric expenditure falls below MIN_CALORIC_BOUND,
@@ -185,7 +462,8 @@ class PurpleAngus(Cow):
 
         Parameters
         ----------
-        none
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
 
         Returns
         -------
@@ -200,20 +478,19 @@ class PurpleAngus(Cow):
             - Males (on average) expend more calories than females.
             - Caloric expenditure follows a normal distribution in regards to age.
         """
-        expended_kcal = random.uniform(
+        rng = as_generator(rng)
+        expended_kcal = rng.uniform(
             PurpleAngus.MIN_CALORIC_BOUND, PurpleAngus.MAX_CALORIC_BOUND
         )
 
         # Males expend more calories than females.
         if self.sex == Sex.MALE:
-            expended_kcal += expended_kcal * 0.15
+            expended_kcal *= self.MALE_EXPENDITURE_FACTOR
 
         # Caloric expenditure follows a normal distribution in regards to age.
-        mu = (PurpleAngus.MIN_CALORIC_BOUND + PurpleAngus.MAX_CALORIC_BOUND) / 2
-        mu = mu * 0.2
-        sigma = mu / 3
-        normal = np.random.normal(mu, sigma, PurpleAngus.MAX_AGE)
-        expended_kcal += max(normal[self.age - 1], 0)
+        expended_kcal += max(
+            PurpleAngus.CALORIC_EXPENDITURE_CURVE.sample(self.age, rng), 0
+        )
 
         # Ensure that self.calories is not negative.
         self._calories = max(0, self.calories - expended_kcal)
@@ -260,14 +537,15 @@ class PurpleAngus(Cow):
 
         return self.calories - old_calories
 
-    def milk_production(self) -> float:
+    def milk_production(self, rng: np.random.Generator = None) -> float:
         """Calculates milk produced from cow.
 
         Milk production is calculated based on sex, age, and weight.
 
         Parameters
         ----------
-        none
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
 
         Returns
         -------
@@ -288,10 +566,9 @@ class PurpleAngus(Cow):
             return 0
 
         # Milk production follows a normal distribution in regards to age.
-        mu = PurpleAngus.AVERAGE_MILK_PRODUCTION
-        sigma = mu / 3
-        normal = np.random.normal(mu, sigma, PurpleAngus.MAX_AGE)
-        milk_production = max(normal[self.age - 1], 0)
+        milk_production = max(
+            PurpleAngus.MILK_PRODUCTION_CURVE.sample(self.age, rng), 0
+        )
 
         # Milk production is proportionally related to weight.
         milk_production *= 1 + (self.weight / PurpleAngus.MAX_WEIGHT)
@@ -330,5 +607,276 @@ class PurpleAngus(Cow):
         Emotion
             The emotion of the cow.
         """
-        i = random.randint(0, len(list(Emotion)) - 1)
-        return list(Emotion)[i]
+        return self.sample_emotion()
+
+    @classmethod
+    def cause_of_death_batch(cls, population: Population) -> np.ndarray:
+        """Bulk equivalent of `cause_of_death` for a whole population.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        Returns
+        -------
+        np.ndarray
+            The CauseOfDeath value of each cow.
+        """
+        age = population.age
+        weight = population.weight
+        causes = np.select(
+            [
+                age > cls.MAX_AGE,
+                weight > cls.MAX_WEIGHT,
+                (weight < cls.MIN_ADULT_WEIGHT) & (age >= cls.ADULT_AGE),
+            ],
+            [
+                CauseOfDeath.OLD_AGE.value,
+                CauseOfDeath.OVERWEIGHT.value,
+                CauseOfDeath.MALNOURISHED.value,
+            ],
+            default=CauseOfDeath.NOT_DEAD.value,
+        )
+        return causes.astype(np.int8)
+
+    @classmethod
+    def expend_calories_batch(
+        cls, population: Population, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Bulk equivalent of `expend_calories` for a whole population.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        np.ndarray
+            Caloric expenditure of each cow (in kcal).
+
+        Notes
+        -----
+        This method mutates the population.
+        """
+        rng = as_generator(rng)
+        count = len(population)
+        expended_kcal = rng.uniform(cls.MIN_CALORIC_BOUND, cls.MAX_CALORIC_BOUND, count)
+
+        # Males expend more calories than females.
+        expended_kcal[population.sex == Sex.MALE.value] *= cls.MALE_EXPENDITURE_FACTOR
+
+        # Caloric expenditure follows a normal distribution in regards to age.
+        expended_kcal += np.maximum(
+            cls.CALORIC_EXPENDITURE_CURVE.sample_batch(population.age, rng), 0
+        )
+
+        # Ensure that calories are not negative.
+        calories = population.calories
+        np.maximum(calories - expended_kcal, 0, out=calories)
+
+        # Weight loss is proportional to caloric difference from bounds.
+        weight = population.weight
+        low = calories < cls.MIN_CALORIC_BOUND
+        weight[low] -= (
+            weight[low]
+            * (cls.MIN_CALORIC_BOUND - calories[low])
+            / cls.MIN_CALORIC_BOUND
+        )
+
+        return expended_kcal
+
+    @classmethod
+    def metabolism_batch(
+        cls,
+        population: Population,
+        rng: np.random.Generator,
+        milk: np.ndarray,
+        methane: np.ndarray,
+    ) -> np.ndarray:
+        """Energy expenditure, then milk and methane production, of a
+        population.
+
+        With Numba installed, the three run in a single pass over the
+        population (see `metabolism_kernel`). Otherwise, the NumPy batch
+        methods run one after the other. Results are identical either way.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        rng : np.random.Generator
+            Generator to draw from.
+
+        milk : np.ndarray
+            Output milk production of each cow (in liters).
+
+        methane : np.ndarray
+            Output methane production of each cow (in kilograms).
+
+        Returns
+        -------
+        np.ndarray
+            Caloric expenditure of each cow (in kcal).
+
+        Notes
+        -----
+        This method mutates the population.
+        """
+        if not NUMBA_AVAILABLE:
+            return super().metabolism_batch(population, rng, milk, methane)
+        return cls._fused_metabolism(population, rng, milk, methane)
+
+    @classmethod
+    def _fused_metabolism(
+        cls,
+        population: Population,
+        rng: np.random.Generator,
+        milk: np.ndarray,
+        methane: np.ndarray,
+    ) -> np.ndarray:
+        """`metabolism_batch` in a single pass, with `metabolism_kernel`.
+
+        Random numbers are drawn in the same order as by the NumPy batch
+        methods.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        rng : np.random.Generator
+            Generator to draw from.
+
+        milk : np.ndarray
+            Output milk production of each cow (in liters).
+
+        methane : np.ndarray
+            Output methane production of each cow (in kilograms).
+
+        Returns
+        -------
+        np.ndarray
+            Caloric expenditure of each cow (in kcal).
+        """
+        rng = as_generator(rng)
+        age = population.age
+        expenditure = rng.uniform(
+            cls.MIN_CALORIC_BOUND, cls.MAX_CALORIC_BOUND, len(population)
+        )
+        age_expenditure = cls.CALORIC_EXPENDITURE_CURVE.sample_batch(age, rng)
+        milk_sample = cls.MILK_PRODUCTION_CURVE.sample_batch(age, rng)
+        return metabolism_kernel(
+            population.sex,
+            age,
+            population.calories,
+            population.weight,
+            expenditure,
+            age_expenditure,
+            milk_sample,
+            milk,
+            methane,
+            Sex.MALE.value,
+            cls.MALE_EXPENDITURE_FACTOR,
+            cls.ADULT_AGE,
+            float(cls.MIN_CALORIC_BOUND),
+            float(cls.MAX_CALORIC_BOUND),
+            cls.MAX_WEIGHT,
+            cls.MAX_METHANE_PRODUCTION_BOUND,
+        )
+
+    @classmethod
+    def caloric_intake_batch(
+        cls, population: Population, kcal: np.ndarray
+    ) -> np.ndarray:
+        """Bulk equivalent of `caloric_intake` for a whole population.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        kcal : np.ndarray
+            Calories to be ingested by each cow.
+
+        Returns
+        -------
+        np.ndarray
+            Caloric increase of each cow.
+
+        Notes
+        -----
+        This method mutates the population.
+        """
+        calories = population.calories
+        weight = population.weight
+        old_calories = calories.copy()
+        calories += kcal
+
+        # Weight gain is proportional to caloric difference from bounds.
+        high = calories > cls.MAX_CALORIC_BOUND
+        weight[high] += (
+            weight[high]
+            * (calories[high] - cls.MAX_CALORIC_BOUND)
+            / cls.MAX_CALORIC_BOUND
+        )
+        # Excess calories are stored as fat.
+        calories[high] = cls.MAX_CALORIC_BOUND
+
+        return calories - old_calories
+
+    @classmethod
+    def milk_production_batch(
+        cls, population: Population, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Bulk equivalent of `milk_production` for a whole population.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        np.ndarray
+            Milk produced by each cow (in liters).
+        """
+        # Milk production follows a normal distribution in regards to age.
+        milk_production = np.maximum(
+            cls.MILK_PRODUCTION_CURVE.sample_batch(population.age, rng), 0
+        )
+
+        # Milk production is proportionally related to weight.
+        milk_production *= 1 + (population.weight / cls.MAX_WEIGHT)
+
+        # Males and younger angus do not produce milk.
+        milk_production[population.sex == Sex.MALE.value] = 0
+        milk_production[population.age < cls.ADULT_AGE] = 0
+
+        return np.maximum(milk_production, 0)
+
+    @classmethod
+    def methane_production_batch(cls, population: Population) -> np.ndarray:
+        """Bulk equivalent of `methane_production` for a whole population.
+
+        Parameters
+        ----------
+        population : Population
+            The purple angus population.
+
+        Returns
+        -------
+        np.ndarray
+            Methane produced by each cow (in kilograms).
+        """
+        return cls.MAX_METHANE_PRODUCTION_BOUND * (
+            population.calories / cls.MAX_CALORIC_BOUND
+        )
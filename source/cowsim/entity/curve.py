@@ -0,0 +1,120 @@
+from cowsim.utils.rng import as_generator
+import numpy as np
+
+
+class AgeCurve:
+    """Normally distributed quantity whose mean and spread depend on age.
+
+    The per-age mean and standard deviation are tabulated once, so sampling
+    the quantity for an entity costs a single normal draw instead of drawing
+    a whole lifetime of values and reading one of them.
+
+    Attributes
+    ----------
+    _mean : np.ndarray
+        Mean of the quantity, indexed by age (in days).
+
+    _sigma : np.ndarray
+        Standard deviation of the quantity, indexed by age (in days).
+    """
+
+    def __init__(self, mean: np.ndarray, sigma: np.ndarray):
+        """AgeCurve constructor.
+
+        Parameters
+        ----------
+        mean : np.ndarray
+            Mean of the quantity for each age, starting at age zero.
+
+        sigma : np.ndarray
+            Standard deviation of the quantity for each age, starting at age
+            zero.
+
+        Raises
+        ------
+        ValueError
+            If `mean` and `sigma` differ in length or are empty.
+        """
+        if len(mean) != len(sigma) or len(mean) == 0:
+            raise ValueError("Age curve tables must be non-empty and equal in length.")
+
+        self._mean = np.asarray(mean, dtype=np.float64)
+        self._sigma = np.asarray(sigma, dtype=np.float64)
+
+    @classmethod
+    def constant(cls, mu: float, sigma: float, max_age: int) -> "AgeCurve":
+        """Create a curve with the same distribution at every age.
+
+        Parameters
+        ----------
+        mu : float
+            Mean of the quantity.
+
+        sigma : float
+            Standard deviation of the quantity.
+
+        max_age : int
+            Oldest age (in days) tabulated by the curve.
+
+        Returns
+        -------
+        AgeCurve
+            The age curve.
+        """
+        return cls(np.full(max_age + 1, mu), np.full(max_age + 1, sigma))
+
+    @property
+    def max_age(self) -> int:
+        """Oldest age tabulated by the curve. Older ages use its values."""
+        return len(self._mean) - 1
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean of the quantity, indexed by age."""
+        return self._mean
+
+    @property
+    def sigma(self) -> np.ndarray:
+        """Standard deviation of the quantity, indexed by age."""
+        return self._sigma
+
+    def sample(self, age: int, rng: np.random.Generator = None) -> float:
+        """Draw the quantity for a single entity.
+
+        Parameters
+        ----------
+        age : int
+            Age of the entity (in days).
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        float
+            The sampled quantity.
+        """
+        i = int(min(max(age, 0), self.max_age))
+        return self._mean[i] + self._sigma[i] * as_generator(rng).standard_normal()
+
+    def sample_batch(
+        self, age: np.ndarray, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Draw the quantity for many entities at once.
+
+        Parameters
+        ----------
+        age : np.ndarray
+            Age of each entity (in days).
+
+        rng : np.random.Generator
+            Generator to draw from. Defaults to the shared default generator.
+
+        Returns
+        -------
+        np.ndarray
+            The sampled quantity of each entity.
+        """
+        i = np.clip(age, 0, self.max_age)
+        noise = as_generator(rng).standard_normal(len(i))
+        return self._mean[i] + self._sigma[i] * noise
@@ -0,0 +1,288 @@
+from typing import Type
+import numpy as np
+
+from cowsim.entity import Entity, Sex
+
+
+class Population:
+    """Structure-of-arrays store for every living entity of a single species.
+
+    Entity attributes are kept in contiguous NumPy arrays rather than in
+    individual Entity objects, so simulation phases can operate on the whole
+    population in bulk. Arrays grow by doubling their capacity, making
+    appends amortized O(1).
+
+    Attributes
+    ----------
+    _species : Type[Entity]
+        The class of the entities stored in this population.
+
+    _size : int
+        Number of living entities stored.
+
+    _ids : np.ndarray
+        Integer identifiers of the entities.
+
+    _age : np.ndarray
+        Age of each entity (in days).
+
+    _sex : np.ndarray
+        Sex of each entity, stored as the value of the Sex enumeration.
+
+    _calories : np.ndarray
+        Caloric levels of each entity (in kcal).
+
+    _weight : np.ndarray
+        Weight of each entity (in kilograms).
+    """
+
+    INITIAL_CAPACITY = 16
+
+    FIELDS = {
+        "ids": np.int64,
+        "age": np.int64,
+        "sex": np.int8,
+        "calories": np.float64,
+        "weight": np.float64,
+    }
+
+    def __init__(self, species: Type[Entity], capacity: int = INITIAL_CAPACITY):
+        """Population constructor.
+
+        Parameters
+        ----------
+        species : Type[Entity]
+            The class of the entities stored in this population.
+
+        capacity : int
+            Number of entities to allocate space for up front.
+        """
+        self._species = species
+        self._size = 0
+        capacity = max(capacity, 1)
+        for field, dtype in Population.FIELDS.items():
+            setattr(self, f"_{field}", np.empty(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __str__(self) -> str:
+        return f"{self._species.name} population [{self._size}]"
+
+    @property
+    def species(self) -> Type[Entity]:
+        """Class of the entities stored in this population."""
+        return self._species
+
+    @property
+    def capacity(self) -> int:
+        """Number of entities that fit before the arrays must grow."""
+        return len(self._ids)
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Identifiers of the living entities."""
+        return self._ids[: self._size]
+
+    @property
+    def age(self) -> np.ndarray:
+        """Ages of the living entities."""
+        return self._age[: self._size]
+
+    @property
+    def sex(self) -> np.ndarray:
+        """Sexes of the living entities (as Sex enumeration values)."""
+        return self._sex[: self._size]
+
+    @property
+    def calories(self) -> np.ndarray:
+        """Caloric levels of the living entities."""
+        return self._calories[: self._size]
+
+    @property
+    def weight(self) -> np.ndarray:
+        """Weights of the living entities."""
+        return self._weight[: self._size]
+
+    def extend(
+        self,
+        ids: np.ndarray,
+        age: np.ndarray,
+        sex: np.ndarray,
+        calories: np.ndarray,
+        weight: np.ndarray,
+    ) -> None:
+        """Append entities to the population.
+
+        Parameters
+        ----------
+        ids : np.ndarray
+            Identifiers of the new entities.
+
+        age : np.ndarray
+            Ages of the new entities.
+
+        sex : np.ndarray
+            Sexes of the new entities (as Sex enumeration values).
+
+        calories : np.ndarray
+            Caloric levels of the new entities.
+
+        weight : np.ndarray
+            Weights of the new entities.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If the provided arrays differ in length.
+        """
+        count = len(ids)
+        if not (len(age) == len(sex) == len(calories) == len(weight) == count):
+            raise ValueError("Population attribute arrays differ in length.")
+
+        self._reserve(self._size + count)
+        end = self._size + count
+        self._ids[self._size : end] = ids
+        self._age[self._size : end] = age
+        self._sex[self._size : end] = sex
+        self._calories[self._size : end] = calories
+        self._weight[self._size : end] = weight
+        self._size = end
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Compact the population so that only the masked entities remain.
+
+        Parameters
+        ----------
+        mask : np.ndarray
+            Boolean array with one element per living entity. Entities whose
+            element is False are removed.
+
+        Returns
+        -------
+        None
+        """
+        survivors = int(np.count_nonzero(mask))
+        for field in Population.FIELDS:
+            array = getattr(self, f"_{field}")
+            array[:survivors] = array[: self._size][mask]
+        self._size = survivors
+
+    def shard(self, start: int, stop: int) -> "Population":
+        """A contiguous range of the population.
+
+        Parameters
+        ----------
+        start : int
+            Position of the first entity of the shard.
+
+        stop : int
+            Position after the last entity of the shard.
+
+        Returns
+        -------
+        Population
+            A population whose attribute arrays are views into this one's, so
+            bulk updates to the shard write through. The shard must not be
+            extended or compacted.
+        """
+        shard = Population.__new__(Population)
+        shard._species = self._species
+        shard._size = stop - start
+        for field in Population.FIELDS:
+            setattr(shard, f"_{field}", getattr(self, f"_{field}")[start:stop])
+        return shard
+
+    @classmethod
+    def from_entities(
+        cls, species: Type[Entity], entities: [Entity], ids: np.ndarray = None
+    ) -> "Population":
+        """Copy the attributes of per-object entities into a new Population.
+
+        Parameters
+        ----------
+        species : Type[Entity]
+            The class of the entities.
+
+        entities : [Entity]
+            The entities to copy.
+
+        ids : np.ndarray
+            Identifiers of the entities. Defaults to their position in
+            `entities`.
+
+        Returns
+        -------
+        Population
+            A population in the same order as `entities`.
+        """
+        population = cls(species, len(entities))
+        if ids is None:
+            ids = np.arange(len(entities), dtype=np.int64)
+        population.extend(
+            ids,
+            np.fromiter((e.age for e in entities), np.int64, len(entities)),
+            np.fromiter((e.sex.value for e in entities), np.int8, len(entities)),
+            np.fromiter((e.calories for e in entities), np.float64, len(entities)),
+            np.fromiter((e.weight for e in entities), np.float64, len(entities)),
+        )
+        return population
+
+    def to_entities(self) -> [Entity]:
+        """Materialize the population as per-object entities.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        [Entity]
+            One instance of the species for each living entity, with the
+            identifier it is stored under.
+        """
+        return [
+            self._species(
+                age=age,
+                sex=Sex(sex),
+                calories=calories,
+                weight=weight,
+                id=id,
+            )
+            for id, age, sex, calories, weight in zip(
+                self.ids.tolist(),
+                self.age.tolist(),
+                self.sex.tolist(),
+                self.calories.tolist(),
+                self.weight.tolist(),
+            )
+        ]
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the attribute arrays (by doubling) to hold `capacity` entities.
+
+        Parameters
+        ----------
+        capacity : int
+            Number of entities that must fit.
+
+        Returns
+        -------
+        None
+        """
+        if capacity <= self.capacity:
+            return
+
+        new_capacity = self.capacity
+        while new_capacity < capacity:
+            new_capacity *= 2
+
+        for field, dtype in Population.FIELDS.items():
+            old = getattr(self, f"_{field}")
+            new = np.empty(new_capacity, dtype=dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, f"_{field}", new)
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 from ..entity import Entity
+import numpy as np
 
 from cowsim.utils.named_abc import Named_ABC
+from cowsim.utils.rng import RandomStreams
 
 
 class Environment(Named_ABC):
@@ -9,9 +11,10 @@ class Environment(Named_ABC):
 
     Attributes
     ----------
-    _entities : Dict[str, [Entity]]
+    _entities : Dict[str, [Entity] | Population]
         A dictionary where the key is the name of a class dervied from Cow and
-        the value is an array of instances of that class.
+        the value is an array of instances of that class (or a Population
+        storing them).
 
     _max_capacity : int
         The maximum population size of any given entity that the environment
@@ -22,12 +25,17 @@ class Environment(Named_ABC):
 
     _steps : int
         Number of steps that have elapsed.
+
+    _streams : RandomStreams
+        Independent random number generators of the simulation, one per
+        named phase.
     """
 
     def __init__(
         self,
         max_capacity: int,
         max_steps: int,
+        seed: int = None,
     ):
         """Constructor for Environment and derived classes.
 
@@ -39,11 +47,16 @@ class Environment(Named_ABC):
 
         max_steps : int
             Number of steps to run the simulation.
+
+        seed : int
+            Seed of every random draw of the simulation. If None, fresh
+            entropy is used.
         """
         self._max_capacity = max_capacity
         self._max_steps = max_steps
         self._steps = 0
         self._entities = {}
+        self._streams = RandomStreams(seed)
 
     @abstractmethod
     def step(self) -> None:
@@ -95,11 +108,18 @@ class Feed(Named_ABC):
     the entire population in the environment for a single day and the Feed
     class is expected to know how much food to provide to each entity.
 
+    Derived classes are constructed with their number of servings and the
+    entities to be fed with `feed`.
+
     Attributes
     ----------
-
+    CALORIES_PER_SERVING : float
+        Calories (kcal) in a serving. Required by feeds implementing
+        `feed_batch`, whose servings the caller turns into caloric intake.
     """
 
+    CALORIES_PER_SERVING = None
+
     @property
     @abstractmethod
     def initial_serving_total(self) -> int:
@@ -194,3 +214,51 @@ class Feed(Named_ABC):
             The number of servings given to the entity.
         """
         ...
+
+    def feed_batch(
+        self, calories: np.ndarray, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Bulk equivalent of `feed` for a whole herd.
+
+        Optional: derived classes that implement it also override
+        `supports_batch` and set CALORIES_PER_SERVING. The servings are only
+        computed; the caller applies the caloric intake to the entities.
+        Without it, environments serve the entities one at a time with
+        `feed`.
+
+        Parameters
+        ----------
+        calories : np.ndarray
+            Caloric levels of every entity of the herd.
+
+        rng : np.random.Generator
+            Generator of the order entities are served in.
+
+        Returns
+        -------
+        np.ndarray
+            The number of servings given to each entity.
+
+        Raises
+        ------
+        NotImplementedError
+            If the feed does not support batch feeding.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.name} does not support batch feeding."
+        )
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """Whether the feed implements `feed_batch`.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        bool
+            True if `feed_batch` is implemented.
+        """
+        return False
@@ -1,12 +1,39 @@
-from ..entity.cow import Cow, CauseOfDeath
+from ..entity.cow import EMOTIONS, Cow, CauseOfDeath, sample_emotions
+from ..entity.population import Population
 from ..environment import Environment, Feed
+from ..environment.recorder import Recorder
+from ..environment.report import CSV_FORMAT, report_backend
+from ..environment.sink import Sink
+from ..environment.profiler import PhaseProfiler
+from ..environment.sharding import ShardPool
+from ..environment.pipeline import HERD, Phase, Pipeline
+from ..environment.pairing import (
+    BIRTHS,
+    EMOTION_MODES,
+    MONOGAMOUS_PAIRING,
+    PAIRING_MODES,
+    PER_TRIAL_EMOTIONS,
+    bucket_by_sex,
+    pair_couples,
+)
 from cowsim.utils import LOG
+from cowsim.utils.jit import NUMBA_AVAILABLE
+from cowsim.utils.rng import as_generator, hash_uniform
 from typing import Type
+import collections
+import cowsim
+import functools
+import importlib
+import inspect
+import itertools
+import json
+import logging
 import math
+import numpy as np
 import os
 import pandas as pd
 import pathlib
-import random
+import uuid
 
 
 class CowPen(Environment):
@@ -15,35 +42,183 @@ class CowPen(Environment):
 
     Attributes
     ----------
-    _feeding_data: Dict[str, pd.DataFrame]
-        Records the number of servings given to each cow at each simulation step.
+    _recorder : Recorder
+        Records, at each simulation step, the population (POPULATION_METRIC),
+        the age, calories and weight of each cow (AGE_METRIC, CALORIES_METRIC
+        and WEIGHT_METRIC), the number of servings given to each cow
+        (FEEDING_METRIC), the milk and methane production of each cow
+        (MILK_METRIC and METHANE_METRIC), and the number of deaths of each
+        of DEATH_EVENTS (`deaths_metric`). Under AGGREGATE_RECORDING, the
+        per-cow metrics are reduced to herd-level statistics
+        (`aggregate_metric`) and the number of births (BIRTH_EVENT) is
+        recorded instead of registering each cow.
+
+    _sink : Sink
+        Destination that recorded data is streamed to after each step, if
+        any.
+
+    _initial_entities : [(str, int)]
+        Name and quantity of each type of cow the cow pen started with.
 
-    _milk_data : Dict[str, pd.DataFrame]
-        Records the milk production at each simulation step.
+    _feed : tuple[Type[Feed], int]
+        A tuple containing the type of Feed and the number of servings to
+        provide to the cow pen at each simulation step.
 
-    _methane_data : Dict[str, pd.DataFrame]
-        Records the methane production at each simulation step.
+    _mode : str
+        Simulation mode, either VECTORIZED_MODE or OBJECT_MODE. In
+        VECTORIZED_MODE, `_entities` maps names to Population stores instead
+        of lists of Cow instances.
 
-    _population_data : pd.DataFrame
-        Records the population at each simulation step.
+    _pairing : str
+        Pairing mode used in the reproduction phase.
 
-    _entity : pd.DataFrame
-        Records data of the entity at each simulation step. Data is stored in tuple form:
-            (age, calories, weight)
+    _emotions : str
+        Emotion mode used in the reproduction phase.
 
-    _feed : tuple[Type[Feed], int]
-        A tuple containing the type of Feed and the number of servings to
-        provide to the cow pen at each simulation step.
+    _shard_pool : ShardPool
+        Runs the per-cow phases over shards of each herd, if the cow pen is
+        sharded.
+
+    _recording : str
+        Recording mode, one of RECORDING_MODES.
+
+    _tracing : bool
+        Whether a sample of the cows is traced at full detail under
+        AGGREGATE_RECORDING.
+
+    _trace_fraction : float
+        Fraction of the cows selected for tracing, if limited.
+
+    _trace_max : int
+        Maximum number of living cows of each type that are traced, if
+        limited.
+
+    _traced : Dict[str, np.ndarray]
+        Sorted identifiers of the living traced cows of each type.
+
+    _backend : str
+        Kernel backend of VECTORIZED_MODE, one of BACKENDS.
+
+    _production : Dict[str, (np.ndarray, np.ndarray)]
+        Milk and methane production of each herd, computed during the
+        energy expenditure phase by NUMBA_BACKEND and recorded by the milk
+        and methane production phases.
+
+    _pipeline : Pipeline
+        Fused executor of the steps, if steps are run in chunks.
+
+    _next_id : int
+        Next identifier to hand out to an entity.
+
+    _events : collections.Counter
+        Number of births and deaths (by cause) of each entity type during
+        the current step, keyed by (name, event). Logged as one summary line
+        per entity type at the end of the step.
+
+    _totals : collections.Counter
+        Number of births and deaths (by cause) of each entity type, and its
+        total of each of SUMMED_METRICS, over the steps run, keyed by (name,
+        event or metric). Unlike the recorder, it is not flushed to a sink.
+
+    _peaks : Dict[str, int]
+        Largest population of each entity type at the start of a step.
     """
 
     DEFAULT_MAX_CAPACITY = 100
     DEFAULT_STEPS = 365
 
+    # Report file of the profiler measurements.
+    TIMINGS_FILE = "timings.csv"
+
+    # Report file of the mapping from entity identifiers to UUIDs.
+    UUIDS_FILE = "uuids.csv"
+
+    # Format version of the snapshots written by `checkpoint`.
+    CHECKPOINT_VERSION = 2
+
+    # Simulation modes
+    VECTORIZED_MODE = "vectorized"
+    OBJECT_MODE = "object"
+    MODES = [VECTORIZED_MODE, OBJECT_MODE]
+
+    # Kernel backends of VECTORIZED_MODE
+    #
+    # NUMPY_BACKEND runs each phase as NumPy array operations.
+    #
+    # NUMBA_BACKEND runs energy expenditure, weight loss, milk and methane
+    # production in a single pass over each herd (see `metabolism_batch`),
+    # compiled with Numba. Milk noise is then drawn from the energy
+    # expenditure stream, so runs differ from NUMPY_BACKEND runs of the same
+    # seed, but are as reproducible.
+    NUMPY_BACKEND = "numpy"
+    NUMBA_BACKEND = "numba"
+    BACKENDS = [NUMPY_BACKEND, NUMBA_BACKEND]
+
+    # Recording modes
+    #
+    # FULL_RECORDING records every per-cow metric of every cow at every step,
+    # and registers every cow, so memory grows with steps x cows ever born.
+    #
+    # AGGREGATE_RECORDING only records herd-level reductions of the per-cow
+    # metrics at each step (see `aggregate_metric`), and the number of births
+    # instead of the registry of cows, so memory grows with steps only.
+    FULL_RECORDING = "full"
+    AGGREGATE_RECORDING = "aggregate"
+    RECORDING_MODES = [FULL_RECORDING, AGGREGATE_RECORDING]
+
+    # Reductions of every per-cow metric under AGGREGATE_RECORDING.
+    AGGREGATE_STATISTICS = ["total", "mean"]
+
+    # Quantiles of QUANTILE_METRICS recorded under AGGREGATE_RECORDING.
+    QUANTILES = {"p10": 0.1, "p50": 0.5, "p90": 0.9}
+
+    # Recorded metrics
+    POPULATION_METRIC = "population"
+    AGE_METRIC = "age"
+    CALORIES_METRIC = "calories"
+    WEIGHT_METRIC = "weight"
+    FEEDING_METRIC = "feeding"
+    MILK_METRIC = "milk"
+    METHANE_METRIC = "methane"
+    ENTITY_METRICS = [
+        AGE_METRIC,
+        CALORIES_METRIC,
+        WEIGHT_METRIC,
+        FEEDING_METRIC,
+        MILK_METRIC,
+        METHANE_METRIC,
+    ]
+    QUANTILE_METRICS = [CALORIES_METRIC, WEIGHT_METRIC]
+
+    # Per-cow metrics totalled over the run by `summary`.
+    SUMMED_METRICS = [FEEDING_METRIC, MILK_METRIC, METHANE_METRIC]
+
+    # Events counted during each step
+    BIRTH_EVENT = "births"
+    OVERPOPULATION_EVENT = "overpopulation"
+    DEATH_EVENTS = [
+        cause.name.lower()
+        for cause in CauseOfDeath
+        if cause is not CauseOfDeath.NOT_DEAD
+    ] + [OVERPOPULATION_EVENT]
+
     def __init__(
         self,
         entities: [(Type[Cow], int)],
         max_capacity: int = DEFAULT_MAX_CAPACITY,
         max_steps: int = DEFAULT_STEPS,
+        mode: str = VECTORIZED_MODE,
+        pairing: str = MONOGAMOUS_PAIRING,
+        sink: Sink = None,
+        seed: int = None,
+        profiler: PhaseProfiler = None,
+        emotions: str = PER_TRIAL_EMOTIONS,
+        shards: int = 1,
+        recording: str = FULL_RECORDING,
+        trace_fraction: float = None,
+        trace_max: int = None,
+        backend: str = NUMPY_BACKEND,
+        chunk_size: int = None,
     ):
         """Constructor for Environment and derived classes.
 
@@ -60,16 +235,155 @@ class CowPen(Environment):
         max_steps : int
             Number of steps to run the simulation.
 
+        mode : str
+            Either VECTORIZED_MODE, where each cow species is stored as a
+            Population and every phase runs in bulk, or OBJECT_MODE, where
+            each cow is a Cow instance and phases call its methods one at a
+            time.
+
+        pairing : str
+            How cows are paired up for reproduction, one of PAIRING_MODES.
+            MONOGAMOUS_PAIRING costs time linear in herd size.
+            ALL_PAIRS_PAIRING reproduces the expected number of births of
+            trying every ordered pair of cows.
+
+        sink : Sink
+            If provided, recorded data is streamed to the sink at the end of
+            every step instead of being kept in memory until `report`.
+
+        seed : int
+            Seed of every random draw of the simulation. Runs with the same
+            seed and parameters produce the same results. If None, fresh
+            entropy is used and recorded in `parameters`.
+
+        profiler : PhaseProfiler
+            If provided, every phase of every step is measured by the
+            profiler, and `report` writes its measurements to TIMINGS_FILE.
+
+        emotions : str
+            When cows' emotions are drawn for reproduction, one of
+            EMOTION_MODES. PER_STEP_EMOTIONS draws every cow's emotion once
+            per step, in bulk, so it is consistent across the pairs the cow
+            is tried in.
+
+        shards : int
+            Number of shards each herd is split into (VECTORIZED_MODE only).
+            With more than one shard, the per-cow phases (energy
+            expenditure, caloric intake, cause of death evaluation, milk and
+            methane production) run shard by shard on a thread pool, each
+            shard drawing from its own random stream. Feeding allocation,
+            reproduction and culling still see the whole herd. Results
+            depend on the number of shards, but not on thread scheduling.
+
+        recording : str
+            What is recorded at each step, one of RECORDING_MODES.
+            FULL_RECORDING keeps every per-cow value, while
+            AGGREGATE_RECORDING only keeps herd-level totals, means and
+            quantiles.
+
+        trace_fraction : float
+            Under AGGREGATE_RECORDING, also record every per-cow metric of
+            this fraction of the cows, in (0, 1]. Cows are selected by a
+            hash of their identifier salted with the seed, when they join
+            the cow pen, and traced until they die.
+
+        trace_max : int
+            Under AGGREGATE_RECORDING, also record every per-cow metric of at
+            most this many living cows of each type. Cows that join while
+            the limit is reached are not traced. Combined with
+            trace_fraction, only selected cows are traced, up to the limit.
+
+        backend : str
+            Kernels of VECTORIZED_MODE, one of BACKENDS. If Numba is not
+            installed, NUMBA_BACKEND falls back to NUMPY_BACKEND with a
+            warning.
+
+        chunk_size : int
+            Run steps through a fused Pipeline (see `pipeline_phases`), whose
+            per-cow phases make a single pass over each herd in chunks of
+            this many cows. By default, each phase runs over whole herds in
+            turn.
+
         Raises
         ------
         RuntimeError
             - If entity is not derived from Cow.
             - If quantity is less than zero.
+            - If mode is not one of MODES.
+            - If pairing is not one of PAIRING_MODES.
+            - If emotions is not one of EMOTION_MODES.
+            - If shards is less than one, or more than one in OBJECT_MODE.
+            - If recording is not one of RECORDING_MODES.
+            - If trace_fraction is not in (0, 1] or trace_max is negative.
+            - If tracing is requested under FULL_RECORDING.
+            - If backend is not one of BACKENDS, or is NUMBA_BACKEND in
+              OBJECT_MODE.
+            - If chunk_size is less than one, or is set in OBJECT_MODE.
         """
-        super().__init__(max_capacity, max_steps)
-        self._feed = (OrangeGrass, max_capacity)
+        super().__init__(max_capacity, max_steps, seed)
+
+        if mode not in CowPen.MODES:
+            raise RuntimeError(f"Unknown simulation mode: {mode}")
+        self._mode = mode
+        self.set_feed(OrangeGrass, max_capacity)
+
+        if pairing not in PAIRING_MODES:
+            raise RuntimeError(f"Unknown pairing mode: {pairing}")
+        self._pairing = pairing
+
+        if emotions not in EMOTION_MODES:
+            raise RuntimeError(f"Unknown emotion mode: {emotions}")
+        self._emotions = emotions
+
+        if shards < 1:
+            raise RuntimeError(f"Number of shards must be positive: {shards}")
+        if shards > 1 and mode == CowPen.OBJECT_MODE:
+            raise RuntimeError("Sharding requires the vectorized mode.")
+        self._shard_pool = ShardPool(shards) if shards > 1 else None
+
+        if recording not in CowPen.RECORDING_MODES:
+            raise RuntimeError(f"Unknown recording mode: {recording}")
+        self._recording = recording
+
+        self._tracing = trace_fraction is not None or trace_max is not None
+        if self._tracing and recording != CowPen.AGGREGATE_RECORDING:
+            raise RuntimeError("Tracing requires the aggregate recording mode.")
+        if trace_fraction is not None and not 0 < trace_fraction <= 1:
+            raise RuntimeError(f"Trace fraction not in (0, 1]: {trace_fraction}")
+        if trace_max is not None and trace_max < 0:
+            raise RuntimeError(f"Trace limit is negative: {trace_max}")
+        self._trace_fraction = trace_fraction
+        self._trace_max = trace_max
+        self._traced = {}
+
+        if backend not in CowPen.BACKENDS:
+            raise RuntimeError(f"Unknown backend: {backend}")
+        if backend == CowPen.NUMBA_BACKEND and mode == CowPen.OBJECT_MODE:
+            raise RuntimeError("The numba backend requires the vectorized mode.")
+        if backend == CowPen.NUMBA_BACKEND and not NUMBA_AVAILABLE:
+            LOG.warning("Numba is not installed, using the numpy backend instead.")
+            backend = CowPen.NUMPY_BACKEND
+        self._backend = backend
+        self._production = {}
+
+        if chunk_size is not None and chunk_size < 1:
+            raise RuntimeError(f"Chunk size must be positive: {chunk_size}")
+        if chunk_size is not None and mode == CowPen.OBJECT_MODE:
+            raise RuntimeError("The fused pipeline requires the vectorized mode.")
+        self._pipeline = (
+            None if chunk_size is None else Pipeline(self.pipeline_phases(), chunk_size)
+        )
+        self._recorder = Recorder()
+        self._sink = sink
+        self._profiler = profiler
+        self._initial_entities = [(tup[0].name, tup[1]) for tup in entities]
+        self._next_id = 0
+        self._events = collections.Counter()
+        self._totals = collections.Counter()
+        self._peaks = {}
 
         # Generating cows for the cow pen.
+        rng = self._streams.generator("setup")
         for tup in entities:
             if not issubclass(tup[0], Cow):
                 raise RuntimeError("Entity provided in not cow.")
@@ -79,44 +393,107 @@ class CowPen(Environment):
 
             entity = tup[0]
             quantity = tup[1]
-            entity_list = [entity.generate() for _ in range(quantity)]
-            if entity.name not in self._entities:
-                self._entities[entity.name] = []
+            if self._mode == CowPen.OBJECT_MODE:
+                entity_list = [entity.generate(rng) for _ in range(quantity)]
+                if entity.name not in self._entities:
+                    self._entities[entity.name] = []
+
+                self._entities[entity.name] += entity_list
+                self._register(entity.name, entity_list)
+            else:
+                if entity.name not in self._entities:
+                    self._entities[entity.name] = Population(entity, quantity)
+
+                ids = self._allocate_ids(quantity)
+                self._entities[entity.name].extend(
+                    ids, *entity.generate_batch(quantity, rng)
+                )
+                self._register_ids(entity.name, ids)
 
-            self._entities[entity.name] += entity_list
+    @staticmethod
+    def deaths_metric(event: str) -> str:
+        """Name of the aggregate metric counting the deaths of a cause.
 
-        self._feeding_data = {}
-        for key in self._entities.keys():
-            self._feeding_data[key] = pd.DataFrame(
-                columns=[cow.id for cow in self._entities[key]],
-                index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-            )
+        Parameters
+        ----------
+        event : str
+            One of DEATH_EVENTS.
 
-        self._milk_data = {}
-        for key in self._entities.keys():
-            self._milk_data[key] = pd.DataFrame(
-                columns=[cow.id for cow in self._entities[key]],
-                index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-            )
+        Returns
+        -------
+        str
+            The metric name.
+        """
+        return f"deaths_{event}"
 
-        self._methane_data = {}
-        for key in self._entities.keys():
-            self._methane_data[key] = pd.DataFrame(
-                columns=[cow.id for cow in self._entities[key]],
-                index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-            )
+    @staticmethod
+    def aggregate_metric(metric: str, statistic: str) -> str:
+        """Name of the herd-level metric holding a statistic of a per-cow
+        metric under AGGREGATE_RECORDING.
 
-        self._population_data = pd.DataFrame(
-            columns=[key for key in self._entities.keys()],
-            index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-        )
+        Parameters
+        ----------
+        metric : str
+            One of ENTITY_METRICS.
 
-        self._entity_data = {}
-        for key in self._entities.keys():
-            self._entity_data[key] = pd.DataFrame(
-                columns=[cow.id for cow in self._entities[key]],
-                index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-            )
+        statistic : str
+            One of AGGREGATE_STATISTICS, or of QUANTILES for
+            QUANTILE_METRICS.
+
+        Returns
+        -------
+        str
+            The metric name.
+        """
+        return f"{metric}_{statistic}"
+
+    @property
+    def mode(self) -> str:
+        """Simulation mode of the cow pen."""
+        return self._mode
+
+    @property
+    def backend(self) -> str:
+        """Kernel backend of VECTORIZED_MODE, one of BACKENDS."""
+        return self._backend
+
+    @property
+    def feed(self) -> (Type[Feed], int):
+        """Type of Feed and number of servings provided at each step."""
+        return self._feed
+
+    @property
+    def parameters(self) -> dict:
+        """Parameters of the simulation run, in JSON serializable form."""
+        return {
+            "environment": self.__class__.name,
+            "entities": [list(entity) for entity in self._initial_entities],
+            "max_capacity": self._max_capacity,
+            "max_steps": self._max_steps,
+            "steps": self._steps,
+            "mode": self._mode,
+            "pairing": self._pairing,
+            "emotions": self._emotions,
+            "shards": 1 if self._shard_pool is None else self._shard_pool.shards,
+            "recording": self._recording,
+            "trace_fraction": self._trace_fraction,
+            "trace_max": self._trace_max,
+            "backend": self._backend,
+            "chunk_size": None if self._pipeline is None else self._pipeline.chunk_size,
+            "feed": [self._feed[0].name, self._feed[1]],
+            "seed": self._streams.seed,
+            "version": cowsim.__version__,
+        }
+
+    @property
+    def recorder(self) -> Recorder:
+        """Telemetry recorded by the simulation."""
+        return self._recorder
+
+    @property
+    def profiler(self) -> PhaseProfiler:
+        """Profiler measuring the simulation phases, if any."""
+        return self._profiler
 
     def step(self) -> None:
         """Perform simulation step in cowpen.
@@ -129,35 +506,182 @@ class CowPen(Environment):
         -------
         None
         """
-        # Record population
-        for key in self._entities.keys():
-            self._population_data[key].iloc[self._steps] = len(self._entities[key])
-
-        # Record entity data
-        for key in self._entities.keys():
-            for entity in self._entities[key]:
-                self._entity_data[key][entity.id].iloc[self._steps] = (
-                    entity.age,
-                    entity.calories,
-                    entity.weight,
+        if self._pipeline is not None:
+            profile = None
+            if self._profiler is not None:
+                profile = lambda name: self._profiler.phase(
+                    self._steps, name, self._entity_count
                 )
+            self._pipeline.step(
+                self._entities, self._streams.generator, self._shard_pool, profile
+            )
+        else:
+            self._run_phases()
 
-        self._feeding_phase()
-        self._reproduction_phase()
-        self._energy_expenditure_phase()
-        self._population_pruning_phase()
-        self._milk_production_phase()
-        self._methane_production_phase()
+        self._totals.update(self._events)
+        self._log_events()
+        self._steps += 1
 
-        # Age population
-        for key in self._entities.keys():
-            for entity in self._entities[key]:
-                entity.increment_age()
+    def _run_phases(self) -> None:
+        """Run the phases of a step one after the other, each over whole herds.
 
-        self._steps += 1
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        phases = [
+            ("recording", self._recording_phase),
+            ("feeding", self._feeding_phase),
+            ("reproduction", self._reproduction_phase),
+            ("energy_expenditure", self._energy_expenditure_phase),
+            ("population_pruning", self._population_pruning_phase),
+            ("milk_production", self._milk_production_phase),
+            ("methane_production", self._methane_production_phase),
+            ("aging", self._aging_phase),
+            ("streaming", self._streaming_phase),
+        ]
+        for name, phase in phases:
+            if self._profiler is None:
+                phase()
+                continue
+
+            with self._profiler.phase(self._steps, name, self._entity_count):
+                phase()
+
+    def pipeline_phases(self) -> [Phase]:
+        """Phases of a step in VECTORIZED_MODE, declared for a Pipeline.
+
+        They follow the order of the phases run by `step`, with population
+        pruning split into a "mortality" kernel, which finds the cause of
+        death of every cow, and a barrier that removes the dead. Milk and
+        methane production are recorded by a "production_recording" barrier
+        once the per-cow phases after pruning are done. Under NUMBA_BACKEND,
+        milk and methane production are part of the energy expenditure
+        kernel, as in `step`.
+
+        The kernels between two barriers (energy expenditure and mortality,
+        then milk production, methane production and aging) make a single
+        pass over each herd.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        [Phase]
+            The phases, in order.
+        """
+        attributes = ("age", "sex", "calories", "weight")
+
+        def expend_calories(chunk, rng):
+            chunk.species.expend_calories_batch(chunk, rng)
+
+        def metabolism(chunk, rng, milk, methane):
+            chunk.species.metabolism_batch(chunk, rng, milk, methane)
+
+        def mortality(chunk, rng, causes):
+            causes[:] = chunk.species.cause_of_death_batch(chunk)
+
+        def produce_milk(chunk, rng, milk):
+            milk[:] = chunk.species.milk_production_batch(chunk, rng)
+
+        def produce_methane(chunk, rng, methane):
+            methane[:] = chunk.species.methane_production_batch(chunk)
+
+        def age(chunk, rng):
+            chunk.age[:] += 1
+
+        if self._backend == CowPen.NUMBA_BACKEND:
+            energy_expenditure = [
+                Phase(
+                    "energy_expenditure",
+                    kernel=metabolism,
+                    stream="energy_expenditure",
+                    reads=attributes,
+                    writes=("calories", "weight"),
+                    outputs={"milk": np.float64, "methane": np.float64},
+                )
+            ]
+            production = []
+        else:
+            energy_expenditure = [
+                Phase(
+                    "energy_expenditure",
+                    kernel=expend_calories,
+                    stream="energy_expenditure",
+                    reads=attributes,
+                    writes=("calories", "weight"),
+                )
+            ]
+            production = [
+                Phase(
+                    "milk_production",
+                    kernel=produce_milk,
+                    stream="milk_production",
+                    reads=attributes,
+                    outputs={"milk": np.float64},
+                ),
+                Phase(
+                    "methane_production",
+                    kernel=produce_methane,
+                    reads=attributes,
+                    outputs={"methane": np.float64},
+                ),
+            ]
 
-    def run(self) -> None:
-        """Run the entire simulation.
+        return [
+            Phase(
+                "recording",
+                run=lambda outputs: self._recording_phase(),
+                reads=("ids", "age", "calories", "weight"),
+            ),
+            Phase(
+                "feeding",
+                run=lambda outputs: self._feeding_phase(),
+                reads=(HERD, *attributes),
+                writes=("calories", "weight"),
+            ),
+            Phase(
+                "reproduction",
+                run=lambda outputs: self._reproduction_phase(),
+                reads=(HERD, "age", "sex"),
+                writes=(HERD,),
+            ),
+            *energy_expenditure,
+            Phase(
+                "mortality",
+                kernel=mortality,
+                reads=attributes,
+                outputs={"causes": np.int8},
+            ),
+            Phase(
+                "population_pruning",
+                run=lambda outputs: self._population_pruning_phase(
+                    {key: values["causes"] for key, values in outputs.items()}
+                ),
+                reads=(HERD, "causes"),
+                writes=(HERD,),
+            ),
+            *production,
+            Phase("aging", kernel=age, reads=("age",), writes=("age",)),
+            Phase(
+                "production_recording",
+                run=self._production_recording_phase,
+                reads=("ids", "milk", "methane"),
+            ),
+            Phase(
+                "streaming",
+                run=lambda outputs: self._streaming_phase(),
+            ),
+        ]
+
+    def _log_events(self) -> None:
+        """Log the births and deaths counted during the step, then reset them.
 
         Parameters
         ----------
@@ -167,27 +691,258 @@ class CowPen(Environment):
         -------
         None
         """
-        for _ in range(self._max_steps):
-            LOG.info(f"Starting iteration {self._steps}")
+        if LOG.isEnabledFor(logging.INFO):
+            for key in self._entities.keys():
+                deaths = [
+                    (event, self._events[key, event]) for event in CowPen.DEATH_EVENTS
+                ]
+                LOG.info(
+                    "Step %d: %d %s, %d born, %d died (%s)",
+                    self._steps,
+                    len(self._entities[key]),
+                    key,
+                    self._events[key, CowPen.BIRTH_EVENT],
+                    sum(count for _, count in deaths),
+                    ", ".join(f"{event}={count}" for event, count in deaths),
+                )
+        self._events.clear()
+
+    def run(self, checkpoint_path: str = None, checkpoint_every: int = None) -> None:
+        """Run the simulation until `max_steps` steps have elapsed.
+
+        A resumed cow pen continues from the step it was checkpointed at.
+
+        Parameters
+        ----------
+        checkpoint_path : str
+            File to write checkpoints to, if any.
+
+        checkpoint_every : int
+            Number of steps between checkpoints. Defaults to never.
+
+        Returns
+        -------
+        None
+        """
+        if self._profiler is not None:
+            self._profiler.start()
+        try:
+            self._run(checkpoint_path, checkpoint_every)
+        finally:
+            if self._profiler is not None:
+                self._profiler.stop()
+            if self._shard_pool is not None:
+                self._shard_pool.close()
+
+    def _run(self, checkpoint_path: str, checkpoint_every: int) -> None:
+        """Step the simulation until `max_steps` steps have elapsed.
+
+        Parameters
+        ----------
+        checkpoint_path : str
+            File to write checkpoints to, if any.
+
+        checkpoint_every : int
+            Number of steps between checkpoints, if any.
+
+        Returns
+        -------
+        None
+        """
+        while self._steps < self._max_steps:
+            LOG.debug("Starting iteration %d", self._steps)
 
             for key in self._entities.keys():
                 if len(self._entities[key]) == 0:
                     LOG.warning(
-                        f"The {key} population is extinct. Stopping simulation at step {self._steps}."
+                        "The %s population is extinct. Stopping simulation at step %d.",
+                        key,
+                        self._steps,
                     )
                     return
 
             self.step()
-            LOG.info(f"Finishing iteration {self._steps}")
 
-    def report(self, directory: str) -> None:
+            if checkpoint_every and self._steps % checkpoint_every == 0:
+                self.checkpoint(checkpoint_path)
+                LOG.info("Checkpointed step %d to %s", self._steps, checkpoint_path)
+
+    def checkpoint(self, path: str) -> None:
+        """Save a snapshot of the simulation that `resume` continues from.
+
+        The snapshot is an uncompressed NumPy archive holding the attribute
+        arrays of every herd, the recorder buffers, and (as JSON) the run
+        parameters, step counter and random number generator states. It is
+        written under a temporary name and then renamed, so an interrupted
+        checkpoint never replaces the previous one.
+
+        Parameters
+        ----------
+        path : str
+            File to write the snapshot to.
+
+        Returns
+        -------
+        None
+        """
+        arrays = {}
+        species = {}
+        for key, entities in self._entities.items():
+            if self._mode == CowPen.OBJECT_MODE:
+                species[key] = (
+                    _qualified_name(entities[0].__class__) if entities else None
+                )
+                population = Population.from_entities(
+                    entities[0].__class__ if entities else Cow, entities, self._ids(key)
+                )
+            else:
+                species[key] = _qualified_name(entities.species)
+                population = entities
+
+            for field in Population.FIELDS:
+                arrays[f"entities/{key}/{field}"] = getattr(population, field)
+
+        for name, values in self._recorder.snapshot().items():
+            arrays[f"recorder/{name}"] = values
+
+        for key, traced in self._traced.items():
+            arrays[f"traced/{key}"] = traced
+
+        state = {
+            "version": CowPen.CHECKPOINT_VERSION,
+            "parameters": self.parameters,
+            "feed": _qualified_name(self._feed[0]),
+            "species": species,
+            "next_id": self._next_id,
+            "rng": self._streams.state(),
+            "totals": [[*key, value] for key, value in self._totals.items()],
+            "peaks": self._peaks,
+        }
+
+        path = pathlib.Path(path)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "wb") as file:
+            np.savez(file, state=np.array(json.dumps(state)), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def resume(
+        cls, path: str, sink: Sink = None, profiler: PhaseProfiler = None
+    ) -> "CowPen":
+        """Restore a cow pen from a snapshot written by `checkpoint`.
+
+        Running the restored cow pen produces the same results as running
+        the original one would have.
+
+        Parameters
+        ----------
+        path : str
+            File the snapshot was written to.
+
+        sink : Sink
+            If provided, recorded data is streamed to the sink from the
+            restored step onwards.
+
+        profiler : PhaseProfiler
+            If provided, phases are measured from the restored step onwards.
+
+        Returns
+        -------
+        CowPen
+            The restored cow pen.
+
+        Raises
+        ------
+        RuntimeError
+            If the snapshot was written by an incompatible version.
+        """
+        with np.load(path) as archive:
+            state = json.loads(str(archive["state"]))
+            if state["version"] != CowPen.CHECKPOINT_VERSION:
+                raise RuntimeError(f"Unsupported checkpoint version: {path}")
+
+            parameters = state["parameters"]
+            cowpen = cls(
+                [],
+                max_capacity=parameters["max_capacity"],
+                max_steps=parameters["max_steps"],
+                mode=parameters["mode"],
+                pairing=parameters["pairing"],
+                emotions=parameters.get("emotions", PER_TRIAL_EMOTIONS),
+                shards=parameters.get("shards", 1),
+                recording=parameters.get("recording", CowPen.FULL_RECORDING),
+                trace_fraction=parameters.get("trace_fraction"),
+                trace_max=parameters.get("trace_max"),
+                backend=parameters.get("backend", CowPen.NUMPY_BACKEND),
+                chunk_size=parameters.get("chunk_size"),
+                sink=sink,
+                seed=parameters["seed"],
+                profiler=profiler,
+            )
+            cowpen._initial_entities = [tuple(e) for e in parameters["entities"]]
+            cowpen._feed = (_import_class(state["feed"]), parameters["feed"][1])
+            cowpen._steps = parameters["steps"]
+            cowpen._next_id = state["next_id"]
+            cowpen._streams.set_state(state["rng"])
+            cowpen._totals = collections.Counter(
+                {(key, name): value for key, name, value in state["totals"]}
+            )
+            cowpen._peaks = state["peaks"]
+
+            prefix = "recorder/"
+            cowpen._recorder = Recorder.from_snapshot(
+                {
+                    name[len(prefix) :]: archive[name]
+                    for name in archive.files
+                    if name.startswith(prefix)
+                }
+            )
+
+            prefix = "traced/"
+            cowpen._traced = {
+                name[len(prefix) :]: archive[name]
+                for name in archive.files
+                if name.startswith(prefix)
+            }
+
+            for key, species_name in state["species"].items():
+                fields = [archive[f"entities/{key}/{f}"] for f in Population.FIELDS]
+                if species_name is None:
+                    cowpen._entities[key] = []
+                    continue
+
+                population = Population(_import_class(species_name), len(fields[0]))
+                population.extend(*fields)
+                if cowpen._mode == CowPen.OBJECT_MODE:
+                    cowpen._entities[key] = population.to_entities()
+                else:
+                    cowpen._entities[key] = population
+
+        return cowpen
+
+    def report(
+        self, directory: str, report_format: str = CSV_FORMAT, uuids: bool = False
+    ) -> None:
         """Produce report of simulation execution.
 
+        If the cow pen streams to a sink, the remaining records are flushed
+        and the sink is closed instead, since the data was already written.
+        If the cow pen has a profiler, its measurements are written to
+        TIMINGS_FILE in the directory either way.
+
         Parameters
         ----------
         directory : str
             Path to output report.
 
+        report_format : str
+            One of REPORT_FORMATS. CSV_FORMAT writes wide CSVs with one
+            column per cow, while the columnar formats write long-format
+            tables along with the run parameters.
+
+        uuids : bool
+            Also write the `entity_uuids` mapping to UUIDS_FILE.
+
         Returns
         -------
         None
@@ -195,17 +950,206 @@ class CowPen(Environment):
         dir_path = pathlib.Path(directory)
         dir_path.resolve()
         if not dir_path.is_dir():
-            LOG.info(f"Creating directory: {dir_path}")
+            LOG.info("Creating directory: %s", dir_path)
             os.makedirs(directory)
 
+        if self._profiler is not None:
+            self._profiler.frame().to_csv(
+                dir_path.joinpath(CowPen.TIMINGS_FILE), index=False
+            )
+
+        if uuids:
+            self.entity_uuids().to_csv(
+                dir_path.joinpath(CowPen.UUIDS_FILE), index=False
+            )
+
+        if self._sink is not None:
+            self._recorder.flush(self._sink)
+            self._sink.close()
+            LOG.info("Simulation data was streamed to %s", self._sink)
+            return
+
+        report_backend(report_format).write(self, dir_path)
+
+    def entity_uuids(self) -> pd.DataFrame:
+        """UUID of every identifier handed out to an entity.
+
+        Entities are recorded under compact integer identifiers. For export to
+        systems that expect globally unique keys, each identifier maps to a
+        name-based UUID derived from the seed of the run, so the mapping is
+        the same whenever the run is reproduced.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        pd.DataFrame
+            Data frame with Id and Uuid columns, in identifier order.
+        """
+        namespace = uuid.uuid5(uuid.NAMESPACE_URL, f"cowsim:{self._streams.seed}")
+        ids = np.arange(self._next_id, dtype=np.int64)
+        return pd.DataFrame(
+            {
+                "Id": ids,
+                "Uuid": [str(uuid.uuid5(namespace, str(id))) for id in ids.tolist()],
+            }
+        )
+
+    def wide_frames(self, key: str) -> {str: pd.DataFrame}:
+        """Recorded data of an entity type, with one row per step.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            The population series, the deaths data frame (with one column
+            per cause) and the entities, feeding, milk and methane data
+            frames (with one column per cow), keyed by name. Under
+            AGGREGATE_RECORDING, the births series and one data frame per
+            entity metric (with one column per statistic) replace the
+            per-cow data frames.
+        """
+        if self._recording == CowPen.AGGREGATE_RECORDING:
+            return self._aggregate_frames(key)
+
+        frames = {
+            "population": self._recorder.aggregate_series(
+                key, CowPen.POPULATION_METRIC, self._max_steps
+            ),
+            "entities": self.entity_frame(key),
+            "deaths": pd.DataFrame(
+                {
+                    event: self._recorder.aggregate_series(
+                        key, CowPen.deaths_metric(event), self._max_steps
+                    )
+                    for event in CowPen.DEATH_EVENTS
+                }
+            ),
+        }
+        for metric in (
+            CowPen.FEEDING_METRIC,
+            CowPen.MILK_METRIC,
+            CowPen.METHANE_METRIC,
+        ):
+            frames[metric] = self._recorder.wide_frame(key, metric, self._max_steps)
+        return frames
+
+    def _aggregate_frames(self, key: str) -> {str: pd.DataFrame}:
+        """Recorded data of an entity type under AGGREGATE_RECORDING, with one
+        row per step.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            The population and births series, the deaths data frame (with one
+            column per cause) and a data frame per entity metric (with one
+            column per statistic), keyed by name. If cows are traced, the
+            `traced_<metric>` data frames also hold each entity metric of the
+            traced cows (with one column per cow).
+        """
+        frames = {
+            metric: self._recorder.aggregate_series(key, metric, self._max_steps)
+            for metric in (CowPen.POPULATION_METRIC, CowPen.BIRTH_EVENT)
+        }
+        frames["deaths"] = pd.DataFrame(
+            {
+                event: self._recorder.aggregate_series(
+                    key, CowPen.deaths_metric(event), self._max_steps
+                )
+                for event in CowPen.DEATH_EVENTS
+            }
+        )
+        for metric in CowPen.ENTITY_METRICS:
+            statistics = list(CowPen.AGGREGATE_STATISTICS)
+            if metric in CowPen.QUANTILE_METRICS:
+                statistics += list(CowPen.QUANTILES)
+            frames[metric] = pd.DataFrame(
+                {
+                    statistic: self._recorder.aggregate_series(
+                        key, CowPen.aggregate_metric(metric, statistic), self._max_steps
+                    )
+                    for statistic in statistics
+                }
+            )
+            if self._tracing:
+                frames[f"traced_{metric}"] = self._recorder.wide_frame(
+                    key, metric, self._max_steps
+                )
+        return frames
+
+    def summary(self) -> {str: float}:
+        """Herd-level totals of the simulation run so far.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        Dict[str, float]
+            The number of steps run and, for each type of cow, its final and
+            peak population, number of births, number of deaths of each of
+            DEATH_EVENTS and total servings, milk and methane. Keys of the
+            latter are prefixed with the cow type name.
+
+        Notes
+        -----
+        Totals are kept as the simulation runs, so they include records
+        already streamed to a sink.
+        """
+        summary = {"steps": float(self._steps)}
+        totals = self._totals + self._events
         for key in self._entities.keys():
-            self._population_data[key].to_csv(
-                dir_path.joinpath(f"{key}_population.csv")
+            population = len(self._entities[key])
+            summary[f"{key}_final_population"] = float(population)
+            summary[f"{key}_peak_population"] = float(
+                max(self._peaks.get(key, 0), population)
+            )
+            summary[f"{key}_births"] = float(totals[key, CowPen.BIRTH_EVENT])
+            for event in CowPen.DEATH_EVENTS:
+                metric = CowPen.deaths_metric(event)
+                summary[f"{key}_{metric}"] = float(totals[key, event])
+            for metric in CowPen.SUMMED_METRICS:
+                summary[f"{key}_total_{metric}"] = float(totals[key, metric])
+        return summary
+
+    def entity_frame(self, key: str) -> pd.DataFrame:
+        """Recorded entity data with one row per step and one column per cow.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        pd.DataFrame
+            Data frame indexed by Step, where each recorded value is a tuple
+            of (age, calories, weight) and unrecorded values are NaN.
+        """
+        age, calories, weight = (
+            self._recorder.wide_frame(key, metric, self._max_steps)
+            for metric in (
+                CowPen.AGE_METRIC,
+                CowPen.CALORIES_METRIC,
+                CowPen.WEIGHT_METRIC,
             )
-            self._entity_data[key].to_csv(dir_path.joinpath(f"{key}_entities.csv"))
-            self._feeding_data[key].to_csv(dir_path.joinpath(f"{key}_feeding.csv"))
-            self._milk_data[key].to_csv(dir_path.joinpath(f"{key}_milk.csv"))
-            self._methane_data[key].to_csv(dir_path.joinpath(f"{key}_methane.csv"))
+        )
+        records = np.frompyfunc(
+            lambda a, c, w: np.nan if np.isnan(a) else (int(a), c, w), 3, 1
+        )(age.to_numpy(dtype=float), calories.to_numpy(), weight.to_numpy())
+        return pd.DataFrame(records, index=age.index, columns=age.columns)
 
     def set_feed(self, feed: Type[Feed], servings: int) -> None:
         """Set feed for cow pen environment.
@@ -224,9 +1168,91 @@ class CowPen(Environment):
         """
         self._feed = (feed, servings)
 
+    def _aging_phase(self) -> None:
+        """Age every cow by one day.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        for key in self._entities.keys():
+            if self._mode == CowPen.OBJECT_MODE:
+                for entity in self._entities[key]:
+                    entity.increment_age()
+            else:
+                self._entities[key].age[:] += 1
+
+    def _streaming_phase(self) -> None:
+        """Stream the records of this step to the sink, if any.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        if self._sink is not None:
+            self._recorder.flush(self._sink)
+
+    def _entity_count(self) -> int:
+        """Number of living cows of every type.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        int
+            Number of cows.
+        """
+        return sum(len(entities) for entities in self._entities.values())
+
+    def _recording_phase(self) -> None:
+        """Record the population and the age, calories and weight of each cow
+        at the start of the step.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        for key in self._entities.keys():
+            population = len(self._entities[key])
+            self._peaks[key] = max(self._peaks.get(key, 0), population)
+            self._recorder.record_aggregate(
+                key, CowPen.POPULATION_METRIC, self._steps, population
+            )
+
+            entities = self._entities[key]
+            if self._mode == CowPen.OBJECT_MODE:
+                age = np.array([e.age for e in entities], dtype=np.int64)
+                calories = np.array([e.calories for e in entities], dtype=np.float64)
+                weight = np.array([e.weight for e in entities], dtype=np.float64)
+            else:
+                age, calories, weight = entities.age, entities.calories, entities.weight
+
+            self._record(key, CowPen.AGE_METRIC, age)
+            self._record(key, CowPen.CALORIES_METRIC, calories)
+            self._record(key, CowPen.WEIGHT_METRIC, weight)
+
     def _feeding_phase(self) -> None:
         """Perform the feeding phase of the simulation.
 
+        In VECTORIZED_MODE, feeds that support batch feeding serve the whole
+        herd at once with `Feed.feed_batch`. Other feeds, and every feed in
+        OBJECT_MODE, serve the cows one at a time with `Feed.feed`, in a
+        random order.
+
         Parameters
         ----------
         none
@@ -235,16 +1261,69 @@ class CowPen(Environment):
         -------
         None
         """
+        feed_cls, total_servings = self._feed
+        rng = self._streams.generator("feeding")
         for key in self._entities.keys():
-            entity_list = self._entities[key]
-            random.shuffle(entity_list)
-            feed = self._feed[0](self._feed[1], entity_list)
-            for entity in entity_list:
-                servings = feed.feed(entity)
-                # Log feeding data
-                self._feeding_data[entity.__class__.name][entity.id].iloc[
-                    self._steps
-                ] = servings
+            herd = self._entities[key]
+            if self._mode == CowPen.OBJECT_MODE:
+                rng.shuffle(herd)
+                feed = feed_cls(total_servings, herd)
+                servings = np.array([feed.feed(entity) for entity in herd], np.int64)
+            elif feed_cls.supports_batch():
+                servings = feed_cls(total_servings).feed_batch(herd.calories, rng)
+                species = herd.species
+                self._apply(
+                    lambda shard, _, kcal: species.caloric_intake_batch(shard, kcal),
+                    herd,
+                    arrays=[servings * feed_cls.CALORIES_PER_SERVING],
+                )
+            else:
+                servings = self._feed_each(feed_cls, total_servings, herd, rng)
+
+            # Log feeding data
+            self._record(key, CowPen.FEEDING_METRIC, servings)
+
+    @staticmethod
+    def _feed_each(
+        feed_cls: Type[Feed],
+        total_servings: int,
+        population: Population,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """Serve the cows of a population one at a time with `Feed.feed`.
+
+        The cows are materialized as instances, served in a random order and
+        their calories and weight are written back to the population.
+
+        Parameters
+        ----------
+        feed_cls : Type[Feed]
+            Class of the feed.
+
+        total_servings : int
+            Number of servings of the feed.
+
+        population : Population
+            The population to feed.
+
+        rng : np.random.Generator
+            Generator of the order cows are served in.
+
+        Returns
+        -------
+        np.ndarray
+            The number of servings given to each cow.
+        """
+        cows = population.to_entities()
+        order = rng.permutation(len(cows)).tolist()
+        served = [cows[index] for index in order]
+        feed = feed_cls(total_servings, served)
+        servings = np.zeros(len(cows), dtype=np.int64)
+        for index, cow in zip(order, served):
+            servings[index] = feed.feed(cow)
+        population.calories[:] = [cow.calories for cow in cows]
+        population.weight[:] = [cow.weight for cow in cows]
+        return servings
 
     def _reproduction_phase(self) -> None:
         """Perform the reproduction phase of the simulation.
@@ -257,61 +1336,27 @@ class CowPen(Environment):
         -------
         None
         """
+        if self._mode == CowPen.VECTORIZED_MODE:
+            self._reproduction_phase_vectorized()
+            return
+
+        rng = self._streams.generator("reproduction")
         for key in self._entities.keys():
-            for entity_a in self._entities[key]:
-                for entity_b in self._entities[key]:
-                    if entity_a.__class__.should_reproduce(entity_a, entity_b):
-                        new_entity = entity_a.__class__.newborn()
-                        self._entities[key].append(new_entity)
-
-                        # Add column to feeding dataframe.
-                        df = self._feeding_data[new_entity.__class__.name]
-                        new_col = pd.DataFrame(
-                            columns=[new_entity.id],
-                            index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-                        )
-                        self._feeding_data[new_entity.__class__.name] = pd.concat(
-                            (df, new_col),
-                            axis=1,
-                        )
-
-                        # Add column to milk dataframe
-                        df = self._milk_data[new_entity.__class__.name]
-                        new_col = pd.DataFrame(
-                            columns=[new_entity.id],
-                            index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-                        )
-                        self._milk_data[new_entity.__class__.name] = pd.concat(
-                            (df, new_col),
-                            axis=1,
-                        )
-
-                        # Add column to methane dataframe
-                        df = self._methane_data[new_entity.__class__.name]
-                        new_col = pd.DataFrame(
-                            columns=[new_entity.id],
-                            index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-                        )
-                        self._methane_data[new_entity.__class__.name] = pd.concat(
-                            (df, new_col),
-                            axis=1,
-                        )
-
-                        # Add column to weight dataframe.
-                        df = self._entity_data[new_entity.__class__.name]
-                        new_col = pd.DataFrame(
-                            columns=[new_entity.id],
-                            index=pd.Index([x for x in range(self._max_steps)], name="Step"),
-                        )
-                        self._entity_data[new_entity.__class__.name] = pd.concat(
-                            (df, new_col),
-                            axis=1,
-                        )
-
-                        LOG.info(f"{entity_a} and {entity_b} reproduced {new_entity}")
-
-    def _population_pruning_phase(self) -> None:
-        """Perform population pruning phase of the simulation.
+            entity_list = self._entities[key]
+            emotions = self._step_emotions(len(entity_list), rng)
+            newborns = [
+                parent.__class__.newborn(rng)
+                for parent in self._reproducing_pairs(entity_list, rng, emotions)
+            ]
+
+            # Newborns join the herd after every pair has been considered.
+            entity_list += newborns
+            self._events[key, CowPen.BIRTH_EVENT] += len(newborns)
+            self._register(key, newborns)
+            self._record_births(key, len(newborns))
+
+    def _reproduction_phase_vectorized(self) -> None:
+        """Perform the reproduction phase on Population stores.
 
         Parameters
         ----------
@@ -321,46 +1366,120 @@ class CowPen(Environment):
         -------
         None
         """
-        # Check if entities should die from any conditions.
-        death_list = []
-        for key in self._entities.keys():
-            for entity in self._entities[key]:
-                match entity.cause_of_death():
-                    case CauseOfDeath.OLD_AGE:
-                        death_list.append(entity)
-                        LOG.info(f"{entity} died from old age.")
-                    case CauseOfDeath.OVERWEIGHT:
-                        death_list.append(entity)
-                        LOG.info(f"{entity} died from being overweight.")
-                    case CauseOfDeath.MALNOURISHED:
-                        death_list.append(entity)
-                        LOG.info(f"{entity} died from being malnourished.")
-                    case CauseOfDeath.NOT_DEAD:
-                        pass
-                    case _:
-                        raise RuntimeError(
-                            "_population_pruning_phase: Unreachable code."
-                        )
-
-        # Filter out dead entities from list
+        rng = self._streams.generator("reproduction")
         for key in self._entities.keys():
-            self._entities[key] = [
-                entity for entity in self._entities[key] if entity not in death_list
-            ]
+            population = self._entities[key]
+            species = population.species
+            emotions = self._step_emotions(len(population), rng)
+            if species.supports_batch():
+                count = BIRTHS[self._pairing](population, rng, emotions)
+            else:
+                # Try every candidate pair of cow instances.
+                pairs = self._reproducing_pairs(population.to_entities(), rng, emotions)
+                count = sum(1 for _ in pairs)
+            self._record_births(key, count)
+            if count == 0:
+                continue
+
+            ids = self._allocate_ids(count)
+            population.extend(ids, *species.newborn_batch(count, rng))
+            self._register_ids(key, ids)
+            self._events[key, CowPen.BIRTH_EVENT] += count
+
+    def _population_pruning_phase(
+        self, causes: {str: np.ndarray} = None
+    ) -> {str: np.ndarray}:
+        """Perform population pruning phase of the simulation.
 
-        # Check for overpopulation
+        Cows that die of natural causes are removed, then, if the herd is
+        still above `max_capacity`, random survivors are culled down to
+        `max_capacity`. The number of deaths of each cause is recorded as an
+        aggregate metric (see `deaths_metric`).
+
+        Parameters
+        ----------
+        causes : Dict[str, np.ndarray]
+            CauseOfDeath value of each cow of each herd, if already found.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Boolean mask of the surviving cows of each herd.
+        """
+        rng = self._streams.generator("pruning")
+        kept = {}
         for key in self._entities.keys():
-            entity_list = self._entities[key]
-            if len(entity_list) > self._max_capacity:
-                random.shuffle(entity_list)
-                overpopulation_diff = len(entity_list) - self._max_capacity
-                LOG.info(
-                    (
-                        f"The following entities of type {key} will perish due to "
-                        f"overpopulation: {entity_list[overpopulation_diff:]}"
-                    )
+            herd = self._entities[key]
+            if causes is not None:
+                herd_causes = causes[key]
+            elif self._mode == CowPen.VECTORIZED_MODE:
+                species = herd.species
+                herd_causes = self._apply(
+                    lambda shard, _: species.cause_of_death_batch(shard), herd
+                )
+            else:
+                herd_causes = np.fromiter(
+                    (entity.cause_of_death().value for entity in herd),
+                    np.int8,
+                    len(herd),
                 )
-                self._entities[key] = entity_list[:overpopulation_diff]
+
+            survivors = self._survivors(key, herd_causes, rng)
+            kept[key] = survivors
+            if self._tracing:
+                self._untrace(key, self._ids(key)[~survivors])
+            if key in self._production:
+                milk, methane = self._production[key]
+                self._production[key] = (milk[survivors], methane[survivors])
+            if self._mode == CowPen.VECTORIZED_MODE:
+                herd.keep(survivors)
+            else:
+                self._entities[key] = list(itertools.compress(herd, survivors))
+        return kept
+
+    def _survivors(
+        self, key: str, causes: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        """Select the cows of a herd that survive the pruning phase.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        causes : np.ndarray
+            CauseOfDeath value of each cow of the herd.
+
+        rng : np.random.Generator
+            Generator that the culled cows are drawn from.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean mask of the surviving cows.
+        """
+        survivors = causes == CauseOfDeath.NOT_DEAD.value
+        counts = np.bincount(causes, minlength=max(c.value for c in CauseOfDeath) + 1)
+
+        # Cull random survivors down to the max capacity, without shuffling
+        # the whole herd.
+        alive = np.flatnonzero(survivors)
+        culls = max(len(alive) - self._max_capacity, 0)
+        if culls > 0:
+            survivors[rng.choice(alive, culls, replace=False, shuffle=False)] = False
+
+        deaths = {
+            cause.name.lower(): int(counts[cause.value])
+            for cause in CauseOfDeath
+            if cause is not CauseOfDeath.NOT_DEAD
+        }
+        deaths[CowPen.OVERPOPULATION_EVENT] = culls
+        for event, count in deaths.items():
+            self._events[key, event] += count
+            self._recorder.record_aggregate(
+                key, CowPen.deaths_metric(event), self._steps, np.int64(count)
+            )
+        return survivors
 
     def _energy_expenditure_phase(self) -> None:
         """Perform energy expenditure phase of the simulation.
@@ -374,8 +1493,33 @@ class CowPen(Environment):
         None
         """
         for key in self._entities.keys():
+            if self._mode == CowPen.VECTORIZED_MODE and (
+                self._backend == CowPen.NUMBA_BACKEND
+            ):
+                population = self._entities[key]
+                milk = np.empty(len(population), dtype=np.float64)
+                methane = np.empty(len(population), dtype=np.float64)
+                self._apply(
+                    population.species.metabolism_batch,
+                    population,
+                    "energy_expenditure",
+                    arrays=[milk, methane],
+                )
+                self._production[key] = (milk, methane)
+                continue
+
+            if self._mode == CowPen.VECTORIZED_MODE:
+                population = self._entities[key]
+                self._apply(
+                    population.species.expend_calories_batch,
+                    population,
+                    "energy_expenditure",
+                )
+                continue
+
+            rng = self._streams.generator("energy_expenditure")
             for entity in self._entities[key]:
-                entity.expend_calories()
+                entity.expend_calories(rng)
 
     def _milk_production_phase(self) -> None:
         """Perform milk production phase of the simulation.
@@ -389,11 +1533,23 @@ class CowPen(Environment):
         None
         """
         for key in self._entities.keys():
-            for entity in self._entities[key]:
-                milk_produced = entity.milk_production()
-                self._milk_data[entity.__class__.name][entity.id].iloc[
-                    self._steps
-                ] = milk_produced
+            if key in self._production:
+                milk_produced = self._production[key][0]
+            elif self._mode == CowPen.VECTORIZED_MODE:
+                population = self._entities[key]
+                milk_produced = self._apply(
+                    population.species.milk_production_batch,
+                    population,
+                    "milk_production",
+                )
+            else:
+                rng = self._streams.generator("milk_production")
+                milk_produced = np.array(
+                    [entity.milk_production(rng) for entity in self._entities[key]],
+                    dtype=np.float64,
+                )
+
+            self._record(key, CowPen.MILK_METRIC, milk_produced)
 
     def _methane_production_phase(self) -> None:
         """Perform methane production phase of the simulation.
@@ -407,11 +1563,417 @@ class CowPen(Environment):
         None
         """
         for key in self._entities.keys():
-            for entity in self._entities[key]:
-                methane_produced = entity.methane_production()
-                self._methane_data[entity.__class__.name][entity.id].iloc[
-                    self._steps
-                ] = methane_produced
+            if key in self._production:
+                methane_produced = self._production.pop(key)[1]
+            elif self._mode == CowPen.VECTORIZED_MODE:
+                population = self._entities[key]
+                species = population.species
+                methane_produced = self._apply(
+                    lambda shard, _: species.methane_production_batch(shard),
+                    population,
+                )
+            else:
+                methane_produced = np.array(
+                    [entity.methane_production() for entity in self._entities[key]],
+                    dtype=np.float64,
+                )
+
+            self._record(key, CowPen.METHANE_METRIC, methane_produced)
+
+    def _production_recording_phase(self, outputs: {str: {str: np.ndarray}}) -> None:
+        """Record the milk and methane production found by a Pipeline.
+
+        Parameters
+        ----------
+        outputs : Dict[str, Dict[str, np.ndarray]]
+            Outputs of the pipeline's kernels for each herd, including its
+            "milk" and "methane" production.
+
+        Returns
+        -------
+        None
+        """
+        for metric, output in [
+            (CowPen.MILK_METRIC, "milk"),
+            (CowPen.METHANE_METRIC, "methane"),
+        ]:
+            for key in self._entities.keys():
+                self._record(key, metric, outputs[key][output])
+
+    def _apply(
+        self,
+        kernel,
+        population: Population,
+        stream: str = None,
+        arrays: [np.ndarray] = (),
+    ) -> np.ndarray:
+        """Apply a bulk kernel to a herd, shard by shard if it is sharded.
+
+        Parameters
+        ----------
+        kernel : Callable[..., np.ndarray]
+            Function of a Population, a generator and per-entity arrays (see
+            `ShardPool.map`), returning one value per entity.
+
+        population : Population
+            The herd.
+
+        stream : str
+            Name of the random stream the kernel draws from, if any. Shard
+            `i` draws from the stream named "<stream>/<i>".
+
+        arrays : [np.ndarray]
+            Per-entity arrays passed to the kernel.
+
+        Returns
+        -------
+        np.ndarray
+            The kernel's values for the whole herd.
+        """
+        if self._shard_pool is None:
+            rng = None if stream is None else self._streams.generator(stream)
+            return kernel(population, rng, *arrays)
+
+        rngs = None
+        if stream is not None:
+            rngs = [
+                self._streams.generator(f"{stream}/{index}")
+                for index in range(self._shard_pool.shards)
+            ]
+        return self._shard_pool.map(kernel, population, rngs, arrays)
+
+    def _candidate_pairs(self, entity_list: [Cow], rng: np.random.Generator):
+        """Pairs of cows that may reproduce in this step (per-object mode).
+
+        Parameters
+        ----------
+        entity_list : [Cow]
+            Cows of a single type.
+
+        rng : np.random.Generator
+            Generator to pair cows with.
+
+        Returns
+        -------
+        Iterator[(int, int)]
+            Positions in `entity_list` of the pairs of cows to try
+            `should_reproduce` on, according to the pairing mode.
+        """
+        if len(entity_list) == 0:
+            return
+
+        population = Population.from_entities(entity_list[0].__class__, entity_list)
+        males, females = bucket_by_sex(population)
+        if self._pairing == MONOGAMOUS_PAIRING:
+            yield from zip(*pair_couples(males, females, rng))
+            return
+
+        # Every ordered pair of opposite sex cows gets a trial.
+        for m in males.tolist():
+            for f in females.tolist():
+                yield m, f
+                yield f, m
+
+    def _reproducing_pairs(
+        self, entity_list: [Cow], rng: np.random.Generator, emotions: np.ndarray
+    ):
+        """Candidate pairs of cows for which `should_reproduce` succeeds.
+
+        Species whose `should_reproduce` predates the `rng` and `emotions`
+        arguments are called with the two cows only.
+
+        Parameters
+        ----------
+        entity_list : [Cow]
+            The herd.
+
+        rng : np.random.Generator
+            Generator to draw from.
+
+        emotions : np.ndarray
+            Emotion value of every cow, if drawn once for the step.
+
+        Returns
+        -------
+        Iterator[Cow]
+            The first cow of each successful pair, lazily, so that newborns
+            can be drawn from `rng` in between trials.
+        """
+        for a, b in self._candidate_pairs(entity_list, rng):
+            entity_a, entity_b = entity_list[a], entity_list[b]
+            pair_emotions = None
+            if emotions is not None:
+                pair_emotions = (EMOTIONS[emotions[a]], EMOTIONS[emotions[b]])
+            species = entity_a.__class__
+            optional = (rng, pair_emotions)[: _reproduction_arguments(species)]
+            if species.should_reproduce(entity_a, entity_b, *optional):
+                yield entity_a
+
+    def _step_emotions(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """Emotions of a herd for the reproduction phase of this step.
+
+        Parameters
+        ----------
+        count : int
+            Number of cows in the herd.
+
+        rng : np.random.Generator
+            Generator to draw from.
+
+        Returns
+        -------
+        np.ndarray
+            Emotion value of every cow under PER_STEP_EMOTIONS, or None if
+            emotions are sampled per trial.
+        """
+        if self._emotions == PER_TRIAL_EMOTIONS:
+            return None
+        return sample_emotions(count, rng)
+
+    def _record(self, key: str, metric: str, values: np.ndarray) -> None:
+        """Record a per-cow metric of a herd for the current step.
+
+        Under FULL_RECORDING, the value of every cow is recorded. Under
+        AGGREGATE_RECORDING, only the AGGREGATE_STATISTICS of the values, and
+        their QUANTILES for QUANTILE_METRICS, are recorded as herd-level
+        metrics (see `aggregate_metric`).
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        metric : str
+            One of ENTITY_METRICS.
+
+        values : np.ndarray
+            Value of the metric for each cow, in the order the herd is
+            stored.
+
+        Returns
+        -------
+        None
+        """
+        if metric in CowPen.SUMMED_METRICS:
+            self._totals[key, metric] += float(values.sum())
+
+        if self._recording == CowPen.FULL_RECORDING:
+            self._recorder.record(key, metric, self._steps, self._ids(key), values)
+            return
+
+        if self._tracing:
+            ids = self._ids(key)
+            traced = np.isin(ids, self._traced.get(key, ()))
+            self._recorder.record(key, metric, self._steps, ids[traced], values[traced])
+
+        statistics = {
+            "total": values.sum(),
+            "mean": values.mean() if len(values) > 0 else np.nan,
+        }
+        if metric in CowPen.QUANTILE_METRICS:
+            quantiles = (
+                np.quantile(values, list(CowPen.QUANTILES.values()))
+                if len(values) > 0
+                else np.full(len(CowPen.QUANTILES), np.nan)
+            )
+            statistics.update(zip(CowPen.QUANTILES, quantiles))
+
+        for statistic, value in statistics.items():
+            self._recorder.record_aggregate(
+                key,
+                CowPen.aggregate_metric(metric, statistic),
+                self._steps,
+                np.float64(value),
+            )
+
+    def _record_births(self, key: str, count: int) -> None:
+        """Record the number of births of a herd during the current step.
+
+        Under FULL_RECORDING, births are already logged by the registry, so
+        nothing is recorded.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        count : int
+            Number of newborns.
+
+        Returns
+        -------
+        None
+        """
+        if self._recording == CowPen.AGGREGATE_RECORDING:
+            self._recorder.record_aggregate(
+                key, CowPen.BIRTH_EVENT, self._steps, np.int64(count)
+            )
+
+    def _register_ids(self, key: str, ids: np.ndarray) -> None:
+        """Register the identifiers of the cows that joined a herd.
+
+        Every cow is registered under FULL_RECORDING. Under
+        AGGREGATE_RECORDING, only the cows admitted for tracing are.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        ids : np.ndarray
+            Identifiers of the cows.
+
+        Returns
+        -------
+        None
+        """
+        if self._recording == CowPen.FULL_RECORDING:
+            self._recorder.register(key, self._steps, ids)
+        elif self._tracing:
+            self._recorder.register(key, self._steps, self._admit(key, ids))
+
+    def _admit(self, key: str, ids: np.ndarray) -> np.ndarray:
+        """Select the cows that joined a herd for tracing.
+
+        A cow is selected if the hash of its identifier is below the trace
+        fraction. If more cows are selected than the trace limit leaves room
+        for, the ones with the lowest hashes are admitted.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        ids : np.ndarray
+            Identifiers of the cows.
+
+        Returns
+        -------
+        np.ndarray
+            Identifiers of the admitted cows.
+        """
+        priority = hash_uniform(ids, self._streams.seed)
+        selected = np.flatnonzero(priority < (self._trace_fraction or 1))
+        traced = self._traced.get(key, np.empty(0, dtype=np.int64))
+        if self._trace_max is not None:
+            room = max(self._trace_max - len(traced), 0)
+            if len(selected) > room:
+                order = np.argsort(priority[selected], kind="stable")[:room]
+                selected = np.sort(selected[order])
+
+        admitted = ids[selected]
+        self._traced[key] = np.union1d(traced, admitted)
+        return admitted
+
+    def _untrace(self, key: str, ids: np.ndarray) -> None:
+        """Stop tracing cows that left a herd.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        ids : np.ndarray
+            Identifiers of the cows.
+
+        Returns
+        -------
+        None
+        """
+        if key in self._traced:
+            self._traced[key] = np.setdiff1d(self._traced[key], ids, assume_unique=True)
+
+    def _allocate_ids(self, count: int) -> np.ndarray:
+        """Allocate identifiers that entities are stored and recorded under.
+
+        Parameters
+        ----------
+        count : int
+            Number of identifiers to allocate.
+
+        Returns
+        -------
+        np.ndarray
+            Unique, monotonically increasing identifiers.
+        """
+        ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._next_id += count
+        return ids
+
+    def _register(self, key: str, entity_list: [Cow]) -> None:
+        """Assign and register identifiers to the Cow instances that joined
+        the cow pen.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        entity_list : [Cow]
+            Cows that joined the cow pen.
+
+        Returns
+        -------
+        None
+        """
+        ids = self._allocate_ids(len(entity_list))
+        for entity, id in zip(entity_list, ids.tolist()):
+            entity.id = id
+        self._register_ids(key, ids)
+
+    def _ids(self, key: str) -> np.ndarray:
+        """Recorded identifiers of the living entities of a given type.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        np.ndarray
+            Identifiers, in the order the entities are stored.
+        """
+        if self._mode == CowPen.OBJECT_MODE:
+            entity_list = self._entities[key]
+            return np.fromiter(
+                (entity.id for entity in entity_list), np.int64, len(entity_list)
+            )
+        return self._entities[key].ids
+
+
+@functools.lru_cache(maxsize=None)
+def _reproduction_arguments(species: type) -> int:
+    """Number of the optional `rng` and `emotions` arguments (in that order)
+    accepted by the `should_reproduce` of a species.
+
+    Species written against the original two-argument signature keep working,
+    sampling their own emotions from the shared default generator.
+    """
+    parameters = inspect.signature(species.should_reproduce).parameters.values()
+    if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in parameters):
+        return 2
+    positional = [
+        p
+        for p in parameters
+        if p.kind
+        in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    ]
+    return min(max(len(positional) - 2, 0), 2)
+
+
+def _qualified_name(cls: type) -> str:
+    """Importable name of a class, as accepted by `_import_class`."""
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _import_class(name: str) -> type:
+    """Import a class from the name returned by `_qualified_name`."""
+    module, qualname = name.split(":")
+    cls = importlib.import_module(module)
+    for attribute in qualname.split("."):
+        cls = getattr(cls, attribute)
+    return cls
 
 
 class OrangeGrass(Feed):
@@ -432,13 +1994,21 @@ class OrangeGrass(Feed):
     CALORIES_PER_SERVING = 7000
     PRICE_PER_SERVING = 10.00
 
-    def __init__(self, servings: int, cow_list: [Cow]):
-        """ """
+    def __init__(self, servings: int, cow_list: [Cow] = ()):
+        """OrangeGrass constructor.
+
+        Parameters
+        ----------
+        servings : int
+            Number of servings in the feed.
+
+        cow_list : [Cow]
+            Cows to be fed with `feed`. Not needed by `feed_batch`, which
+            receives the caloric levels of the herd directly.
+        """
         self._initial_servings = servings
         self._current_servings = servings
-        self._total_entity_calories = 0
-        for cow in cow_list:
-            self._total_entity_calories += cow.calories
+        self._total_entity_calories = sum(cow.calories for cow in cow_list)
 
     @property
     def initial_serving_total(self) -> int:
@@ -545,3 +2115,55 @@ class OrangeGrass(Feed):
         cow.caloric_intake(servings * self.__class__.CALORIES_PER_SERVING)
 
         return servings
+
+    def feed_batch(
+        self, calories: np.ndarray, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Bulk equivalent of `feed` for a whole herd.
+
+        Cows are served in a random order, each receiving a share of the
+        initial servings proportional to its caloric levels (rounded up),
+        until the feed runs out.
+
+        Parameters
+        ----------
+        calories : np.ndarray
+            Caloric levels of every cow of the herd.
+
+        rng : np.random.Generator
+            Generator of the order cows are served in.
+
+        Returns
+        -------
+        np.ndarray
+            The number of servings given to each cow.
+        """
+        calories = np.asarray(calories, dtype=np.float64)
+        self._total_entity_calories = calories.sum()
+        servings = np.zeros(len(calories), dtype=np.int64)
+        if self._total_entity_calories == 0:
+            return servings
+
+        order = as_generator(rng).permutation(len(calories))
+        demand = np.ceil(
+            calories[order] / self._total_entity_calories * self._initial_servings
+        ).astype(np.int64)
+        remaining = self._current_servings - (np.cumsum(demand) - demand)
+        servings[order] = np.clip(demand, 0, np.maximum(remaining, 0))
+        self._current_servings -= int(servings.sum())
+        return servings
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """Whether the feed implements `feed_batch`.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        bool
+            True.
+        """
+        return True
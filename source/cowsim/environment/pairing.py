@@ -0,0 +1,171 @@
+from cowsim.entity import Sex
+from cowsim.entity.population import Population
+from cowsim.utils.rng import as_generator
+import numpy as np
+
+# Pairing modes
+#
+# MONOGAMOUS_PAIRING randomly matches each fertile female with at most one
+# fertile male per step, and each couple reproduces with the product of both
+# cows' emotional reproduction probabilities. Cost is linear in herd size.
+#
+# ALL_PAIRS_PAIRING reproduces the original model, where `should_reproduce`
+# is tried once for every ordered pair of cows. Every fertile male/female pair
+# therefore gets two independent trials, so the number of births is drawn
+# from a binomial distribution instead of enumerating the pairs. Under
+# PER_TRIAL_EMOTIONS, the expected number of births is 2 * males * females * p,
+# where p is the species' `expected_reproduction_probability()`.
+MONOGAMOUS_PAIRING = "monogamous"
+ALL_PAIRS_PAIRING = "all_pairs"
+PAIRING_MODES = [MONOGAMOUS_PAIRING, ALL_PAIRS_PAIRING]
+
+# Emotion modes
+#
+# PER_TRIAL_EMOTIONS keeps the original model: a fresh emotion is sampled for
+# a cow each time it is tried for reproduction, and again for each valence
+# check of the trial (see `should_reproduce`).
+#
+# PER_STEP_EMOTIONS samples the emotion of every cow once per step, in bulk,
+# so a cow has the same emotion in every pair it is tried in during a step.
+# Its reproduction probability follows from that single emotion, which makes
+# births slightly more likely than under PER_TRIAL_EMOTIONS.
+PER_TRIAL_EMOTIONS = "per_trial"
+PER_STEP_EMOTIONS = "per_step"
+EMOTION_MODES = [PER_TRIAL_EMOTIONS, PER_STEP_EMOTIONS]
+
+
+def bucket_by_sex(population: Population) -> (np.ndarray, np.ndarray):
+    """Find the fertile males and females of a population.
+
+    Parameters
+    ----------
+    population : Population
+        The population to bucket.
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        Positions in the population of the fertile males and of the fertile
+        females.
+    """
+    fertile = population.species.fertile_batch(population)
+    males = np.flatnonzero(fertile & (population.sex == Sex.MALE.value))
+    females = np.flatnonzero(fertile & (population.sex == Sex.FEMALE.value))
+    return males, females
+
+
+def pair_couples(
+    males: np.ndarray, females: np.ndarray, rng: np.random.Generator = None
+) -> (np.ndarray, np.ndarray):
+    """Randomly match males with females, each at most once.
+
+    Parameters
+    ----------
+    males : np.ndarray
+        Positions of the males to match.
+
+    females : np.ndarray
+        Positions of the females to match.
+
+    rng : np.random.Generator
+        Generator to draw from. Defaults to the shared default generator.
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        Positions of the male and of the female of each couple.
+    """
+    rng = as_generator(rng)
+    couples = min(len(males), len(females))
+    return (
+        rng.choice(males, couples, replace=False),
+        rng.choice(females, couples, replace=False),
+    )
+
+
+def monogamous_births(
+    population: Population,
+    rng: np.random.Generator = None,
+    emotions: np.ndarray = None,
+) -> int:
+    """Number of newborns produced in one step under MONOGAMOUS_PAIRING.
+
+    Parameters
+    ----------
+    population : Population
+        The population reproducing.
+
+    rng : np.random.Generator
+        Generator to draw from. Defaults to the shared default generator.
+
+    emotions : np.ndarray
+        Emotion value of every cow, if drawn once for the step. Otherwise,
+        emotions are sampled per trial.
+
+    Returns
+    -------
+    int
+        Number of newborns.
+    """
+    rng = as_generator(rng)
+    males, females = pair_couples(*bucket_by_sex(population), rng)
+    if len(males) == 0:
+        return 0
+
+    species = population.species
+    prob = species.reproduction_probability_batch(
+        population, males, rng, emotions
+    ) * species.reproduction_probability_batch(population, females, rng, emotions)
+    return int(np.count_nonzero(rng.uniform(0, 1, len(prob)) <= prob))
+
+
+def all_pairs_births(
+    population: Population,
+    rng: np.random.Generator = None,
+    emotions: np.ndarray = None,
+) -> int:
+    """Number of newborns produced in one step under ALL_PAIRS_PAIRING.
+
+    Parameters
+    ----------
+    population : Population
+        The population reproducing.
+
+    rng : np.random.Generator
+        Generator to draw from. Defaults to the shared default generator.
+
+    emotions : np.ndarray
+        Emotion value of every cow, if drawn once for the step. Pairs then
+        share their cows' emotions, so the trials are grouped by the
+        reproduction probability of both cows, with one binomial draw per
+        group. Otherwise, emotions are sampled per trial.
+
+    Returns
+    -------
+    int
+        Number of newborns.
+    """
+    rng = as_generator(rng)
+    males, females = bucket_by_sex(population)
+    if emotions is None:
+        trials = 2 * len(males) * len(females)
+        prob = population.species.expected_reproduction_probability()
+        return int(rng.binomial(trials, prob))
+
+    species = population.species
+    male_prob, male_count = np.unique(
+        species.reproduction_probability_batch(population, males, rng, emotions),
+        return_counts=True,
+    )
+    female_prob, female_count = np.unique(
+        species.reproduction_probability_batch(population, females, rng, emotions),
+        return_counts=True,
+    )
+    trials = 2 * np.outer(male_count, female_count)
+    return int(rng.binomial(trials, np.outer(male_prob, female_prob)).sum())
+
+
+BIRTHS = {
+    MONOGAMOUS_PAIRING: monogamous_births,
+    ALL_PAIRS_PAIRING: all_pairs_births,
+}
@@ -0,0 +1,486 @@
+from contextlib import nullcontext
+from cowsim.entity.population import Population
+from cowsim.environment.sharding import ShardPool
+from typing import Callable, ContextManager
+import numpy as np
+
+# Name declared as written by phases that add or remove entities, and as read
+# by phases that depend on the herd as a whole.
+HERD = "herd"
+
+
+class Phase:
+    """A phase of a simulation step, with the data it reads and writes.
+
+    A phase is either a barrier, run once over the whole environment (for
+    example, to pair cows or to remove the dead), or a per-entity kernel,
+    which computes the values of each entity from that entity alone and can
+    therefore run over any contiguous chunk of a herd.
+
+    Reads and writes name fields of Population (see `Population.FIELDS`),
+    HERD, and outputs of kernels. Outputs are per-entity arrays allocated by
+    the Pipeline for every herd and kept until the end of the step.
+
+    Attributes
+    ----------
+    _name : str
+        Name of the phase.
+
+    _run : Callable[[Dict[str, Dict[str, np.ndarray]]], Dict[str, np.ndarray]]
+        Barrier function, given the outputs of every herd computed so far in
+        the step. If the phase writes HERD and only removes entities, it
+        returns the mask of the entities kept in each herd, so that earlier
+        outputs follow them. Otherwise, earlier outputs are dropped.
+
+    _kernel : Callable[..., None]
+        Kernel function of a chunk (a Population, see `Population.shard`),
+        its generator, the chunk's slice of each output it reads, then of
+        each of its own outputs, which it fills in.
+
+    _stream : str
+        Name of the random stream the kernel draws from, if any.
+
+    _reads : (str, ...)
+        Names of the data read.
+
+    _writes : (str, ...)
+        Names of the fields written, and HERD if entities are added or
+        removed.
+
+    _outputs : Dict[str, type]
+        Data type of each output of the kernel.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable = None,
+        kernel: Callable = None,
+        stream: str = None,
+        reads: (str, ...) = (),
+        writes: (str, ...) = (),
+        outputs: {str: type} = None,
+    ):
+        """Phase constructor.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase.
+
+        run : Callable
+            Barrier function, for barriers.
+
+        kernel : Callable
+            Per-entity function of a chunk, for kernels.
+
+        stream : str
+            Name of the random stream the kernel draws from, if any.
+
+        reads : (str, ...)
+            Names of the data read.
+
+        writes : (str, ...)
+            Names of the fields written, and HERD if entities are added or
+            removed.
+
+        outputs : Dict[str, type]
+            Data type of each output of the kernel.
+
+        Raises
+        ------
+        ValueError
+            - If the phase has both or neither of `run` and `kernel`.
+            - If a barrier has a stream or outputs.
+            - If a kernel writes HERD.
+        """
+        outputs = {} if outputs is None else dict(outputs)
+        if (run is None) == (kernel is None):
+            raise ValueError(f"Phase needs either a run function or a kernel: {name}")
+        if run is not None and (stream is not None or outputs):
+            raise ValueError(f"Only kernels have streams and outputs: {name}")
+        if kernel is not None and HERD in writes:
+            raise ValueError(f"Kernels cannot add or remove entities: {name}")
+
+        self._name = name
+        self._run = run
+        self._kernel = kernel
+        self._stream = stream
+        self._reads = tuple(reads)
+        self._writes = tuple(writes)
+        self._outputs = outputs
+
+    def __repr__(self) -> str:
+        kind = "barrier" if self.is_barrier else "kernel"
+        return f"Phase({self._name}, {kind})"
+
+    @property
+    def name(self) -> str:
+        """Name of the phase."""
+        return self._name
+
+    @property
+    def run(self) -> Callable:
+        """Barrier function, or None for kernels."""
+        return self._run
+
+    @property
+    def kernel(self) -> Callable:
+        """Per-entity function of a chunk, or None for barriers."""
+        return self._kernel
+
+    @property
+    def stream(self) -> str:
+        """Name of the random stream the kernel draws from, if any."""
+        return self._stream
+
+    @property
+    def reads(self) -> (str, ...):
+        """Names of the data read."""
+        return self._reads
+
+    @property
+    def writes(self) -> (str, ...):
+        """Names of the fields written, and HERD if entities change."""
+        return self._writes
+
+    @property
+    def outputs(self) -> {str: type}:
+        """Data type of each output of the kernel."""
+        return self._outputs
+
+    @property
+    def is_barrier(self) -> bool:
+        """Whether the phase runs once over the whole environment."""
+        return self._kernel is None
+
+
+class Pipeline:
+    """Runs the phases of a simulation step, fusing consecutive kernels.
+
+    Phases run in the order given. Consecutive kernels form a stage, which
+    makes a single pass over each herd, one chunk of CHUNK_SIZE entities at
+    a time: every kernel of the stage runs on a chunk before the next chunk
+    is loaded, so a chunk's attributes stay in cache between kernels instead
+    of being streamed from memory once per phase. As kernels are per-entity,
+    this gives the same results as running each kernel over every chunk in
+    turn (see `fused`), which is how the phases are tested against each
+    other.
+
+    Each kernel of a stage draws from the generator of its stream (or of its
+    shard's stream, "<stream>/<i>", in a ShardPool). If a herd or shard
+    spans several chunks, one generator is seeded per chunk from the
+    stream's generator, so results depend on the chunk size but not on the
+    order chunks are processed in. A herd or shard within a single chunk
+    draws from the stream's generator directly.
+
+    Attributes
+    ----------
+    _phases : [Phase]
+        The phases of a step, in order.
+
+    _chunk_size : int
+        Number of entities per chunk.
+
+    _fused : bool
+        Whether consecutive kernels are fused into stages.
+
+    _stages : [[Phase]]
+        The phases grouped into stages, run one after the other.
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(
+        self, phases: [Phase], chunk_size: int = CHUNK_SIZE, fused: bool = True
+    ):
+        """Pipeline constructor.
+
+        Parameters
+        ----------
+        phases : [Phase]
+            The phases of a step, in order.
+
+        chunk_size : int
+            Number of entities per chunk.
+
+        fused : bool
+            Fuse consecutive kernels into stages. Otherwise, every phase is
+            a stage of its own.
+
+        Raises
+        ------
+        ValueError
+            - If `chunk_size` is less than one.
+            - If a phase reads an output that no earlier phase produces.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive: {chunk_size}")
+
+        produced = set()
+        for phase in phases:
+            missing = [
+                name
+                for name in phase.reads
+                if name != HERD
+                and name not in Population.FIELDS
+                and name not in produced
+            ]
+            if missing:
+                raise ValueError(
+                    f"Phase {phase.name} reads {', '.join(missing)} before it is"
+                    " produced."
+                )
+            produced.update(phase.outputs)
+
+        self._phases = list(phases)
+        self._chunk_size = chunk_size
+        self._fused = fused
+        self._stages = []
+        for phase in self._phases:
+            if (
+                fused
+                and not phase.is_barrier
+                and self._stages
+                and not self._stages[-1][-1].is_barrier
+            ):
+                self._stages[-1].append(phase)
+            else:
+                self._stages.append([phase])
+
+    @property
+    def phases(self) -> [Phase]:
+        """The phases of a step, in order."""
+        return self._phases
+
+    @property
+    def chunk_size(self) -> int:
+        """Number of entities per chunk."""
+        return self._chunk_size
+
+    @property
+    def fused(self) -> bool:
+        """Whether consecutive kernels are fused into stages."""
+        return self._fused
+
+    @property
+    def stages(self) -> [[Phase]]:
+        """The phases grouped into stages, run one after the other."""
+        return self._stages
+
+    def bounds(self, size: int) -> [(int, int)]:
+        """Start and stop positions of the chunks of a herd.
+
+        Parameters
+        ----------
+        size : int
+            Number of entities of the herd.
+
+        Returns
+        -------
+        [(int, int)]
+            Range of each chunk. An empty herd is a single empty chunk.
+        """
+        return [
+            (start, min(start + self._chunk_size, size))
+            for start in range(0, max(size, 1), self._chunk_size)
+        ]
+
+    def step(
+        self,
+        herds: {str: Population},
+        generator: Callable[[str], np.random.Generator],
+        shard_pool: ShardPool = None,
+        profile: Callable[[str], ContextManager] = None,
+    ) -> None:
+        """Run every stage of one simulation step.
+
+        Parameters
+        ----------
+        herds : Dict[str, Population]
+            Population of each entity type. Barriers may add or remove
+            entities, but not replace the populations.
+
+        generator : Callable[[str], np.random.Generator]
+            Generator of a named random stream.
+
+        shard_pool : ShardPool
+            Pool splitting each herd into shards, if any. The chunks of
+            different shards run in parallel.
+
+        profile : Callable[[str], ContextManager]
+            Context measuring a stage, given its name: the names of its
+            phases joined by "+".
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KeyError
+            If a phase reads an output dropped by a barrier adding entities.
+        """
+        outputs = {}
+        for stage in self._stages:
+            name = "+".join(phase.name for phase in stage)
+            with nullcontext() if profile is None else profile(name):
+                if stage[0].is_barrier:
+                    self._run_barrier(stage[0], outputs)
+                    continue
+
+                for key, herd in herds.items():
+                    self._run_kernels(
+                        stage, herd, outputs.setdefault(key, {}), generator, shard_pool
+                    )
+
+    def _run_barrier(self, phase: Phase, outputs: {str: {str: np.ndarray}}) -> None:
+        """Run a barrier, then update the outputs if entities changed.
+
+        Parameters
+        ----------
+        phase : Phase
+            The barrier.
+
+        outputs : Dict[str, Dict[str, np.ndarray]]
+            Outputs of each herd, updated in place.
+
+        Returns
+        -------
+        None
+        """
+        kept = phase.run(outputs)
+        if HERD not in phase.writes:
+            return
+
+        if kept is None:
+            outputs.clear()
+            return
+        for key, mask in kept.items():
+            outputs[key] = {
+                name: values[mask] for name, values in outputs.get(key, {}).items()
+            }
+
+    def _run_kernels(
+        self,
+        stage: [Phase],
+        herd: Population,
+        outputs: {str: np.ndarray},
+        generator: Callable[[str], np.random.Generator],
+        shard_pool: ShardPool,
+    ) -> None:
+        """Run a stage of kernels over a herd.
+
+        Parameters
+        ----------
+        stage : [Phase]
+            The kernels.
+
+        herd : Population
+            The herd.
+
+        outputs : Dict[str, np.ndarray]
+            Outputs of the herd, to which the stage's outputs are added.
+
+        generator : Callable[[str], np.random.Generator]
+            Generator of a named random stream.
+
+        shard_pool : ShardPool
+            Pool splitting the herd into shards, if any.
+
+        Returns
+        -------
+        None
+        """
+        for phase in stage:
+            for name, dtype in phase.outputs.items():
+                outputs[name] = np.empty(len(herd), dtype=dtype)
+        names = list(outputs)
+
+        def run(shard, rngs, *arrays):
+            self._run_chunks(stage, shard, rngs, dict(zip(names, arrays)))
+
+        if shard_pool is None:
+            rngs = [None if p.stream is None else generator(p.stream) for p in stage]
+            run(herd, rngs, *outputs.values())
+            return
+
+        rngs = [
+            [None if p.stream is None else generator(f"{p.stream}/{i}") for p in stage]
+            for i in range(shard_pool.shards)
+        ]
+        shard_pool.map(run, herd, rngs, list(outputs.values()))
+
+    def _run_chunks(
+        self,
+        stage: [Phase],
+        population: Population,
+        rngs: [np.random.Generator],
+        outputs: {str: np.ndarray},
+    ) -> None:
+        """Run a stage of kernels over a herd (or shard), chunk by chunk.
+
+        Parameters
+        ----------
+        stage : [Phase]
+            The kernels.
+
+        population : Population
+            The herd or shard.
+
+        rngs : [np.random.Generator]
+            Generator of each kernel, or None if it draws no random numbers.
+
+        outputs : Dict[str, np.ndarray]
+            Outputs of the population.
+
+        Returns
+        -------
+        None
+        """
+        bounds = self.bounds(len(population))
+        rngs = [self._chunk_generators(rng, len(bounds)) for rng in rngs]
+        arguments = [
+            [
+                name
+                for name in phase.reads
+                if name != HERD and name not in Population.FIELDS
+            ]
+            + list(phase.outputs)
+            for phase in stage
+        ]
+        for chunk, (start, stop) in enumerate(bounds):
+            shard = population.shard(start, stop)
+            for phase, phase_rngs, names in zip(stage, rngs, arguments):
+                phase.kernel(
+                    shard,
+                    phase_rngs[chunk],
+                    *[outputs[name][start:stop] for name in names],
+                )
+
+    @staticmethod
+    def _chunk_generators(
+        rng: np.random.Generator, chunks: int
+    ) -> [np.random.Generator]:
+        """Generator of each chunk of a herd, derived from the herd's one.
+
+        Parameters
+        ----------
+        rng : np.random.Generator
+            Generator of the herd, or None.
+
+        chunks : int
+            Number of chunks.
+
+        Returns
+        -------
+        [np.random.Generator]
+            `rng` itself for a single chunk. Otherwise, generators seeded
+            from `rng`, so that they follow its (checkpointed) state.
+        """
+        if rng is None:
+            return [None] * chunks
+        if chunks == 1:
+            return [rng]
+        seeds = rng.integers(0, np.iinfo(np.int64).max, size=chunks)
+        return [np.random.default_rng(seed) for seed in seeds.tolist()]
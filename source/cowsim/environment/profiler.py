@@ -0,0 +1,173 @@
+from contextlib import contextmanager
+from cowsim.utils.buffer import ColumnBuffer
+import numpy as np
+import pandas as pd
+import time
+import tracemalloc
+
+
+class PhaseProfiler:
+    """Measures each phase of each simulation step.
+
+    For every phase, the wall time, the number of entities once the phase
+    is done and, if memory tracing is enabled, the net and peak memory
+    allocated by the phase (via tracemalloc) are recorded as one row.
+
+    Attributes
+    ----------
+    _rows : ColumnBuffer
+        (Step, Phase, Seconds, Entities, AllocatedBytes, PeakBytes) rows, with
+        phases stored as indices into `_phases`.
+
+    _phases : [str]
+        Names of the phases measured so far.
+
+    _memory : bool
+        Whether allocations are traced.
+
+    _started_tracing : bool
+        Whether this profiler started tracemalloc (and so should stop it).
+    """
+
+    def __init__(self, memory: bool = True):
+        """PhaseProfiler constructor.
+
+        Parameters
+        ----------
+        memory : bool
+            Trace allocations with tracemalloc. Tracing slows down phases
+            that allocate many Python objects, which inflates their wall
+            time.
+        """
+        self._rows = ColumnBuffer(
+            {
+                "Step": np.int32,
+                "Phase": np.int16,
+                "Seconds": np.float64,
+                "Entities": np.int64,
+                "AllocatedBytes": np.int64,
+                "PeakBytes": np.int64,
+            }
+        )
+        self._phases = []
+        self._memory = memory
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start tracing allocations, if enabled.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        if self._memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Stop tracing allocations, if this profiler started it.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, step: int, name: str, entities):
+        """Measure the phase run inside the context.
+
+        Parameters
+        ----------
+        step : int
+            Simulation step.
+
+        name : str
+            Name of the phase.
+
+        entities : Callable[[], int]
+            Counts the entities in the simulation.
+
+        Returns
+        -------
+        ContextManager
+            Context that records one row when it exits.
+        """
+        tracing = self._memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+
+        allocated = peak = 0
+        if tracing:
+            current, peak_memory = tracemalloc.get_traced_memory()
+            allocated = current - before
+            peak = peak_memory - before
+
+        if name not in self._phases:
+            self._phases.append(name)
+        self._rows.append(
+            1,
+            Step=step,
+            Phase=self._phases.index(name),
+            Seconds=seconds,
+            Entities=entities(),
+            AllocatedBytes=allocated,
+            PeakBytes=peak,
+        )
+
+    def frame(self) -> pd.DataFrame:
+        """Measurements as a data frame.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per step and phase, with Step, Phase, Seconds, Entities,
+            AllocatedBytes and PeakBytes columns. The memory columns are zero
+            when allocations are not traced.
+        """
+        frame = self._rows.to_frame()
+        frame["Phase"] = pd.Categorical.from_codes(frame["Phase"], self._phases)
+        return frame
+
+    def summary(self) -> pd.DataFrame:
+        """Measurements totalled over every step, per phase.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        pd.DataFrame
+            Data frame indexed by Phase, with the total and mean Seconds, the
+            share of the total time, and the largest PeakBytes.
+        """
+        grouped = self.frame().groupby("Phase", observed=True)
+        summary = pd.DataFrame(
+            {
+                "TotalSeconds": grouped["Seconds"].sum(),
+                "MeanSeconds": grouped["Seconds"].mean(),
+                "PeakBytes": grouped["PeakBytes"].max(),
+            }
+        )
+        summary["Share"] = summary["TotalSeconds"] / summary["TotalSeconds"].sum()
+        return summary
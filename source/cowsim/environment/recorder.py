@@ -0,0 +1,453 @@
+from cowsim.environment.sink import Sink
+from cowsim.utils.buffer import ColumnBuffer
+import numpy as np
+import pandas as pd
+
+
+class Recorder:
+    """Records simulation telemetry in long format.
+
+    Per-entity metrics are appended as (Step, Id, Value) rows and herd-level
+    metrics as (Step, Value) rows, each into a typed ColumnBuffer per entity
+    type and metric. Recording a step costs amortized O(1) per row, and pandas
+    data frames are only built when one is requested.
+
+    Rows can be streamed to a Sink with `flush`, which empties the buffers so
+    that memory is bounded by the rows recorded between flushes.
+
+    Attributes
+    ----------
+    _entity_buffers : Dict[(str, str), ColumnBuffer]
+        Per-entity rows, keyed by entity type name and metric.
+
+    _aggregate_buffers : Dict[(str, str), ColumnBuffer]
+        Herd-level rows, keyed by entity type name and metric.
+
+    _registries : Dict[str, ColumnBuffer]
+        (Step, Id) rows logging the step at which each entity was registered,
+        keyed by entity type name.
+    """
+
+    STEP_DTYPE = np.int32
+    ID_DTYPE = np.int64
+
+    def __init__(self):
+        """Recorder constructor."""
+        self._entity_buffers = {}
+        self._aggregate_buffers = {}
+        self._registries = {}
+
+    def register(self, key: str, step: int, ids: np.ndarray) -> None:
+        """Register entities that joined the simulation.
+
+        Registered entities are reported even if no metric was ever
+        recorded for them.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        step : int
+            Simulation step at which the entities joined.
+
+        ids : np.ndarray
+            Identifiers of the entities.
+
+        Returns
+        -------
+        None
+        """
+        registry = self._registries.get(key)
+        if registry is None:
+            registry = ColumnBuffer(
+                {"Step": Recorder.STEP_DTYPE, "Id": Recorder.ID_DTYPE}
+            )
+            self._registries[key] = registry
+
+        registry.append(len(ids), Step=step, Id=ids)
+
+    def registered(self, key: str) -> np.ndarray:
+        """Identifiers of every entity registered for an entity type.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        np.ndarray
+            Identifiers, in registration order.
+        """
+        registry = self._registries.get(key)
+        if registry is None:
+            return np.empty(0, dtype=Recorder.ID_DTYPE)
+        return registry.column("Id")
+
+    def registry_frame(self, key: str) -> pd.DataFrame:
+        """Registration log of an entity type.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        pd.DataFrame
+            Data frame with the Step at which each entity (Id) joined.
+        """
+        registry = self._registries.get(key)
+        if registry is None:
+            return pd.DataFrame(
+                {
+                    "Step": np.empty(0, dtype=Recorder.STEP_DTYPE),
+                    "Id": np.empty(0, dtype=Recorder.ID_DTYPE),
+                }
+            )
+        return registry.to_frame()
+
+    def record(
+        self, key: str, metric: str, step: int, ids: np.ndarray, values: np.ndarray
+    ) -> None:
+        """Record a per-entity metric for a step.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        metric : str
+            Name of the metric.
+
+        step : int
+            Simulation step.
+
+        ids : np.ndarray
+            Identifiers of the entities.
+
+        values : np.ndarray
+            Value of the metric for each entity. The type of the first
+            recorded values is used for all later values of the metric.
+
+        Returns
+        -------
+        None
+        """
+        values = np.asarray(values)
+        buffer = self._entity_buffers.get((key, metric))
+        if buffer is None:
+            buffer = ColumnBuffer(
+                {
+                    "Step": Recorder.STEP_DTYPE,
+                    "Id": Recorder.ID_DTYPE,
+                    "Value": values.dtype,
+                }
+            )
+            self._entity_buffers[(key, metric)] = buffer
+
+        buffer.append(len(ids), Step=step, Id=ids, Value=values)
+
+    def record_aggregate(self, key: str, metric: str, step: int, value) -> None:
+        """Record a herd-level metric for a step.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        metric : str
+            Name of the metric.
+
+        step : int
+            Simulation step.
+
+        value
+            Value of the metric.
+
+        Returns
+        -------
+        None
+        """
+        buffer = self._aggregate_buffers.get((key, metric))
+        if buffer is None:
+            buffer = ColumnBuffer(
+                {
+                    "Step": Recorder.STEP_DTYPE,
+                    "Value": np.asarray(value).dtype,
+                }
+            )
+            self._aggregate_buffers[(key, metric)] = buffer
+
+        buffer.append(1, Step=step, Value=value)
+
+    def flush(self, sink: Sink) -> None:
+        """Write every buffered row to a sink and empty the buffers.
+
+        Per-entity and herd-level metrics are written to the `<key>_<metric>`
+        table and registrations to the `<key>_registry` table.
+
+        Parameters
+        ----------
+        sink : Sink
+            Destination of the rows.
+
+        Returns
+        -------
+        None
+        """
+        for key in self.keys():
+            for table, buffer in self._tables(key).items():
+                if len(buffer) == 0:
+                    continue
+                sink.write(
+                    f"{key}_{table}",
+                    {name: buffer.column(name) for name in buffer.dtypes},
+                )
+                buffer.clear()
+
+    def snapshot(self) -> {str: np.ndarray}:
+        """Every buffered column, for saving the recorder.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Columns keyed by `<kind>/<key>/<table>/<column>`, where kind is
+            "registry", "entity" or "aggregate". The arrays are views of the
+            buffers.
+        """
+        buffers = [
+            *((("registry", k, "registry"), b) for k, b in self._registries.items()),
+            *((("entity", k, m), b) for (k, m), b in self._entity_buffers.items()),
+            *(
+                (("aggregate", k, m), b)
+                for (k, m), b in self._aggregate_buffers.items()
+            ),
+        ]
+        return {
+            "/".join((*path, name)): buffer.column(name)
+            for path, buffer in buffers
+            for name in buffer.dtypes
+        }
+
+    @classmethod
+    def from_snapshot(cls, columns: {str: np.ndarray}) -> "Recorder":
+        """Rebuild a recorder from the columns returned by `snapshot`.
+
+        Parameters
+        ----------
+        columns : Dict[str, np.ndarray]
+            Buffered columns, keyed as by `snapshot`.
+
+        Returns
+        -------
+        Recorder
+            A recorder holding copies of the columns.
+        """
+        tables = {}
+        for path, values in columns.items():
+            kind, key, table, name = path.split("/")
+            tables.setdefault((kind, key, table), {})[name] = values
+
+        recorder = cls()
+        for (kind, key, table), table_columns in tables.items():
+            count = len(next(iter(table_columns.values())))
+            buffer = ColumnBuffer(
+                {name: values.dtype for name, values in table_columns.items()},
+                count,
+            )
+            buffer.append(count, **table_columns)
+            match kind:
+                case "registry":
+                    recorder._registries[key] = buffer
+                case "entity":
+                    recorder._entity_buffers[(key, table)] = buffer
+                case "aggregate":
+                    recorder._aggregate_buffers[(key, table)] = buffer
+                case _:
+                    raise ValueError(f"Unknown recorder table kind: {kind}")
+        return recorder
+
+    def keys(self) -> [str]:
+        """Names of the entity types with registrations or records.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        [str]
+            Entity type names.
+        """
+        keys = [
+            *self._registries,
+            *(k for (k, _) in self._entity_buffers),
+            *(k for (k, _) in self._aggregate_buffers),
+        ]
+        return list(dict.fromkeys(keys))
+
+    def tables(self, key: str) -> {str: {str: np.ndarray}}:
+        """Every long-format table recorded for an entity type.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        Dict[str, Dict[str, np.ndarray]]
+            Columns of each table, keyed by table name. The registration log
+            is named "registry" and every other table is named after its
+            metric.
+        """
+        return {
+            table: {name: buffer.column(name) for name in buffer.dtypes}
+            for table, buffer in self._tables(key).items()
+        }
+
+    def _tables(self, key: str) -> {str: ColumnBuffer}:
+        """Buffers of every table recorded for an entity type.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        Dict[str, ColumnBuffer]
+            Buffer of each table, keyed by table name.
+        """
+        tables = {}
+        if key in self._registries:
+            tables["registry"] = self._registries[key]
+        for (k, metric), buffer in self._entity_buffers.items():
+            if k == key:
+                tables[metric] = buffer
+        for (k, metric), buffer in self._aggregate_buffers.items():
+            if k == key:
+                tables[metric] = buffer
+        return tables
+
+    def entity_metrics(self, key: str) -> [str]:
+        """Names of the per-entity metrics recorded for an entity type.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        [str]
+            Metric names, in the order they were first recorded.
+        """
+        return [m for (k, m) in self._entity_buffers if k == key]
+
+    def aggregate_metrics(self, key: str) -> [str]:
+        """Names of the herd-level metrics recorded for an entity type.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        Returns
+        -------
+        [str]
+            Metric names, in the order they were first recorded.
+        """
+        return [m for (k, m) in self._aggregate_buffers if k == key]
+
+    def long_frame(self, key: str, metric: str) -> pd.DataFrame:
+        """Per-entity metric as a long-format data frame.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        metric : str
+            Name of the metric.
+
+        Returns
+        -------
+        pd.DataFrame
+            Data frame with Step, Id and Value columns.
+        """
+        buffer = self._entity_buffers.get((key, metric))
+        if buffer is None:
+            return pd.DataFrame(
+                {
+                    "Step": np.empty(0, dtype=Recorder.STEP_DTYPE),
+                    "Id": np.empty(0, dtype=Recorder.ID_DTYPE),
+                    "Value": np.empty(0),
+                }
+            )
+        return buffer.to_frame()
+
+    def wide_frame(self, key: str, metric: str, steps: int) -> pd.DataFrame:
+        """Per-entity metric with one row per step and one column per entity.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        metric : str
+            Name of the metric.
+
+        steps : int
+            Number of rows (steps) in the data frame.
+
+        Returns
+        -------
+        pd.DataFrame
+            Data frame indexed by Step. If entities were registered, there is
+            one column per registered entity (in registration order),
+            otherwise one per entity with recorded values. Unrecorded values
+            are NaN.
+        """
+        frame = self.long_frame(key, metric)
+        frame = frame.pivot(index="Step", columns="Id", values="Value")
+        frame = frame.reindex(pd.Index(range(steps), name="Step"))
+        if key in self._registries:
+            frame = frame.reindex(columns=self.registered(key))
+        frame.columns.name = None
+        return frame
+
+    def aggregate_series(self, key: str, metric: str, steps: int) -> pd.Series:
+        """Herd-level metric with one row per step.
+
+        Parameters
+        ----------
+        key : str
+            Name of the entity type.
+
+        metric : str
+            Name of the metric.
+
+        steps : int
+            Number of rows (steps) in the series.
+
+        Returns
+        -------
+        pd.Series
+            Series named after the entity type and indexed by Step.
+            Unrecorded values are NaN.
+        """
+        buffer = self._aggregate_buffers.get((key, metric))
+        if buffer is None:
+            values, index = [], []
+        else:
+            values, index = buffer.column("Value"), buffer.column("Step")
+
+        series = pd.Series(values, index=pd.Index(index, name="Step"), name=key)
+        return series.reindex(pd.Index(range(steps), name="Step"))
@@ -0,0 +1,189 @@
+from abc import abstractmethod
+from cowsim.utils.named_abc import Named_ABC
+import json
+import numpy as np
+import pathlib
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Report formats
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+NPZ_FORMAT = "npz"
+COLUMNAR_FORMAT = "columnar"
+REPORT_FORMATS = [CSV_FORMAT, COLUMNAR_FORMAT, PARQUET_FORMAT, NPZ_FORMAT]
+
+
+class ReportBackend(Named_ABC):
+    """Writes the report of a simulation environment to a directory.
+
+    The environment is expected to provide:
+        - `recorder`: the Recorder holding its telemetry.
+        - `parameters`: a JSON serializable dictionary of run parameters.
+        - `wide_frames(key)`: the per-step data frames of an entity type.
+    """
+
+    @abstractmethod
+    def write(self, environment, directory: pathlib.Path) -> None:
+        """Write the report of an environment.
+
+        Parameters
+        ----------
+        environment : Environment
+            The environment to report.
+
+        directory : pathlib.Path
+            Existing directory to write the report to.
+
+        Returns
+        -------
+        None
+        """
+        ...
+
+
+class CsvReport(ReportBackend):
+    """Writes one wide CSV per entity type and table, with one row per step
+    and one column per entity."""
+
+    def write(self, environment, directory: pathlib.Path) -> None:
+        """Write `<key>_<table>.csv` files for every entity type.
+
+        Parameters
+        ----------
+        environment : Environment
+            The environment to report.
+
+        directory : pathlib.Path
+            Existing directory to write the report to.
+
+        Returns
+        -------
+        None
+        """
+        for key in environment.recorder.keys():
+            for table, frame in environment.wide_frames(key).items():
+                frame.to_csv(directory.joinpath(f"{key}_{table}.csv"))
+
+
+class ParquetReport(ReportBackend):
+    """Writes one long-format Parquet file per entity type and table.
+
+    Columns keep their recorded types and are compressed with COMPRESSION.
+    The run parameters are stored as JSON under the METADATA_KEY key of each
+    file's schema metadata.
+    """
+
+    COMPRESSION = "zstd"
+    METADATA_KEY = "cowsim"
+
+    def __init__(self):
+        """ParquetReport constructor.
+
+        Raises
+        ------
+        RuntimeError
+            If pyarrow is not installed.
+        """
+        if pyarrow is None:
+            raise RuntimeError("The parquet report format requires pyarrow.")
+
+    def write(self, environment, directory: pathlib.Path) -> None:
+        """Write `<key>_<table>.parquet` files for every entity type.
+
+        Parameters
+        ----------
+        environment : Environment
+            The environment to report.
+
+        directory : pathlib.Path
+            Existing directory to write the report to.
+
+        Returns
+        -------
+        None
+        """
+        metadata = {
+            ParquetReport.METADATA_KEY: json.dumps(environment.parameters),
+        }
+        for key in environment.recorder.keys():
+            for table, columns in environment.recorder.tables(key).items():
+                arrow_table = pyarrow.table(columns).replace_schema_metadata(metadata)
+                pyarrow.parquet.write_table(
+                    arrow_table,
+                    directory.joinpath(f"{key}_{table}.parquet"),
+                    compression=ParquetReport.COMPRESSION,
+                )
+
+
+class NpzReport(ReportBackend):
+    """Writes one compressed NumPy archive per entity type.
+
+    The column `<column>` of table `<table>` is stored as the array
+    `<table>__<column>`, and the run parameters are stored as a JSON string
+    in the METADATA_KEY array.
+    """
+
+    METADATA_KEY = "metadata"
+
+    def write(self, environment, directory: pathlib.Path) -> None:
+        """Write a `<key>.npz` file for every entity type.
+
+        Parameters
+        ----------
+        environment : Environment
+            The environment to report.
+
+        directory : pathlib.Path
+            Existing directory to write the report to.
+
+        Returns
+        -------
+        None
+        """
+        for key in environment.recorder.keys():
+            arrays = {
+                f"{table}__{column}": values
+                for table, columns in environment.recorder.tables(key).items()
+                for column, values in columns.items()
+            }
+            arrays[NpzReport.METADATA_KEY] = np.array(
+                json.dumps(environment.parameters)
+            )
+            np.savez_compressed(directory.joinpath(f"{key}.npz"), **arrays)
+
+
+def report_backend(report_format: str) -> ReportBackend:
+    """Create the backend writing a report format.
+
+    Parameters
+    ----------
+    report_format : str
+        One of REPORT_FORMATS. COLUMNAR_FORMAT writes Parquet if pyarrow is
+        installed and NumPy archives otherwise.
+
+    Returns
+    -------
+    ReportBackend
+        The report backend.
+
+    Raises
+    ------
+    RuntimeError
+        If the report format is unknown.
+    """
+    match report_format:
+        case "csv":
+            return CsvReport()
+        case "parquet":
+            return ParquetReport()
+        case "npz":
+            return NpzReport()
+        case "columnar":
+            return ParquetReport() if pyarrow is not None else NpzReport()
+        case _:
+            raise RuntimeError(f"Unknown report format: {report_format}")
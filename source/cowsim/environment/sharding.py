@@ -0,0 +1,150 @@
+from concurrent.futures import ThreadPoolExecutor
+from cowsim.entity.population import Population
+from typing import Callable
+import numpy as np
+
+
+class ShardPool:
+    """Runs bulk kernels over contiguous shards of a Population in parallel.
+
+    Each kernel call receives one shard (a Population of views into the
+    herd's arrays, see `Population.shard`), the generator of that shard and
+    the matching slices of any per-entity arrays.
+
+    NumPy releases the GIL inside large array operations and random draws,
+    so shards of a big herd make progress on several cores at once through a
+    thread pool. Herds smaller than MIN_PARALLEL_SIZE are processed shard by
+    shard on the calling thread, which gives the same results without the
+    hand-off overhead.
+
+    Attributes
+    ----------
+    _shards : int
+        Number of shards each herd is split into.
+
+    _workers : int
+        Number of threads of the pool.
+
+    _executor : ThreadPoolExecutor
+        The thread pool, started on first use and stopped by `close`.
+    """
+
+    MIN_PARALLEL_SIZE = 65536
+
+    def __init__(self, shards: int, workers: int = None):
+        """ShardPool constructor.
+
+        Parameters
+        ----------
+        shards : int
+            Number of shards each herd is split into.
+
+        workers : int
+            Number of threads. Defaults to one per shard.
+
+        Raises
+        ------
+        ValueError
+            If shards or workers is less than one.
+        """
+        if shards < 1:
+            raise ValueError(f"Number of shards must be positive: {shards}")
+        if workers is None:
+            workers = shards
+        if workers < 1:
+            raise ValueError(f"Number of workers must be positive: {workers}")
+
+        self._shards = shards
+        self._workers = workers
+        self._executor = None
+
+    @property
+    def shards(self) -> int:
+        """Number of shards each herd is split into."""
+        return self._shards
+
+    @property
+    def workers(self) -> int:
+        """Number of threads of the pool."""
+        return self._workers
+
+    def bounds(self, size: int) -> [(int, int)]:
+        """Start and stop positions of the shards of a herd.
+
+        Parameters
+        ----------
+        size : int
+            Number of entities of the herd.
+
+        Returns
+        -------
+        [(int, int)]
+            Range of each shard. Shard sizes differ by at most one entity.
+        """
+        edges = np.linspace(0, size, self._shards + 1).astype(np.int64).tolist()
+        return list(zip(edges[:-1], edges[1:]))
+
+    def map(
+        self,
+        kernel: Callable[..., np.ndarray],
+        population: Population,
+        rngs: [np.random.Generator] = None,
+        arrays: [np.ndarray] = (),
+    ) -> np.ndarray:
+        """Apply a kernel to every shard of a population.
+
+        Parameters
+        ----------
+        kernel : Callable[..., np.ndarray]
+            Bulk function of one shard, its generator and its slice of each
+            of `arrays`, returning one value per entity of the shard, or None.
+            It may update the shard's attributes and arrays in place.
+
+        population : Population
+            The population to split.
+
+        rngs : [np.random.Generator]
+            Generator of each shard, if the kernel draws random numbers.
+
+        arrays : [np.ndarray]
+            Per-entity arrays of the population, split like it.
+
+        Returns
+        -------
+        np.ndarray
+            The kernel's values for the whole population, in order, or None
+            if the kernel returns None.
+        """
+        if rngs is None:
+            rngs = [None] * self._shards
+
+        tasks = [
+            (population.shard(start, stop), rng, *[a[start:stop] for a in arrays])
+            for (start, stop), rng in zip(self.bounds(len(population)), rngs)
+        ]
+        if len(population) < ShardPool.MIN_PARALLEL_SIZE or self._workers == 1:
+            results = [kernel(*task) for task in tasks]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="cowsim-shard"
+                )
+            results = list(self._executor.map(lambda task: kernel(*task), tasks))
+        if any(result is None for result in results):
+            return None
+        return np.concatenate(results)
+
+    def close(self) -> None:
+        """Stop the threads of the pool. It restarts if `map` is called again.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
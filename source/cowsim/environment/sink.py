@@ -0,0 +1,124 @@
+from abc import ABC, abstractmethod
+import numpy as np
+import os
+import pandas as pd
+import pathlib
+
+
+class Sink(ABC):
+    """Destination that recorded telemetry is streamed to during a run.
+
+    A Sink receives chunks of rows for named tables (e.g. one table per entity
+    type and metric) and is expected to persist them as they arrive, so that
+    recorded data does not need to be kept in memory until the end of the
+    simulation.
+    """
+
+    @abstractmethod
+    def write(self, table: str, columns: {str: np.ndarray}) -> None:
+        """Append a chunk of rows to a table.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table.
+
+        columns : Dict[str, np.ndarray]
+            Equal-length arrays, one per column of the table.
+
+        Returns
+        -------
+        None
+        """
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and release any resources held by the sink.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        ...
+
+
+class CsvSink(Sink):
+    """Streams each table to a long-format CSV file, one chunk per write.
+
+    Every chunk is flushed to disk as soon as it is written, so the rows of
+    completed steps survive if the simulation is interrupted.
+
+    Attributes
+    ----------
+    _directory : pathlib.Path
+        Directory that the CSV files are written to.
+
+    _files : Dict[str, io.TextIOWrapper]
+        Open file of each table.
+    """
+
+    def __init__(self, directory: str):
+        """CsvSink constructor.
+
+        Parameters
+        ----------
+        directory : str
+            Directory to write the CSV files to. It is created if it does not
+            exist, and existing files of the same tables are overwritten.
+        """
+        self._directory = pathlib.Path(directory)
+        if not self._directory.is_dir():
+            os.makedirs(self._directory)
+        self._files = {}
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} [{self._directory}]"
+
+    @property
+    def directory(self) -> pathlib.Path:
+        """Directory that the CSV files are written to."""
+        return self._directory
+
+    def write(self, table: str, columns: {str: np.ndarray}) -> None:
+        """Append a chunk of rows to the CSV file of a table.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table. Rows are written to `<table>.csv`.
+
+        columns : Dict[str, np.ndarray]
+            Equal-length arrays, one per column of the table.
+
+        Returns
+        -------
+        None
+        """
+        file = self._files.get(table)
+        header = file is None
+        if header:
+            file = open(self._directory.joinpath(f"{table}.csv"), "w", newline="")
+            self._files[table] = file
+
+        pd.DataFrame(columns).to_csv(file, header=header, index=False)
+        file.flush()
+
+    def close(self) -> None:
+        """Close every open CSV file.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        for file in self._files.values():
+            file.close()
+        self._files = {}
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+
+class ColumnBuffer:
+    """Growable set of typed, equal-length columns.
+
+    Rows are appended in blocks and stored in NumPy arrays that double their
+    capacity when full, so appending is amortized O(1) per row.
+
+    Attributes
+    ----------
+    _dtypes : Dict[str, np.dtype]
+        The name and type of each column.
+
+    _columns : Dict[str, np.ndarray]
+        Storage of each column. Only the first `_size` rows are valid.
+
+    _size : int
+        Number of rows stored.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, dtypes: {str: np.dtype}, capacity: int = INITIAL_CAPACITY):
+        """ColumnBuffer constructor.
+
+        Parameters
+        ----------
+        dtypes : Dict[str, np.dtype]
+            The name and type of each column.
+
+        capacity : int
+            Number of rows to allocate space for up front.
+        """
+        self._dtypes = dict(dtypes)
+        self._size = 0
+        capacity = max(capacity, 1)
+        self._columns = {
+            name: np.empty(capacity, dtype=dtype) for name, dtype in dtypes.items()
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows that fit before the columns must grow."""
+        return len(next(iter(self._columns.values())))
+
+    @property
+    def dtypes(self) -> {str: np.dtype}:
+        """The name and type of each column."""
+        return self._dtypes
+
+    def column(self, name: str) -> np.ndarray:
+        """Valid rows of a column.
+
+        Parameters
+        ----------
+        name : str
+            Name of the column.
+
+        Returns
+        -------
+        np.ndarray
+            View of the stored rows of the column.
+        """
+        return self._columns[name][: self._size]
+
+    def append(self, count: int, **columns) -> None:
+        """Append `count` rows.
+
+        Parameters
+        ----------
+        count : int
+            Number of rows to append.
+
+        **columns
+            One array (of length `count`) or scalar (repeated `count` times)
+            per column.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KeyError
+            If a column is missing or unknown.
+        """
+        if columns.keys() != self._columns.keys():
+            raise KeyError(f"Expected columns {list(self._columns)}.")
+
+        self._reserve(self._size + count)
+        end = self._size + count
+        for name, values in columns.items():
+            self._columns[name][self._size : end] = values
+        self._size = end
+
+    def clear(self) -> None:
+        """Remove all rows, keeping the allocated capacity.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        None
+        """
+        self._size = 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy the stored rows into a data frame.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        pd.DataFrame
+            Data frame with one column per buffer column.
+        """
+        return pd.DataFrame({name: self.column(name).copy() for name in self._columns})
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the columns (by doubling) to hold `capacity` rows.
+
+        Parameters
+        ----------
+        capacity : int
+            Number of rows that must fit.
+
+        Returns
+        -------
+        None
+        """
+        if capacity <= self.capacity:
+            return
+
+        new_capacity = self.capacity
+        while new_capacity < capacity:
+            new_capacity *= 2
+
+        for name, old in self._columns.items():
+            new = np.empty(new_capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            self._columns[name] = new
@@ -0,0 +1,29 @@
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Whether `jit` compiles functions.
+NUMBA_AVAILABLE = numba is not None
+
+
+def jit(function):
+    """Compile a function to machine code with Numba, if it is installed.
+
+    Functions are compiled in nopython mode, on first call, and release the
+    GIL so that they can run on several threads at once. Without Numba, the
+    function is returned unchanged and runs as plain Python.
+
+    Parameters
+    ----------
+    function : Callable
+        Function of scalars and NumPy arrays to compile.
+
+    Returns
+    -------
+    Callable
+        The compiled function, or `function` itself.
+    """
+    if numba is None:
+        return function
+    return numba.njit(nogil=True, cache=True)(function)
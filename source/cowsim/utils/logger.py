@@ -1,10 +1,23 @@
 import logging
+import logging.handlers
+import queue
 from cowsim.utils.color import FORES, BRIGHTNESS, color_string
 
+# Log levels accepted by `set_level`, by name.
+LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+DEFAULT_LEVEL = "info"
+
 
 class LogFormatter(logging.Formatter):
     # Set format
-    debug_format = "[%(asctime)s] %(levelname)-7s | %(filename)s:%(lineno)d | %(message)s"
+    debug_format = (
+        "[%(asctime)s] %(levelname)-7s | %(filename)s:%(lineno)d | %(message)s"
+    )
     info_format = "[%(asctime)s] %(levelname)-7s | %(message)s"
     error_format = "[%(asctime)s] %(levelname)-7s | %(message)s"
     FORMATS = {
@@ -14,19 +27,31 @@ class LogFormatter(logging.Formatter):
         logging.ERROR: color_string(error_format, FORES["red"]),
         logging.FATAL: color_string(error_format, FORES["red"], BRIGHTNESS["bright"]),
     }
+    DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    def __init__(self):
+        super().__init__(LogFormatter.info_format, LogFormatter.DATE_FORMAT)
+        # Formatters are built once per level rather than once per record.
+        self._formatters = {
+            level: logging.Formatter(log_fmt, LogFormatter.DATE_FORMAT)
+            for level, log_fmt in LogFormatter.FORMATS.items()
+        }
 
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt, "%Y-%m-%d %H:%M:%S")
+        formatter = self._formatters.get(record.levelno)
+        if formatter is None:
+            return super().format(record)
         return formatter.format(record)
 
 
-def instantiate_logger(app_name=""):
+def instantiate_logger(app_name="", level=LEVELS[DEFAULT_LEVEL]):
     logger = logging.getLogger(app_name)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(level)
 
+    # The handler accepts every record, so the logger's level alone decides
+    # what is emitted.
     ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
+    ch.setLevel(logging.NOTSET)
 
     ch.setFormatter(LogFormatter())
 
@@ -34,4 +59,86 @@ def instantiate_logger(app_name=""):
     return logger
 
 
+def set_level(level: str, logger: logging.Logger = None) -> None:
+    """Set the level of messages that are logged.
+
+    Parameters
+    ----------
+    level : str
+        Name of the level, one of LEVELS.
+
+    logger : logging.Logger
+        Logger to configure. Defaults to LOG.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    KeyError
+        If the level is unknown.
+    """
+    (logger or LOG).setLevel(LEVELS[level.lower()])
+
+
+def start_async_logging(
+    logger: logging.Logger = None,
+) -> logging.handlers.QueueListener:
+    """Move formatting and output of log records to a background thread.
+
+    The handlers of the logger are replaced by a QueueHandler, and a
+    QueueListener thread passes the queued records on to them. The calling
+    thread only enqueues records.
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        Logger to configure. Defaults to LOG.
+
+    Returns
+    -------
+    logging.handlers.QueueListener
+        The running listener, to be passed to `stop_async_logging`.
+    """
+    logger = logger or LOG
+    records = queue.SimpleQueue()
+    handlers = list(logger.handlers)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(records))
+
+    listener = logging.handlers.QueueListener(
+        records, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
+def stop_async_logging(
+    listener: logging.handlers.QueueListener, logger: logging.Logger = None
+) -> None:
+    """Flush queued log records and restore the logger's own handlers.
+
+    Parameters
+    ----------
+    listener : logging.handlers.QueueListener
+        Listener returned by `start_async_logging`.
+
+    logger : logging.Logger
+        Logger configured by `start_async_logging`. Defaults to LOG.
+
+    Returns
+    -------
+    None
+    """
+    logger = logger or LOG
+    listener.stop()
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+    for handler in listener.handlers:
+        logger.addHandler(handler)
+
+
 LOG = instantiate_logger("Cowsim")
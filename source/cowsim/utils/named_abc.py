@@ -1,6 +1,8 @@
 from abc import ABC
 
 class Named_ABC(ABC):
+    __slots__ = ()
+
     @classmethod
     @property
     def name(cls) -> str:
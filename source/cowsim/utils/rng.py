@@ -0,0 +1,155 @@
+import numpy as np
+import zlib
+
+# Generator used when no generator is provided.
+_default_generator = None
+
+
+def default_generator() -> np.random.Generator:
+    """Process-wide generator seeded from fresh entropy.
+
+    Parameters
+    ----------
+    none
+
+    Returns
+    -------
+    np.random.Generator
+        The default generator.
+    """
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = np.random.default_rng()
+    return _default_generator
+
+
+def as_generator(rng: np.random.Generator = None) -> np.random.Generator:
+    """Generator to draw from, falling back to `default_generator`.
+
+    Parameters
+    ----------
+    rng : np.random.Generator
+        Generator provided by the caller, if any.
+
+    Returns
+    -------
+    np.random.Generator
+        `rng` if provided, otherwise the default generator.
+    """
+    return default_generator() if rng is None else rng
+
+
+def hash_uniform(values: np.ndarray, salt: int = 0) -> np.ndarray:
+    """Map integers to pseudo-random numbers in [0, 1) with a stateless hash.
+
+    The same value and salt always map to the same number, so selections
+    based on it (e.g. of entity identifiers) are consistent over a run
+    without storing any state.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Integers to hash.
+
+    salt : int
+        Salt mixed into the hash, so that different runs select different
+        values.
+
+    Returns
+    -------
+    np.ndarray
+        One float64 per value, uniformly distributed over [0, 1).
+    """
+    # SplitMix64 finalizer (wrapping uint64 arithmetic).
+    x = np.asarray(values).astype(np.uint64) + np.uint64(salt % 2**64)
+    x += np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) * 2.0**-53
+
+
+class RandomStreams:
+    """Tree of independent random number generators derived from one seed.
+
+    Each named stream (e.g. one per simulation phase) is seeded from the
+    root seed and a hash of its name, so a stream yields the same values for
+    the same seed regardless of how many values other streams drew.
+
+    Attributes
+    ----------
+    _seed_sequence : np.random.SeedSequence
+        Root of the tree.
+
+    _generators : Dict[str, np.random.Generator]
+        Generator of each stream created so far.
+    """
+
+    def __init__(self, seed: int = None):
+        """RandomStreams constructor.
+
+        Parameters
+        ----------
+        seed : int
+            Root seed. If None, fresh entropy is used, which `seed` exposes
+            so that the run can be reproduced.
+        """
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._generators = {}
+
+    @property
+    def seed(self) -> int:
+        """Root seed of the tree."""
+        return self._seed_sequence.entropy
+
+    def generator(self, name: str) -> np.random.Generator:
+        """Generator of a named stream.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stream.
+
+        Returns
+        -------
+        np.random.Generator
+            The generator, created on first use and shared afterwards.
+        """
+        rng = self._generators.get(name)
+        if rng is None:
+            seed_sequence = np.random.SeedSequence(
+                self._seed_sequence.entropy,
+                spawn_key=(zlib.crc32(name.encode()),),
+            )
+            rng = np.random.Generator(np.random.PCG64(seed_sequence))
+            self._generators[name] = rng
+        return rng
+
+    def state(self) -> {str: dict}:
+        """State of every stream created so far.
+
+        Parameters
+        ----------
+        none
+
+        Returns
+        -------
+        Dict[str, dict]
+            JSON serializable bit generator state of each stream.
+        """
+        return {name: rng.bit_generator.state for name, rng in self._generators.items()}
+
+    def set_state(self, state: {str: dict}) -> None:
+        """Restore streams to a state returned by `state`.
+
+        Parameters
+        ----------
+        state : Dict[str, dict]
+            Bit generator state of each stream.
+
+        Returns
+        -------
+        None
+        """
+        for name, bit_generator_state in state.items():
+            self.generator(name).bit_generator.state = bit_generator_state
@@ -0,0 +1,28 @@
+from cowsim import engine
+from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.environment.cowpen import CowPen
+import pandas as pd
+
+
+class RunTest:
+    """Tests for the run function."""
+
+    def test_python_backend(self, tmp_path):
+        """Test that the python backend runs the cow pen in object mode."""
+        engine.run(
+            None, [], tmp_path / "python", 100, 3, seed=5, backend=engine.PYTHON_BACKEND
+        )
+        cowpen = CowPen(
+            [(PurpleAngus, engine.DEFAULT_PURPLE_ANGUS_POPULATION)],
+            max_capacity=100,
+            max_steps=3,
+            seed=5,
+            mode=CowPen.OBJECT_MODE,
+        )
+        cowpen.run()
+        cowpen.report(tmp_path / "object")
+
+        for path in (tmp_path / "object").iterdir():
+            pd.testing.assert_frame_equal(
+                pd.read_csv(tmp_path / "python" / path.name), pd.read_csv(path)
+            )
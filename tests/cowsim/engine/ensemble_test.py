@@ -0,0 +1,100 @@
+from cowsim import engine
+from cowsim.engine.ensemble import (
+    SummaryAggregator,
+    run_ensemble,
+    run_replicate,
+    summary_kwargs,
+)
+from cowsim.environment import Environment
+from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.environment.cowpen import CowPen
+import numpy as np
+import pandas as pd
+import pytest
+
+
+class SummaryAggregatorTest:
+    """Tests for the SummaryAggregator class."""
+
+    def test_result(self):
+        """Test the statistics of aggregated summaries."""
+        values = [1.0, 4.0, 2.0, 7.0]
+        aggregator = SummaryAggregator()
+        for value in values:
+            aggregator.add({"metric": value})
+
+        result = aggregator.result().loc["metric"]
+        assert result["count"] == len(values)
+        assert result["mean"] == pytest.approx(np.mean(values))
+        assert result["std"] == pytest.approx(np.std(values, ddof=1))
+        assert result["ci_low"] < result["mean"] < result["ci_high"]
+
+    def test_single_summary(self):
+        """Test that a single summary has no spread."""
+        aggregator = SummaryAggregator()
+        aggregator.add({"metric": 3.0})
+
+        result = aggregator.result().loc["metric"]
+        assert result["std"] == 0
+        assert result["ci_low"] == result["ci_high"] == 3.0
+
+
+class RunEnsembleTest:
+    """Tests for the run_ensemble function."""
+
+    def test_reproducible(self):
+        """Test that a seeded ensemble is reproducible."""
+        kwargs = dict(capacity=100, steps=5, replicates=3, seed=7, workers=1)
+        runs, summary = run_ensemble(CowPen, [(PurpleAngus, 10)], **kwargs)
+        again, _ = run_ensemble(CowPen, [(PurpleAngus, 10)], **kwargs)
+
+        assert len(runs) == 3
+        assert runs["seed"].nunique() == 3
+        pd.testing.assert_frame_equal(runs, again)
+        assert 0 < summary.loc["steps", "mean"] <= 5
+        assert "seed" not in summary.index
+
+        # A replicate is reproduced by its seed.
+        seed = int(runs.loc[0, "seed"])
+        replicate = run_replicate(CowPen, [(PurpleAngus, 10)], 100, 5, seed)
+        assert replicate == runs.loc[0].drop("seed").to_dict()
+        assert summary.loc["PurpleAngus_total_milk", "count"] == 3
+
+    def test_workers(self):
+        """Test that worker processes produce the same runs."""
+        kwargs = dict(capacity=100, steps=5, replicates=2, seed=3)
+        inline, _ = run_ensemble(CowPen, [(PurpleAngus, 10)], workers=1, **kwargs)
+        pooled, _ = run_ensemble(CowPen, [(PurpleAngus, 10)], workers=2, **kwargs)
+        pd.testing.assert_frame_equal(inline, pooled)
+
+    def test_aggregate_recording(self):
+        """Test that replicates only record what their summary needs."""
+        assert summary_kwargs(CowPen) == {"recording": CowPen.AGGREGATE_RECORDING}
+        assert summary_kwargs(Environment) == {}
+
+        cowpen = CowPen([(PurpleAngus, 10)], max_capacity=100, max_steps=5, seed=4)
+        cowpen.run()
+        assert run_replicate(CowPen, [(PurpleAngus, 10)], 100, 5, 4) == pytest.approx(
+            cowpen.summary()
+        )
+        full = {"recording": CowPen.FULL_RECORDING}
+        runs, _ = run_ensemble(
+            CowPen, [(PurpleAngus, 10)], 100, 5, 2, seed=1, workers=1, env_kwargs=full
+        )
+        again, _ = run_ensemble(
+            CowPen, [(PurpleAngus, 10)], 100, 5, 2, seed=1, workers=1
+        )
+        pd.testing.assert_frame_equal(runs, again)
+
+    def test_invalid_replicates(self):
+        """Test that a non-positive number of replicates is rejected."""
+        with pytest.raises(RuntimeError):
+            run_ensemble(CowPen, [(PurpleAngus, 10)], 20, 5, replicates=0)
+
+    def test_engine(self, tmp_path):
+        """Test writing the ensemble summaries."""
+        engine.ensemble(None, [], tmp_path, 100, 3, replicates=2, seed=1, workers=1)
+        runs = pd.read_csv(tmp_path / "ensemble_runs.csv", index_col="replicate")
+        summary = pd.read_csv(tmp_path / "ensemble_summary.csv", index_col="metric")
+        assert len(runs) == 2
+        assert 0 < summary.loc["steps", "mean"] <= 3
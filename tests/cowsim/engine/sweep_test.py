@@ -0,0 +1,127 @@
+from cowsim import engine
+from cowsim.engine import ENTITY_MAP, ENVIRONMENT_MAP
+from cowsim.engine.sweep import (
+    CONFIG_KEYS,
+    RESULT_PREFIX,
+    ResultCache,
+    cell,
+    config_hash,
+    grid,
+    run_sweep,
+)
+from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.environment.cowpen import CowPen
+import cowsim
+import importlib
+import json
+import pandas as pd
+
+# The sweep module, shadowed on cowsim.engine by the `sweep` function.
+sweep = importlib.import_module("cowsim.engine.sweep")
+
+
+def small_grid():
+    return grid(CowPen.name, [PurpleAngus.name], [10], [50, 100], [None, 20], [3], [0])
+
+
+class SweepTest:
+    """Tests for the sweep functions."""
+
+    def test_grid(self):
+        """Test that the grid holds every combination of values."""
+        configs = small_grid()
+        assert len(configs) == 4
+        assert {(c["capacity"], c["servings"]) for c in configs} == {
+            (50, None),
+            (50, 20),
+            (100, None),
+            (100, 20),
+        }
+        assert configs[0]["entities"] == [[PurpleAngus.name, 10]]
+
+    def test_config_hash(self, monkeypatch):
+        """Test that the hash changes with the config, seed, version and code."""
+        config = cell(CowPen.name, [(PurpleAngus.name, 10)], 100, 3, 0)
+        key = config_hash(config)
+        assert key == config_hash(dict(reversed(list(config.items()))))
+        assert key != config_hash({**config, "seed": 1})
+        assert key != config_hash({**config, "servings": 5})
+
+        monkeypatch.setattr(sweep, "code_fingerprint", lambda: "other")
+        assert key != config_hash(config)
+        monkeypatch.undo()
+        assert key == config_hash(config)
+
+        monkeypatch.setattr(sweep, "RESULTS_VERSION", sweep.RESULTS_VERSION + 1)
+        assert key != config_hash(config)
+        monkeypatch.undo()
+
+        monkeypatch.setattr(cowsim, "__version__", "0.0.0-other")
+        assert key != config_hash(config)
+
+    def test_code_fingerprint(self, tmp_path, monkeypatch):
+        """Test that the fingerprint changes with the package sources."""
+        package = tmp_path / "cowsim"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "module.py").write_text("x = 1\n")
+        monkeypatch.setattr(cowsim, "__file__", str(package / "__init__.py"))
+
+        sweep.code_fingerprint.cache_clear()
+        first = sweep.code_fingerprint()
+        (package / "module.py").write_text("x = 2\n")
+        sweep.code_fingerprint.cache_clear()
+        assert sweep.code_fingerprint() != first
+        sweep.code_fingerprint.cache_clear()
+
+    def test_result_cache(self, tmp_path):
+        """Test storing and loading cached summaries."""
+        cache = ResultCache(tmp_path / "cache")
+        assert cache.get("missing") is None
+
+        cache.put("key", {"seed": 0}, {"steps": 3.0})
+        assert cache.get("key") == {"steps": 3.0}
+        assert list(cache.directory.iterdir()) == [cache.directory / "key.json"]
+
+    def test_run_sweep(self, tmp_path):
+        """Test that repeated sweeps only run new cells."""
+        cache = ResultCache(tmp_path)
+        configs = small_grid()
+        results = run_sweep(configs, ENVIRONMENT_MAP, ENTITY_MAP, cache, workers=1)
+        assert len(results) == 4
+        assert not results["cached"].any()
+        assert results["entities"][0] == f"{PurpleAngus.name}:10"
+
+        configs.append(cell(CowPen.name, [(PurpleAngus.name, 10)], 100, 3, 1))
+        again = run_sweep(configs, ENVIRONMENT_MAP, ENTITY_MAP, cache, workers=2)
+        assert again["cached"].tolist() == [True] * 4 + [False]
+        pd.testing.assert_frame_equal(
+            again.drop(columns="cached").iloc[:4], results.drop(columns="cached")
+        )
+
+    def test_config_columns(self):
+        """Test that summary metrics do not overwrite the configuration."""
+        configs = [cell(CowPen.name, [(PurpleAngus.name, 10)], 50, 2, 3, 20)]
+        results = run_sweep(configs, ENVIRONMENT_MAP, ENTITY_MAP, workers=1)
+        row = results.iloc[0]
+        for key in CONFIG_KEYS:
+            if key != "entities":
+                assert row[key] == configs[0][key]
+        assert "result_steps" in results
+        summary = [c for c in results if c not in CONFIG_KEYS + ["cached"]]
+        assert all(column.startswith(RESULT_PREFIX) for column in summary)
+
+    def test_engine_config_file(self, tmp_path):
+        """Test sweeping the configurations of a JSON file."""
+        config_file = tmp_path / "configs.json"
+        config_file.write_text(
+            json.dumps([{"capacity": 50, "steps": 2}, {"servings": 0, "steps": 2}])
+        )
+        engine.sweep(
+            None, (), (), (), (), (), (), tmp_path, config_file=config_file, workers=1
+        )
+
+        results = pd.read_csv(tmp_path / "sweep_results.csv")
+        assert results["capacity"].tolist() == [50, CowPen.DEFAULT_MAX_CAPACITY]
+        assert results["result_PurpleAngus_total_feeding"][1] == 0
+        assert len(list((tmp_path / "cache").iterdir())) == 2
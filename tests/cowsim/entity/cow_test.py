@@ -1,8 +1,31 @@
 from cowsim.entity.cow.purple_angus import PurpleAngus
 from cowsim.entity import Sex
-from cowsim.entity.cow import CauseOfDeath, Emotion
+from cowsim.entity.cow import (
+    EMOTION_VALENCE,
+    EMOTIONS,
+    BatchFallback,
+    CauseOfDeath,
+    Cow,
+    Emotion,
+    Valence,
+    sample_emotions,
+)
+from cowsim.entity.population import Population
+import numpy as np
+import pytest
 import random
 
+# PurpleAngus relying on the per-instance fallback of the bulk interface.
+UnbatchedAngus = type(
+    "UnbatchedAngus",
+    (PurpleAngus,),
+    {
+        name: method
+        for name, method in vars(BatchFallback).items()
+        if isinstance(method, classmethod)
+    },
+)
+
 
 class PurpleAngusTest:
     def test_properties(self):
@@ -25,6 +48,13 @@ class PurpleAngusTest:
         assert p_angus.calories == calories
         assert p_angus.weight == weight
 
+    def test_slots(self):
+        """Test that instances keep their attributes in slots."""
+        p_angus = PurpleAngus.generate()
+        assert not hasattr(p_angus, "__dict__")
+        with pytest.raises(AttributeError):
+            p_angus.nickname = "Bessie"
+
     def test_static_name(self):
         """Test PurpleAngus.name static method."""
         assert PurpleAngus.name == "PurpleAngus"
@@ -96,6 +126,15 @@ class PurpleAngusTest:
             else:
                 assert angus.weight == old_weight
 
+        # Ages past MAX_AGE are still valid until the angus is pruned.
+        old_angus = PurpleAngus(
+            age=PurpleAngus.MAX_AGE + 1,
+            sex=Sex.FEMALE,
+            calories=PurpleAngus.MAX_CALORIC_BOUND,
+            weight=PurpleAngus.MAX_WEIGHT / 2,
+        )
+        assert old_angus.expend_calories() >= PurpleAngus.MIN_CALORIC_BOUND
+
     def test_caloric_intake(self):
         """Test PurpleAngus.caloric_intake() method."""
         # Testing case where angus ingests calories but does not gain weight.
@@ -129,6 +168,13 @@ class PurpleAngusTest:
         angus = PurpleAngus.generate()
         assert isinstance(angus.emotion, Emotion)
 
+        # sample_emotion has a default, so emotion is the only abstract hook.
+        assert "sample_emotion" not in Cow.__abstractmethods__
+        assert "emotion" in Cow.__abstractmethods__
+        sampled = [angus.sample_emotion(np.random.default_rng(3)) for _ in range(2)]
+        assert sampled[0] == sampled[1]
+        assert sampled[0] == EMOTIONS[np.random.default_rng(3).integers(0, 10)]
+
     def test_should_reproduce(self):
         angus_a = PurpleAngus(
             age=20 * 365,
@@ -154,3 +200,209 @@ class PurpleAngusTest:
         assert not PurpleAngus.should_reproduce(angus_a, angus_a)
         assert not PurpleAngus.should_reproduce(angus_a, angus_b)
         assert not PurpleAngus.should_reproduce(angus_a, angus_c)
+
+        angus_d = PurpleAngus(
+            age=PurpleAngus.ADULT_AGE,
+            sex=Sex.FEMALE,
+            calories=1000,
+            weight=1000,
+        )
+        happy = (Emotion.HAPPY, Emotion.CONTENT)
+        for _ in range(10):
+            assert PurpleAngus.should_reproduce(angus_a, angus_d, emotions=happy)
+
+    def test_reproduction_probability(self):
+        """Test that emotions are sampled for each valence check per trial."""
+        # Positive with 3/10, else neutral with 3/10 of a second draw.
+        expected = 0.3 * 1.0 + 0.7 * 0.3 * 0.66 + 0.7 * 0.7 * 0.33
+        assert np.isclose(PurpleAngus.expected_reproduction_probability(), expected**2)
+
+        population = Population(PurpleAngus)
+        population.extend(
+            np.arange(100000, dtype=np.int64), *PurpleAngus.generate_batch(100000)
+        )
+        index = np.arange(len(population))
+        rng = np.random.default_rng(0)
+        prob = PurpleAngus.reproduction_probability_batch(population, index, rng)
+        assert abs(prob.mean() - expected) < 0.005
+
+        # Emotions drawn once per step give the single-draw probabilities.
+        happy = np.full(len(population), Emotion.HAPPY.value, dtype=np.int8)
+        prob = PurpleAngus.reproduction_probability_batch(population, index, rng, happy)
+        assert np.all(prob == PurpleAngus.POSITIVE_REPRODUCTION_PROBABILITY)
+
+    def test_emotion_tables(self):
+        """Test the valence lookup table against the emotion classifiers."""
+        assert EMOTION_VALENCE.dtype == np.int8
+        for emotion in EMOTIONS:
+            valence = Emotion.valence(emotion)
+            assert Emotion.is_positive(emotion) == (valence == Valence.POSITIVE)
+            assert Emotion.is_neutral(emotion) == (valence == Valence.NEUTRAL)
+            assert Emotion.is_negative(emotion) == (valence == Valence.NEGATIVE)
+
+        table = PurpleAngus.EMOTION_REPRODUCTION_PROBABILITY
+        assert np.all(table[EMOTION_VALENCE == Valence.POSITIVE.value] == 1.0)
+        assert np.all(table[EMOTION_VALENCE == Valence.NEGATIVE.value] == 0.33)
+
+        retry = PurpleAngus.RETRY_REPRODUCTION_PROBABILITY
+        assert np.all(retry[EMOTION_VALENCE == Valence.NEUTRAL.value] == 0.66)
+        assert np.all(retry[EMOTION_VALENCE != Valence.NEUTRAL.value] == 0.33)
+
+        emotions = sample_emotions(10000, np.random.default_rng(0))
+        assert emotions.dtype == np.int8
+        assert set(emotions.tolist()) == set(range(len(EMOTIONS)))
+
+    def test_generate_batch(self):
+        """Test PurpleAngus.generate_batch() class method."""
+        age, sex, calories, weight = PurpleAngus.generate_batch(1000)
+        assert np.all((age >= PurpleAngus.MIN_AGE) & (age <= PurpleAngus.MAX_AGE))
+        assert set(np.unique(sex)) <= {Sex.MALE.value, Sex.FEMALE.value}
+        assert np.all(
+            (calories >= PurpleAngus.MIN_CALORIC_BOUND)
+            & (calories <= PurpleAngus.MAX_CALORIC_BOUND)
+        )
+        assert np.all(
+            (weight >= PurpleAngus.MIN_WEIGHT) & (weight <= PurpleAngus.MAX_WEIGHT)
+        )
+
+    def test_batch_matches_instances(self):
+        """Test that deterministic batch methods agree with instance methods."""
+        population = Population(PurpleAngus)
+        population.extend(
+            np.arange(1000, dtype=np.int64), *PurpleAngus.generate_batch(1000)
+        )
+        cows = population.to_entities()
+
+        causes = PurpleAngus.cause_of_death_batch(population)
+        methane = PurpleAngus.methane_production_batch(population)
+        for i, cow in enumerate(cows):
+            assert causes[i] == cow.cause_of_death().value
+            assert np.isclose(methane[i], cow.methane_production())
+
+        kcal = np.random.uniform(0, PurpleAngus.MAX_CALORIC_BOUND, 1000)
+        increase = PurpleAngus.caloric_intake_batch(population, kcal)
+        for i, cow in enumerate(cows):
+            assert np.isclose(increase[i], cow.caloric_intake(kcal[i]))
+            assert np.isclose(population.calories[i], cow.calories)
+            assert np.isclose(population.weight[i], cow.weight)
+
+    def test_expend_calories_batch(self):
+        """Test PurpleAngus.expend_calories_batch() class method."""
+        population = Population(PurpleAngus)
+        population.extend(
+            np.arange(1000, dtype=np.int64), *PurpleAngus.generate_batch(1000)
+        )
+        old_weight = population.weight.copy()
+        expended = PurpleAngus.expend_calories_batch(population)
+
+        assert np.all(expended >= PurpleAngus.MIN_CALORIC_BOUND)
+        assert np.all(population.calories >= 0)
+        low = population.calories < PurpleAngus.MIN_CALORIC_BOUND
+        assert np.all(population.weight[low] < old_weight[low])
+        assert np.array_equal(population.weight[~low], old_weight[~low])
+
+    def test_milk_production_batch(self):
+        """Test PurpleAngus.milk_production_batch() class method."""
+        population = Population(PurpleAngus)
+        population.extend(
+            np.arange(1000, dtype=np.int64), *PurpleAngus.generate_batch(1000)
+        )
+        milk = PurpleAngus.milk_production_batch(population)
+
+        assert np.all(milk >= 0)
+        assert np.all(milk[population.sex == Sex.MALE.value] == 0)
+        assert np.all(milk[population.age < PurpleAngus.ADULT_AGE] == 0)
+
+    def test_fused_metabolism(self):
+        """Test that the fused kernel matches the NumPy batch methods."""
+        fused = Population(PurpleAngus)
+        fused.extend(
+            np.arange(1000, dtype=np.int64),
+            *PurpleAngus.generate_batch(1000, np.random.default_rng(0)),
+        )
+        fused.calories[::3] = 0
+        batch = Population(PurpleAngus)
+        batch.extend(fused.ids, fused.age, fused.sex, fused.calories, fused.weight)
+
+        milk, methane = np.empty(1000), np.empty(1000)
+        expended = PurpleAngus._fused_metabolism(
+            fused, np.random.default_rng(1), milk, methane
+        )
+        rng = np.random.default_rng(1)
+        assert np.array_equal(expended, PurpleAngus.expend_calories_batch(batch, rng))
+        assert np.array_equal(milk, PurpleAngus.milk_production_batch(batch, rng))
+        assert np.array_equal(methane, PurpleAngus.methane_production_batch(batch))
+        assert np.array_equal(fused.calories, batch.calories)
+        assert np.array_equal(fused.weight, batch.weight)
+
+        milk, methane = np.empty(1000), np.empty(1000)
+        PurpleAngus.metabolism_batch(fused, np.random.default_rng(2), milk, methane)
+        assert np.all(milk >= 0) and np.all(methane >= 0)
+
+
+class BatchFallbackTest:
+    """Tests for the per-instance fallback of the bulk interface."""
+
+    def test_supports_batch(self):
+        assert PurpleAngus.supports_batch()
+        assert not UnbatchedAngus.supports_batch()
+
+    def test_generate_batch(self):
+        """Test generating attribute arrays from instances."""
+        rng = np.random.default_rng(0)
+        age, sex, calories, weight = UnbatchedAngus.generate_batch(100, rng)
+        assert age.dtype == np.int64 and len(age) == 100
+        assert set(np.unique(sex)) <= {Sex.MALE.value, Sex.FEMALE.value}
+        assert np.all(UnbatchedAngus.newborn_batch(10, rng)[0] == 0)
+
+    def test_matches_native(self):
+        """Test that the fallback agrees with PurpleAngus' array kernels."""
+        native = Population(PurpleAngus)
+        native.extend(np.arange(500, dtype=np.int64), *PurpleAngus.generate_batch(500))
+        unbatched = Population(UnbatchedAngus)
+        unbatched.extend(
+            native.ids, native.age, native.sex, native.calories, native.weight
+        )
+
+        assert np.array_equal(
+            UnbatchedAngus.cause_of_death_batch(unbatched),
+            PurpleAngus.cause_of_death_batch(native),
+        )
+        assert np.allclose(
+            UnbatchedAngus.methane_production_batch(unbatched),
+            PurpleAngus.methane_production_batch(native),
+        )
+        assert np.all(UnbatchedAngus.fertile_batch(unbatched))
+
+        kcal = np.random.uniform(0, PurpleAngus.MAX_CALORIC_BOUND, 500)
+        assert np.allclose(
+            UnbatchedAngus.caloric_intake_batch(unbatched, kcal),
+            PurpleAngus.caloric_intake_batch(native, kcal),
+        )
+        assert np.allclose(unbatched.calories, native.calories)
+        assert np.allclose(unbatched.weight, native.weight)
+
+        expended = UnbatchedAngus.expend_calories_batch(unbatched)
+        assert np.all(expended >= PurpleAngus.MIN_CALORIC_BOUND)
+        assert np.all(unbatched.calories < native.calories)
+
+        milk = UnbatchedAngus.milk_production_batch(unbatched)
+        assert np.all(milk[unbatched.sex == Sex.MALE.value] == 0)
+
+    def test_metabolism_batch(self):
+        """Test that the default metabolism chains the bulk phase methods."""
+        native = Population(PurpleAngus)
+        native.extend(np.arange(200, dtype=np.int64), *PurpleAngus.generate_batch(200))
+        fallback = Population(PurpleAngus)
+        fallback.extend(
+            native.ids, native.age, native.sex, native.calories, native.weight
+        )
+
+        milk, methane = np.empty(200), np.empty(200)
+        expended = BatchFallback.metabolism_batch.__func__(
+            PurpleAngus, fallback, np.random.default_rng(3), milk, methane
+        )
+        rng = np.random.default_rng(3)
+        assert np.array_equal(expended, PurpleAngus.expend_calories_batch(native, rng))
+        assert np.array_equal(milk, PurpleAngus.milk_production_batch(native, rng))
+        assert np.array_equal(methane, PurpleAngus.methane_production_batch(native))
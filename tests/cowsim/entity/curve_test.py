@@ -0,0 +1,35 @@
+from cowsim.entity.curve import AgeCurve
+import numpy as np
+import pytest
+
+
+class AgeCurveTest:
+    """Tests for the AgeCurve class."""
+
+    def test_constant(self):
+        """Test the AgeCurve.constant() class method."""
+        curve = AgeCurve.constant(10.0, 2.0, 100)
+        assert curve.max_age == 100
+        assert np.all(curve.mean == 10.0)
+        assert np.all(curve.sigma == 2.0)
+
+    def test_invalid_tables(self):
+        """Test that mismatched tables are rejected."""
+        with pytest.raises(ValueError):
+            AgeCurve(np.zeros(3), np.zeros(4))
+
+    def test_sample_distribution(self):
+        """Test that batched draws follow the tabulated distribution."""
+        curve = AgeCurve(np.array([0.0, 100.0]), np.array([0.0, 5.0]))
+        samples = curve.sample_batch(np.ones(100000, dtype=np.int64))
+        assert abs(samples.mean() - 100.0) < 0.2
+        assert abs(samples.std() - 5.0) < 0.2
+
+        assert np.all(curve.sample_batch(np.zeros(10, dtype=np.int64)) == 0)
+
+    def test_sample_out_of_range(self):
+        """Test that ages beyond the table use its last entry."""
+        curve = AgeCurve(np.array([1.0, 2.0]), np.array([0.0, 0.0]))
+        assert curve.sample(-1) == 1.0
+        assert curve.sample(50) == 2.0
+        assert np.array_equal(curve.sample_batch(np.array([0, 1, 7])), [1, 2, 2])
@@ -0,0 +1,76 @@
+from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.entity.population import Population
+from cowsim.entity import Sex
+import numpy as np
+
+
+def make_population(quantity: int) -> Population:
+    population = Population(PurpleAngus)
+    population.extend(
+        np.arange(quantity, dtype=np.int64), *PurpleAngus.generate_batch(quantity)
+    )
+    return population
+
+
+class PopulationTest:
+    """Tests for the Population class."""
+
+    def test_extend(self):
+        """Test that extending grows the arrays and keeps data intact."""
+        population = make_population(3)
+        ages = population.age.copy()
+        assert len(population) == 3
+
+        quantity = 5 * Population.INITIAL_CAPACITY
+        population.extend(
+            np.arange(3, 3 + quantity, dtype=np.int64),
+            *PurpleAngus.newborn_batch(quantity),
+        )
+        assert len(population) == 3 + quantity
+        assert population.capacity >= len(population)
+        assert np.array_equal(population.age[:3], ages)
+        assert np.all(population.age[3:] == 0)
+        assert np.array_equal(population.ids, np.arange(3 + quantity))
+
+    def test_keep(self):
+        """Test that keep compacts the surviving entities."""
+        population = make_population(10)
+        ids = population.ids.copy()
+        weight = population.weight.copy()
+        mask = np.arange(10) % 3 == 0
+
+        population.keep(mask)
+        assert len(population) == np.count_nonzero(mask)
+        assert np.array_equal(population.ids, ids[mask])
+        assert np.array_equal(population.weight, weight[mask])
+
+    def test_views_write_through(self):
+        """Test that attribute arrays are views into the store."""
+        population = make_population(4)
+        population.age[:] += 1
+        population.calories[0] = 0
+        assert population.calories[0] == 0
+        assert np.all(population.age >= PurpleAngus.MIN_AGE + 1)
+
+    def test_shard(self):
+        """Test that shards are views into a range of the store."""
+        population = make_population(10)
+        shard = population.shard(3, 7)
+        assert len(shard) == 4
+        assert shard.species is PurpleAngus
+        assert np.array_equal(shard.ids, [3, 4, 5, 6])
+
+        shard.calories[:] = 0
+        assert np.all(population.calories[3:7] == 0)
+        assert np.all(population.calories[7:] > 0)
+
+    def test_to_entities(self):
+        """Test materializing per-object entities."""
+        population = make_population(4)
+        entities = population.to_entities()
+        assert len(entities) == 4
+        for entity, age, sex in zip(entities, population.age, population.sex):
+            assert isinstance(entity, PurpleAngus)
+            assert entity.age == age
+            assert entity.sex == Sex(sex)
+        assert [entity.id for entity in entities] == population.ids.tolist()
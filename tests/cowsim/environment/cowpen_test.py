@@ -1,7 +1,21 @@
 from cowsim.environment.cowpen import CowPen, OrangeGrass
+from cowsim.entity.cow import BatchFallback
 from cowsim.entity.cow.purple_angus import PurpleAngus
 from cowsim.entity import Sex
+from cowsim.environment.pairing import (
+    ALL_PAIRS_PAIRING,
+    PAIRING_MODES,
+    PER_STEP_EMOTIONS,
+)
+from cowsim.environment.pipeline import Pipeline
+from cowsim.environment.profiler import PhaseProfiler
+from cowsim.environment.sharding import ShardPool
+from cowsim.environment.sink import CsvSink
+from cowsim.utils import LOG
+import logging
 import numpy as np
+import pandas as pd
+import pytest
 
 
 class CowPenTest:
@@ -20,14 +34,19 @@ class CowPenTest:
         environment = CowPen([(PurpleAngus, quantity)])
 
         # Asserting empty data in the first row.
-        for id in environment._feeding_data[PurpleAngus.name]:
-            assert environment._feeding_data[PurpleAngus.name][id][0] is np.nan
+        feeding = environment.recorder.wide_frame(
+            PurpleAngus.name, CowPen.FEEDING_METRIC, 1
+        )
+        assert feeding.empty or feeding.loc[0].isna().all()
 
         environment._feeding_phase()
 
         # Assert row is propagated.
-        for id in environment._feeding_data[PurpleAngus.name]:
-            assert environment._feeding_data[PurpleAngus.name][id][0] is not None
+        feeding = environment.recorder.wide_frame(
+            PurpleAngus.name, CowPen.FEEDING_METRIC, 1
+        )
+        assert len(feeding.columns) == quantity
+        assert feeding.loc[0].notna().all()
 
     def test_step(self):
         """Test the step method"""
@@ -39,6 +58,619 @@ class CowPenTest:
         cowpen = CowPen([(PurpleAngus, 50)])
         cowpen.run()
 
+    def test_report(self, tmp_path):
+        """Test the report method."""
+        cowpen = CowPen([(PurpleAngus, 10)], max_steps=3)
+        cowpen.run()
+        cowpen.report(tmp_path)
+
+        population = pd.read_csv(tmp_path / "PurpleAngus_population.csv")
+        assert list(population.columns) == ["Step", PurpleAngus.name]
+        assert population[PurpleAngus.name][0] == 10
+        for name in ("entities", "feeding", "milk", "methane"):
+            frame = pd.read_csv(tmp_path / f"PurpleAngus_{name}.csv", index_col="Step")
+            assert len(frame) == 3
+
+    def test_summary(self):
+        """Test summarizing a run."""
+        cowpen = CowPen([(PurpleAngus, 10)], max_steps=3, seed=0)
+        summary = cowpen.summary()
+        assert summary["steps"] == 0
+        assert summary["PurpleAngus_final_population"] == 10
+        assert summary["PurpleAngus_births"] == 0
+
+        cowpen.run()
+        summary = cowpen.summary()
+        assert summary["steps"] == cowpen._steps
+        assert summary["PurpleAngus_peak_population"] >= 10
+        assert summary["PurpleAngus_total_feeding"] > 0
+        assert summary["PurpleAngus_total_milk"] >= 0
+
+    def test_summary_with_sink(self, tmp_path):
+        """Test that summaries include the records streamed to a sink."""
+        streamed = CowPen(
+            [(PurpleAngus, 50)], max_steps=6, seed=1, sink=CsvSink(tmp_path)
+        )
+        streamed.run()
+        buffered = CowPen([(PurpleAngus, 50)], max_steps=6, seed=1)
+        buffered.run()
+
+        summary = streamed.summary()
+        assert summary == pytest.approx(buffered.summary())
+        assert summary["PurpleAngus_births"] > 0
+        assert summary["PurpleAngus_peak_population"] >= 50
+
+        path = tmp_path / "checkpoint.npz"
+        streamed.checkpoint(path)
+        assert CowPen.resume(path).summary() == summary
+
+    def test_streaming(self, tmp_path):
+        """Test streaming recorded data to a sink during the run."""
+        cowpen = CowPen([(PurpleAngus, 10)], max_steps=3, sink=CsvSink(tmp_path))
+        cowpen.step()
+        assert len(cowpen.recorder.long_frame(PurpleAngus.name, "milk")) == 0
+
+        cowpen.run()
+        cowpen.report(tmp_path)
+
+        registry = pd.read_csv(tmp_path / "PurpleAngus_registry.csv")
+        assert len(registry) >= 10
+        population = pd.read_csv(tmp_path / "PurpleAngus_population.csv")
+        assert population["Step"].tolist() == list(range(cowpen._steps))
+        milk = pd.read_csv(tmp_path / "PurpleAngus_milk.csv")
+        assert list(milk.columns) == ["Step", "Id", "Value"]
+        assert set(milk["Id"]) <= set(registry["Id"])
+
+    def test_object_mode(self):
+        """Test running the per-object compatibility mode."""
+        cowpen = CowPen([(PurpleAngus, 20)], max_steps=5, mode=CowPen.OBJECT_MODE)
+        assert isinstance(cowpen._entities[PurpleAngus.name], list)
+        cowpen.run()
+
+    def test_entity_ids(self):
+        """Test that cows are recorded under compact integer identifiers."""
+        for mode in CowPen.MODES:
+            cowpen = CowPen([(PurpleAngus, 20)], max_steps=3, mode=mode, seed=0)
+            cowpen.run()
+            registered = cowpen.recorder.registered(PurpleAngus.name)
+            assert registered.dtype == np.int64
+            assert registered.tolist() == list(range(len(registered)))
+            if mode == CowPen.OBJECT_MODE:
+                ids = [cow.id for cow in cowpen._entities[PurpleAngus.name]]
+                assert set(ids) <= set(registered.tolist())
+
+    def test_entity_uuids(self, tmp_path):
+        """Test exporting the mapping from identifiers to UUIDs."""
+        cowpen = CowPen([(PurpleAngus, 10)], max_steps=2, seed=0)
+        cowpen.run()
+        cowpen.report(tmp_path, uuids=True)
+
+        uuids = pd.read_csv(tmp_path / CowPen.UUIDS_FILE)
+        assert uuids["Id"].tolist() == list(range(cowpen._next_id))
+        assert uuids["Uuid"].is_unique
+        again = CowPen([(PurpleAngus, 10)], max_steps=2, seed=0)
+        again.run()
+        assert again.entity_uuids()["Uuid"].tolist() == uuids["Uuid"].tolist()
+
+    def test_object_mode_all_pairs(self):
+        """Test the per-object mode with every ordered pair reproducing."""
+        cowpen = CowPen(
+            [(PurpleAngus, 20)],
+            max_steps=2,
+            mode=CowPen.OBJECT_MODE,
+            pairing=ALL_PAIRS_PAIRING,
+        )
+        cowpen.run()
+
+    def test_per_step_emotions(self):
+        """Test drawing every cow's emotion once per step."""
+        for mode in CowPen.MODES:
+            for pairing in PAIRING_MODES:
+                cowpen = CowPen(
+                    [(PurpleAngus, 30)],
+                    max_steps=3,
+                    mode=mode,
+                    pairing=pairing,
+                    emotions=PER_STEP_EMOTIONS,
+                    seed=0,
+                )
+                cowpen.run()
+                assert cowpen.parameters["emotions"] == PER_STEP_EMOTIONS
+
+        with pytest.raises(RuntimeError):
+            CowPen([(PurpleAngus, 10)], emotions="per_herd")
+
+    def test_unbatched_species(self):
+        """Test running species without array kernels in the vectorized mode."""
+        for pairing in PAIRING_MODES:
+            cowpen = CowPen(
+                [(UnbatchedAngus, 40)], max_steps=4, pairing=pairing, seed=1
+            )
+            population = cowpen._entities[UnbatchedAngus.name]
+            population.age[:] = PurpleAngus.ADULT_AGE
+            cowpen.run()
+            assert cowpen.summary()["UnbatchedAngus_births"] > 0
+
+    def test_legacy_should_reproduce(self):
+        """Test species whose `should_reproduce` takes the two cows only."""
+        for mode in CowPen.MODES:
+            cowpen = CowPen([(LegacyAngus, 40)], max_steps=2, mode=mode, seed=1)
+            herd = cowpen._entities[LegacyAngus.name]
+            if mode == CowPen.OBJECT_MODE:
+                for cow in herd:
+                    cow._age = PurpleAngus.ADULT_AGE
+            else:
+                herd.age[:] = PurpleAngus.ADULT_AGE
+            cowpen.run()
+            assert cowpen.summary()["LegacyAngus_births"] > 0
+
+    def test_vectorized_reproduction_phase(self):
+        """Test that newborns join the herd with fresh identifiers."""
+        cowpen = CowPen([(PurpleAngus, 100)], pairing=ALL_PAIRS_PAIRING)
+        population = cowpen._entities[PurpleAngus.name]
+        population.age[:] = PurpleAngus.ADULT_AGE
+        cowpen._reproduction_phase()
+
+        assert len(population) > 100
+        assert np.all(population.age[100:] == 0)
+        assert len(np.unique(population.ids)) == len(population)
+
+    def test_newborns_reported(self):
+        """Test that every newborn is reported, even if culled at birth."""
+        for mode in CowPen.MODES:
+            cowpen = CowPen(
+                [(PurpleAngus, 20)],
+                max_capacity=5,
+                max_steps=1,
+                mode=mode,
+                pairing=ALL_PAIRS_PAIRING,
+            )
+            if mode == CowPen.VECTORIZED_MODE:
+                cowpen._entities[PurpleAngus.name].age[:] = PurpleAngus.ADULT_AGE
+            else:
+                for cow in cowpen._entities[PurpleAngus.name]:
+                    cow._age = PurpleAngus.ADULT_AGE
+            cowpen.step()
+
+            registered = cowpen.recorder.registered(PurpleAngus.name)
+            assert len(registered) > 20
+            for metric in (CowPen.FEEDING_METRIC, CowPen.MILK_METRIC):
+                frame = cowpen.recorder.wide_frame(PurpleAngus.name, metric, 1)
+                assert list(frame.columns) == registered.tolist()
+
+    def test_population_pruning_phase(self):
+        """Test that deaths are removed and counted by cause."""
+        for mode in CowPen.MODES:
+            cowpen = CowPen([(PurpleAngus, 10)], mode=mode, seed=0)
+            herd = cowpen._entities[PurpleAngus.name]
+            if mode == CowPen.VECTORIZED_MODE:
+                herd.age[:] = PurpleAngus.ADULT_AGE
+                herd.weight[:] = PurpleAngus.MIN_ADULT_WEIGHT + 1
+                herd.age[:2] = PurpleAngus.MAX_AGE + 1
+                herd.weight[2] = PurpleAngus.MAX_WEIGHT + 1
+            else:
+                for cow in herd:
+                    cow._age = PurpleAngus.ADULT_AGE
+                    cow._weight = PurpleAngus.MIN_ADULT_WEIGHT + 1
+                herd[0]._age = herd[1]._age = PurpleAngus.MAX_AGE + 1
+                herd[2]._weight = PurpleAngus.MAX_WEIGHT + 1
+            dead = set(cowpen._ids(PurpleAngus.name)[:3].tolist())
+
+            cowpen._population_pruning_phase()
+
+            ids = cowpen._ids(PurpleAngus.name).tolist()
+            assert len(ids) == 7
+            assert not dead & set(ids)
+            deaths = cowpen.wide_frames(PurpleAngus.name)["deaths"].loc[0]
+            assert deaths["old_age"] == 2
+            assert deaths["overweight"] == 1
+            assert deaths["malnourished"] == 0
+            assert deaths["overpopulation"] == 0
+
+    def test_overpopulation(self):
+        """Test that an overpopulated herd is culled down to max capacity.
+
+        Regression test: the herd used to keep only the number of cows above
+        capacity instead of the cows within it.
+        """
+        for mode in CowPen.MODES:
+            cowpen = CowPen([(PurpleAngus, 30)], max_capacity=10, mode=mode, seed=0)
+            herd = cowpen._entities[PurpleAngus.name]
+            if mode == CowPen.VECTORIZED_MODE:
+                herd.weight[:] = PurpleAngus.MIN_ADULT_WEIGHT + 1
+            else:
+                for cow in herd:
+                    cow._weight = PurpleAngus.MIN_ADULT_WEIGHT + 1
+            before = set(cowpen._ids(PurpleAngus.name).tolist())
+
+            cowpen._population_pruning_phase()
+
+            ids = cowpen._ids(PurpleAngus.name).tolist()
+            assert len(ids) == 10
+            assert len(set(ids)) == 10
+            assert set(ids) <= before
+            summary = cowpen.summary()
+            assert summary["PurpleAngus_deaths_overpopulation"] == 20
+
+    def test_seed(self):
+        """Test that runs with the same seed produce the same records."""
+
+        def run(mode, seed):
+            cowpen = CowPen([(PurpleAngus, 20)], max_steps=5, mode=mode, seed=seed)
+            cowpen.run()
+            return cowpen.recorder.long_frame(PurpleAngus.name, CowPen.MILK_METRIC)
+
+        for mode in CowPen.MODES:
+            pd.testing.assert_frame_equal(run(mode, 3), run(mode, 3))
+            assert not run(mode, 3).equals(run(mode, 4))
+
+        assert CowPen([(PurpleAngus, 1)], seed=3).parameters["seed"] == 3
+
+    def test_checkpoint_resume(self, tmp_path):
+        """Test that a resumed run continues bit-identically."""
+        for mode in CowPen.MODES:
+            kwargs = dict(max_steps=8, mode=mode, seed=11)
+            expected = CowPen([(PurpleAngus, 40)], **kwargs)
+            expected.run()
+
+            cowpen = CowPen([(PurpleAngus, 40)], **kwargs)
+            for _ in range(3):
+                cowpen.step()
+            cowpen.checkpoint(tmp_path / "checkpoint.npz")
+
+            resumed = CowPen.resume(tmp_path / "checkpoint.npz")
+            assert resumed.mode == mode
+            assert resumed._steps == 3
+            resumed.run()
+
+            assert resumed.parameters == expected.parameters
+            snapshot, expected_snapshot = (
+                resumed.recorder.snapshot(),
+                expected.recorder.snapshot(),
+            )
+            assert list(snapshot) == list(expected_snapshot)
+            for name, values in expected_snapshot.items():
+                assert np.array_equal(snapshot[name], values)
+
+    def test_aggregate_recording(self, tmp_path):
+        """Test that aggregate recording keeps the summary without per-cow
+        records."""
+        for mode in CowPen.MODES:
+            kwargs = dict(max_steps=5, mode=mode, seed=4)
+            full = CowPen([(PurpleAngus, 100)], **kwargs)
+            full.run()
+            cowpen = CowPen(
+                [(PurpleAngus, 100)], recording=CowPen.AGGREGATE_RECORDING, **kwargs
+            )
+            cowpen.run()
+
+            assert cowpen.summary() == pytest.approx(full.summary())
+            recorder = cowpen.recorder
+            assert recorder.entity_metrics(PurpleAngus.name) == []
+            assert len(recorder.registered(PurpleAngus.name)) == 0
+
+            frames = cowpen.wide_frames(PurpleAngus.name)
+            assert set(CowPen.ENTITY_METRICS) <= set(frames)
+            weight = frames[CowPen.WEIGHT_METRIC]
+            assert list(weight.columns) == ["total", "mean", "p10", "p50", "p90"]
+            assert len(weight) == 5
+            expected = full.recorder.wide_frame(
+                PurpleAngus.name, CowPen.MILK_METRIC, 5
+            ).sum(axis=1, min_count=1)
+            assert np.allclose(
+                frames[CowPen.MILK_METRIC]["total"], expected, equal_nan=True
+            )
+
+        cowpen.report(tmp_path)
+        births = pd.read_csv(tmp_path / "PurpleAngus_births.csv")
+        assert births[PurpleAngus.name].sum() == cowpen.summary()["PurpleAngus_births"]
+
+        with pytest.raises(RuntimeError):
+            CowPen([(PurpleAngus, 10)], recording="sampled")
+
+    def test_tracing(self, tmp_path):
+        """Test tracing a bounded, consistent sample of the cows."""
+        for mode in CowPen.MODES:
+            kwargs = dict(
+                max_capacity=400,
+                max_steps=6,
+                mode=mode,
+                seed=5,
+                recording=CowPen.AGGREGATE_RECORDING,
+                trace_fraction=0.2,
+                trace_max=30,
+            )
+            cowpen = CowPen([(PurpleAngus, 400)], **kwargs)
+            cowpen.run()
+
+            registry = cowpen.recorder.registry_frame(PurpleAngus.name)
+            assert 0 < len(registry[registry["Step"] == 0]) <= 30
+            assert (registry["Step"] > 0).any()
+            milk = cowpen.wide_frames(PurpleAngus.name)["traced_milk"]
+            assert list(milk.columns) == registry["Id"].tolist()
+            assert milk.notna().sum(axis=1).max() <= 30
+            for id, step in zip(registry["Id"], registry["Step"]):
+                # Traced from the step the cow joined until it died.
+                traced = milk[id].notna().to_numpy()
+                assert not traced[:step].any()
+                assert np.all(np.diff(traced[step:].astype(int)) <= 0)
+
+            expected = CowPen([(PurpleAngus, 400)], **kwargs)
+            for _ in range(3):
+                expected.step()
+            expected.checkpoint(tmp_path / "checkpoint.npz")
+            resumed = CowPen.resume(tmp_path / "checkpoint.npz")
+            resumed.run()
+            for name, values in cowpen.recorder.snapshot().items():
+                assert np.array_equal(resumed.recorder.snapshot()[name], values)
+
+        with pytest.raises(RuntimeError):
+            CowPen([(PurpleAngus, 10)], trace_max=10)
+        with pytest.raises(RuntimeError):
+            CowPen(
+                [(PurpleAngus, 10)],
+                recording=CowPen.AGGREGATE_RECORDING,
+                trace_fraction=0,
+            )
+
+    def test_shards(self, monkeypatch):
+        """Test that sharded runs do not depend on thread scheduling."""
+
+        def run(shards):
+            cowpen = CowPen([(PurpleAngus, 200)], max_steps=5, seed=2, shards=shards)
+            cowpen.run()
+            return cowpen.recorder.snapshot()
+
+        serial = run(4)
+        monkeypatch.setattr(ShardPool, "MIN_PARALLEL_SIZE", 0)
+        threaded = run(4)
+        assert list(threaded) == list(serial)
+        for name, values in serial.items():
+            assert np.array_equal(threaded[name], values)
+
+        cowpen = CowPen([(PurpleAngus, 10)], shards=3)
+        assert cowpen.parameters["shards"] == 3
+        for mode, shards in [(CowPen.VECTORIZED_MODE, 0), (CowPen.OBJECT_MODE, 2)]:
+            with pytest.raises(RuntimeError):
+                CowPen([(PurpleAngus, 10)], mode=mode, shards=shards)
+
+    def test_numba_backend(self, monkeypatch, caplog):
+        """Test the fused metabolism kernels, compiled or not."""
+        monkeypatch.setattr("cowsim.environment.cowpen.NUMBA_AVAILABLE", True)
+        monkeypatch.setattr("cowsim.entity.cow.purple_angus.NUMBA_AVAILABLE", True)
+
+        def run(shards):
+            cowpen = CowPen(
+                [(PurpleAngus, 200)],
+                max_steps=5,
+                seed=4,
+                shards=shards,
+                backend=CowPen.NUMBA_BACKEND,
+            )
+            cowpen.run()
+            return cowpen
+
+        cowpen = run(1)
+        assert cowpen.backend == CowPen.NUMBA_BACKEND
+        assert cowpen.parameters["backend"] == CowPen.NUMBA_BACKEND
+        assert not cowpen._production
+        snapshot = cowpen.recorder.snapshot()
+        for name, values in run(1).recorder.snapshot().items():
+            assert np.array_equal(snapshot[name], values)
+
+        milk = cowpen.recorder.long_frame(PurpleAngus.name, CowPen.MILK_METRIC)
+        methane = cowpen.recorder.long_frame(PurpleAngus.name, CowPen.METHANE_METRIC)
+        assert milk[["Step", "Id"]].equals(methane[["Step", "Id"]])
+        assert (milk["Value"] >= 0).all() and (methane["Value"] >= 0).all()
+
+        serial = run(3).recorder.snapshot()
+        monkeypatch.setattr(ShardPool, "MIN_PARALLEL_SIZE", 0)
+        threaded = run(3).recorder.snapshot()
+        for name, values in serial.items():
+            assert np.array_equal(threaded[name], values)
+
+        for mode, backend in [
+            (CowPen.VECTORIZED_MODE, "cuda"),
+            (CowPen.OBJECT_MODE, CowPen.NUMBA_BACKEND),
+        ]:
+            with pytest.raises(RuntimeError):
+                CowPen([(PurpleAngus, 10)], mode=mode, backend=backend)
+
+        monkeypatch.setattr("cowsim.environment.cowpen.NUMBA_AVAILABLE", False)
+        with caplog.at_level(logging.WARNING, logger=LOG.name):
+            cowpen = CowPen([(PurpleAngus, 10)], backend=CowPen.NUMBA_BACKEND)
+        assert cowpen.backend == CowPen.NUMPY_BACKEND
+        assert any(r.levelno == logging.WARNING for r in caplog.records)
+
+    def test_fused_pipeline(self, tmp_path):
+        """Test running steps through a fused Pipeline."""
+
+        def run(cowpen):
+            cowpen.run()
+            return cowpen.recorder.snapshot()
+
+        def assert_same(snapshot, other):
+            assert list(snapshot) == list(other)
+            for name, values in other.items():
+                assert np.array_equal(snapshot[name], values)
+
+        # A single chunk per herd (or shard) gives the phase by phase results.
+        for options in [
+            {},
+            {"shards": 3},
+            {"recording": CowPen.AGGREGATE_RECORDING, "trace_max": 10},
+        ]:
+            phased = CowPen([(PurpleAngus, 200)], max_steps=5, seed=3, **options)
+            fused = CowPen(
+                [(PurpleAngus, 200)], max_steps=5, seed=3, chunk_size=1000, **options
+            )
+            assert_same(run(fused), run(phased))
+
+        # Smaller chunks give the same results, fused or not.
+        fused = CowPen([(PurpleAngus, 200)], max_steps=5, seed=3, chunk_size=16)
+        unfused = CowPen([(PurpleAngus, 200)], max_steps=5, seed=3, chunk_size=16)
+        unfused._pipeline = Pipeline(unfused.pipeline_phases(), 16, fused=False)
+        assert_same(run(fused), run(unfused))
+        assert fused.parameters["chunk_size"] == 16
+        stages = fused._pipeline.stages
+        assert [len(stage) for stage in stages] == [1, 1, 1, 2, 1, 3, 1, 1]
+        reads = {phase.name: phase.reads for stage in stages for phase in stage}
+        assert set(reads["recording"]) == {"ids", "age", "calories", "weight"}
+
+        path = tmp_path / "checkpoint.npz"
+        fused.checkpoint(path)
+        assert CowPen.resume(path).parameters["chunk_size"] == 16
+
+        profiler = PhaseProfiler(memory=False)
+        CowPen([(PurpleAngus, 20)], max_steps=2, chunk_size=8, profiler=profiler).run()
+        phases = profiler.summary().index.tolist()
+        assert "energy_expenditure+mortality" in phases
+        assert "milk_production+methane_production+aging" in phases
+
+        for mode, chunk_size in [(CowPen.VECTORIZED_MODE, 0), (CowPen.OBJECT_MODE, 8)]:
+            with pytest.raises(RuntimeError):
+                CowPen([(PurpleAngus, 10)], mode=mode, chunk_size=chunk_size)
+
+    def test_checkpoint_every(self, tmp_path):
+        """Test writing checkpoints during a run."""
+        path = tmp_path / "checkpoint.npz"
+        cowpen = CowPen([(PurpleAngus, 40)], max_steps=4, seed=0)
+        cowpen.run(checkpoint_path=path, checkpoint_every=2)
+        assert CowPen.resume(path)._steps == 2 * (cowpen._steps // 2)
+        assert not (tmp_path / "checkpoint.npz.tmp").exists()
+
+    def test_profiler(self, tmp_path):
+        """Test measuring every phase of every step."""
+        cowpen = CowPen(
+            [(PurpleAngus, 20)], max_steps=3, seed=0, profiler=PhaseProfiler()
+        )
+        cowpen.run()
+        cowpen.report(tmp_path)
+
+        timings = pd.read_csv(tmp_path / CowPen.TIMINGS_FILE)
+        phases = timings[timings["Step"] == 0]["Phase"].tolist()
+        assert phases[:2] == ["recording", "feeding"]
+        assert "population_pruning" in phases
+        assert len(timings) == len(phases) * cowpen._steps
+        assert (timings["Entities"] >= 0).all()
+
+    def test_step_log(self, caplog):
+        """Test that births and deaths are logged once per step, in aggregate."""
+        for mode in CowPen.MODES:
+            caplog.clear()
+            cowpen = CowPen([(PurpleAngus, 20)], max_steps=5, mode=mode, seed=3)
+            with caplog.at_level(logging.INFO, logger=LOG.name):
+                cowpen.run()
+
+            records = [r for r in caplog.records if r.levelno == logging.INFO]
+            assert len(records) == cowpen._steps
+            steps, populations, keys, births, deaths, _ = zip(
+                *(record.args for record in records)
+            )
+            assert list(steps) == list(range(cowpen._steps))
+            assert set(keys) == {PurpleAngus.name}
+            assert populations[-1] == len(cowpen._entities[PurpleAngus.name])
+            assert 20 + sum(births) - sum(deaths) == populations[-1]
+            assert 20 + sum(births) == len(cowpen.recorder.registered(PurpleAngus.name))
+
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger=LOG.name):
+            CowPen([(PurpleAngus, 20)], max_steps=2, seed=3).run()
+        assert not caplog.records
+
+    def test_invalid_mode(self):
+        """Test that an unknown mode is rejected."""
+        with pytest.raises(RuntimeError):
+            CowPen([(PurpleAngus, 4)], mode="unknown")
+
+        with pytest.raises(RuntimeError):
+            CowPen([(PurpleAngus, 4)], pairing="unknown")
+
+    def test_vectorized_feeding_phase(self):
+        """Test that the feed is split proportionally until depleted."""
+        environment = CowPen([(PurpleAngus, 4)])
+        population = environment._entities[PurpleAngus.name]
+        population.calories[:] = [6000, 12000, 15000, 24000]
+        environment.set_feed(OrangeGrass, 20)
+        environment._feeding_phase()
+
+        servings = environment.recorder.wide_frame(
+            PurpleAngus.name, CowPen.FEEDING_METRIC, 1
+        ).loc[0]
+        servings = servings[population.ids].to_numpy(dtype=float)
+        assert servings.sum() == 20
+        assert np.all(servings <= [3, 5, 6, 9])
+
+    def test_unbatched_feed(self):
+        """Test feeding one cow at a time with feeds lacking `feed_batch`."""
+        for mode in CowPen.MODES:
+            environment = CowPen([(PurpleAngus, 4)], mode=mode, seed=3)
+            herd = environment._entities[PurpleAngus.name]
+            cows = lambda: herd if mode == CowPen.OBJECT_MODE else herd.to_entities()
+            if mode == CowPen.OBJECT_MODE:
+                for cow, calories in zip(herd, [1, 2, 3, 4]):
+                    cow._calories = calories * 1000
+            else:
+                herd.calories[:] = [1000, 2000, 3000, 4000]
+            before = {cow.id: (cow.calories, cow.weight) for cow in cows()}
+            environment.set_feed(FatteningGrass, 5)
+            environment._feeding_phase()
+
+            servings = environment.recorder.wide_frame(
+                PurpleAngus.name, CowPen.FEEDING_METRIC, 1
+            ).loc[0]
+            assert servings.sum() == 5
+            for cow in cows():
+                calories, weight = before[cow.id]
+                intake = servings[cow.id] * OrangeGrass.CALORIES_PER_SERVING
+                assert cow.calories == pytest.approx(calories + intake)
+                assert cow.weight == pytest.approx(weight + 1)
+
+        # Cows are served in the order of the batch kernel.
+        fed = {}
+        for feed in [OrangeGrass, UnbatchedGrass]:
+            environment = CowPen([(PurpleAngus, 4)], seed=3)
+            environment.set_feed(feed, 10)
+            environment._feeding_phase()
+            fed[feed] = environment._entities[PurpleAngus.name].calories.copy()
+        assert np.array_equal(fed[UnbatchedGrass], fed[OrangeGrass])
+
+
+# PurpleAngus relying on the per-instance fallback of the bulk interface.
+UnbatchedAngus = type(
+    "UnbatchedAngus",
+    (PurpleAngus,),
+    {
+        name: method
+        for name, method in vars(BatchFallback).items()
+        if isinstance(method, classmethod)
+    },
+)
+
+
+class LegacyAngus(UnbatchedAngus):
+    """UnbatchedAngus with the original two-argument `should_reproduce`."""
+
+    @classmethod
+    def should_reproduce(cls, cow_a, cow_b) -> bool:
+        return cow_a.sex != cow_b.sex and min(cow_a.age, cow_b.age) >= cls.ADULT_AGE
+
+
+class UnbatchedGrass(OrangeGrass):
+    """OrangeGrass without batch feeding."""
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        return False
+
+
+class FatteningGrass(UnbatchedGrass):
+    """Unbatched feed also adding a unit of weight to each cow it feeds."""
+
+    def feed(self, cow) -> int:
+        cow._weight += 1
+        return super().feed(cow)
+
 
 class OrangeGrassTest:
     """Tests for the OrangeGrass class."""
@@ -106,3 +738,22 @@ class OrangeGrassTest:
         assert orange_grass.feed(angus2) == 5
         assert orange_grass.feed(angus3) == 6
         assert orange_grass.feed(angus4) == 6
+
+    def test_feed_batch(self):
+        """Tests that `feed_batch` serves cows like `feed`, in a random order."""
+        calories = [6000, 12000, 15000, 24000]
+        orange_grass = OrangeGrass(20)
+        servings = orange_grass.feed_batch(np.array(calories), np.random.default_rng(0))
+        assert orange_grass.current_serving_total == 0
+
+        cow_list = [
+            PurpleAngus(age=100, sex=Sex.MALE, calories=c, weight=1000)
+            for c in calories
+        ]
+        orange_grass = OrangeGrass(20, cow_list)
+        expected = np.zeros(len(cow_list), dtype=np.int64)
+        for index in np.random.default_rng(0).permutation(len(cow_list)):
+            expected[index] = orange_grass.feed(cow_list[index])
+        assert servings.tolist() == expected.tolist()
+
+        assert OrangeGrass(20).feed_batch(np.zeros(3)).tolist() == [0, 0, 0]
@@ -0,0 +1,87 @@
+from cowsim.entity.cow import Emotion
+from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.entity.population import Population
+from cowsim.entity import Sex
+from cowsim.environment.pairing import (
+    all_pairs_births,
+    bucket_by_sex,
+    monogamous_births,
+    pair_couples,
+)
+import numpy as np
+
+
+def make_population(males: int, females: int, juveniles: int) -> Population:
+    quantity = males + females + juveniles
+    population = Population(PurpleAngus)
+    population.extend(
+        np.arange(quantity, dtype=np.int64), *PurpleAngus.generate_batch(quantity)
+    )
+    population.age[: males + females] = PurpleAngus.ADULT_AGE
+    population.age[males + females :] = 0
+    population.sex[:males] = Sex.MALE.value
+    population.sex[males:] = Sex.FEMALE.value
+    return population
+
+
+class PairingTest:
+    """Tests for the reproduction pairing engine."""
+
+    def test_bucket_by_sex(self):
+        """Test that only fertile cows are bucketed, split by sex."""
+        population = make_population(3, 5, 7)
+        males, females = bucket_by_sex(population)
+        assert np.array_equal(males, [0, 1, 2])
+        assert np.array_equal(females, [3, 4, 5, 6, 7])
+
+    def test_pair_couples(self):
+        """Test that every cow is matched at most once."""
+        males, females = pair_couples(np.arange(10), np.arange(10, 14))
+        assert len(males) == len(females) == 4
+        assert len(np.unique(males)) == 4
+        assert set(females) == {10, 11, 12, 13}
+
+    def test_monogamous_births(self):
+        """Test that each couple produces at most one newborn."""
+        population = make_population(30, 10, 50)
+        for _ in range(100):
+            assert 0 <= monogamous_births(population) <= 10
+
+        assert monogamous_births(make_population(10, 0, 10)) == 0
+
+    def test_all_pairs_births(self):
+        """Test that ALL_PAIRS_PAIRING matches the ordered pair trials."""
+        males, females = 20, 30
+        population = make_population(males, females, 10)
+        births = [all_pairs_births(population) for _ in range(200)]
+        expected = 2 * males * females * PurpleAngus.expected_reproduction_probability()
+        assert abs(np.mean(births) - expected) < 0.05 * expected
+
+    def test_per_step_emotions(self):
+        """Test births when every cow's emotion is drawn once for the step."""
+        population = make_population(20, 30, 10)
+        happy = np.full(len(population), Emotion.HAPPY.value, dtype=np.int8)
+        assert all_pairs_births(population, emotions=happy) == 2 * 20 * 30
+        assert monogamous_births(population, emotions=happy) == 20
+
+        tired = np.full(len(population), Emotion.TIRED.value, dtype=np.int8)
+        births = [all_pairs_births(population, emotions=tired) for _ in range(200)]
+        expected = 2 * 20 * 30 * PurpleAngus.NEGATIVE_REPRODUCTION_PROBABILITY**2
+        assert abs(np.mean(births) - expected) < 0.05 * expected
+
+    def test_expected_reproduction_probability(self):
+        """Test the expected probability against should_reproduce."""
+        male = PurpleAngus(
+            age=PurpleAngus.ADULT_AGE, sex=Sex.MALE, calories=1000, weight=1000
+        )
+        female = PurpleAngus(
+            age=PurpleAngus.ADULT_AGE, sex=Sex.FEMALE, calories=1000, weight=1000
+        )
+        trials = 20000
+        successes = sum(
+            PurpleAngus.should_reproduce(male, female) for _ in range(trials)
+        )
+        assert (
+            abs(successes / trials - PurpleAngus.expected_reproduction_probability())
+            < 0.02
+        )
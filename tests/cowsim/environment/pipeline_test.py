@@ -0,0 +1,168 @@
+from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.entity.population import Population
+from cowsim.environment.pipeline import HERD, Phase, Pipeline
+from cowsim.environment.sharding import ShardPool
+from cowsim.utils.rng import RandomStreams
+import numpy as np
+import pytest
+
+
+def make_herds(quantity: int) -> {str: Population}:
+    population = Population(PurpleAngus)
+    population.extend(
+        np.arange(quantity, dtype=np.int64),
+        *PurpleAngus.generate_batch(quantity, np.random.default_rng(0)),
+    )
+    return {PurpleAngus.name: population}
+
+
+def make_phases(herds: {str: Population}, collected: [dict]) -> [Phase]:
+    """Kernels drawing random numbers and passing outputs on, around a
+    barrier that removes entities."""
+
+    def feed(chunk, rng, snack):
+        snack[:] = rng.uniform(0, 10, len(chunk))
+        chunk.calories[:] += snack
+
+    def grow(chunk, rng, snack):
+        chunk.weight[:] += snack / 10
+
+    def remove(outputs):
+        kept = {key: outputs[key]["snack"] > 5 for key in herds}
+        for key, herd in herds.items():
+            herd.keep(kept[key])
+        return kept
+
+    def age(chunk, rng, snack, bonus):
+        bonus[:] = snack * rng.normal(1, 0.1, len(chunk))
+        chunk.age[:] += 1
+
+    def collect(outputs):
+        collected.append({key: dict(values) for key, values in outputs.items()})
+
+    return [
+        Phase(
+            "feed",
+            kernel=feed,
+            stream="feed",
+            reads=("calories",),
+            writes=("calories",),
+            outputs={"snack": np.float64},
+        ),
+        Phase("grow", kernel=grow, reads=("snack",), writes=("weight",)),
+        Phase("remove", run=remove, reads=("snack",), writes=(HERD,)),
+        Phase(
+            "age",
+            kernel=age,
+            stream="age",
+            reads=("age", "snack"),
+            writes=("age",),
+            outputs={"bonus": np.float64},
+        ),
+        Phase("collect", run=collect, reads=("snack", "bonus")),
+    ]
+
+
+def run_pipeline(
+    quantity: int, chunk_size: int, fused: bool, shard_pool: ShardPool = None
+) -> (Population, dict):
+    herds = make_herds(quantity)
+    collected = []
+    pipeline = Pipeline(make_phases(herds, collected), chunk_size, fused=fused)
+    pipeline.step(herds, RandomStreams(7).generator, shard_pool)
+    return herds[PurpleAngus.name], collected[0][PurpleAngus.name]
+
+
+class PhaseTest:
+    """Tests for the Phase class."""
+
+    def test_invalid(self):
+        """Test rejecting inconsistent phase declarations."""
+        run = lambda outputs: None
+        kernel = lambda chunk, rng: None
+        with pytest.raises(ValueError):
+            Phase("both", run=run, kernel=kernel)
+        with pytest.raises(ValueError):
+            Phase("neither")
+        with pytest.raises(ValueError):
+            Phase("barrier", run=run, stream="stream")
+        with pytest.raises(ValueError):
+            Phase("kernel", kernel=kernel, writes=(HERD,))
+
+        assert Phase("barrier", run=run).is_barrier
+        assert not Phase("kernel", kernel=kernel).is_barrier
+
+
+class PipelineTest:
+    """Tests for the Pipeline class."""
+
+    def test_stages(self):
+        """Test fusing consecutive kernels between barriers."""
+        phases = make_phases(make_herds(10), [])
+        names = lambda pipeline: [[p.name for p in s] for s in pipeline.stages]
+        assert names(Pipeline(phases)) == [
+            ["feed", "grow"],
+            ["remove"],
+            ["age"],
+            ["collect"],
+        ]
+        assert names(Pipeline(phases, fused=False)) == [
+            ["feed"],
+            ["grow"],
+            ["remove"],
+            ["age"],
+            ["collect"],
+        ]
+
+    def test_invalid(self):
+        """Test rejecting reads of outputs that are not produced yet."""
+        phases = make_phases(make_herds(10), [])
+        with pytest.raises(ValueError):
+            Pipeline(phases[1:])
+        with pytest.raises(ValueError):
+            Pipeline(phases, chunk_size=0)
+
+    def test_bounds(self):
+        """Test that chunks cover the herd in order."""
+        pipeline = Pipeline([], chunk_size=4)
+        assert pipeline.bounds(10) == [(0, 4), (4, 8), (8, 10)]
+        assert pipeline.bounds(4) == [(0, 4)]
+        assert pipeline.bounds(0) == [(0, 0)]
+
+    def test_fused_matches_phased(self, monkeypatch):
+        """Test that fused stages give the results of one phase at a time."""
+        for chunk_size in [7, 100, 1000]:
+            phased, phased_outputs = run_pipeline(500, chunk_size, fused=False)
+            fused, fused_outputs = run_pipeline(500, chunk_size, fused=True)
+            for field in Population.FIELDS:
+                assert np.array_equal(getattr(fused, field), getattr(phased, field))
+            assert list(fused_outputs) == ["snack", "bonus"]
+            for name, values in phased_outputs.items():
+                assert len(values) == len(fused)
+                assert np.array_equal(fused_outputs[name], values)
+
+        # Threaded shards do not depend on scheduling.
+        serial, serial_outputs = run_pipeline(500, 16, True, ShardPool(3))
+        monkeypatch.setattr(ShardPool, "MIN_PARALLEL_SIZE", 0)
+        threaded, threaded_outputs = run_pipeline(500, 16, True, ShardPool(3))
+        assert np.array_equal(threaded.calories, serial.calories)
+        assert np.array_equal(threaded_outputs["bonus"], serial_outputs["bonus"])
+
+    def test_single_chunk(self):
+        """Test that a herd within one chunk draws from the stream itself."""
+        herd, outputs = run_pipeline(500, 1000, fused=True)
+        original = make_herds(500)[PurpleAngus.name]
+        snack = RandomStreams(7).generator("feed").uniform(0, 10, 500)
+        kept = snack > 5
+        assert np.array_equal(outputs["snack"], snack[kept])
+        assert np.array_equal(herd.calories, (original.calories + snack)[kept])
+        assert np.array_equal(herd.age, original.age[kept] + 1)
+
+    def test_dropped_outputs(self):
+        """Test that outputs do not outlive barriers adding entities."""
+        herds = make_herds(10)
+        phases = make_phases(herds, [])
+        phases[2] = Phase("reproduce", run=lambda outputs: None, writes=(HERD,))
+        pipeline = Pipeline(phases)
+        with pytest.raises(KeyError):
+            pipeline.step(herds, RandomStreams(0).generator)
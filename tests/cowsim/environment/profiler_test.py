@@ -0,0 +1,43 @@
+from cowsim.environment.profiler import PhaseProfiler
+import tracemalloc
+
+
+class PhaseProfilerTest:
+    """Tests for the PhaseProfiler class."""
+
+    def test_phase(self):
+        """Test measuring phases."""
+        profiler = PhaseProfiler()
+        profiler.start()
+        try:
+            with profiler.phase(0, "allocate", lambda: 3):
+                data = [0] * 100_000
+            with profiler.phase(0, "idle", lambda: 2):
+                pass
+            with profiler.phase(1, "allocate", lambda: 4):
+                pass
+        finally:
+            profiler.stop()
+        del data
+
+        frame = profiler.frame()
+        assert frame["Step"].tolist() == [0, 0, 1]
+        assert frame["Phase"].tolist() == ["allocate", "idle", "allocate"]
+        assert frame["Entities"].tolist() == [3, 2, 4]
+        assert (frame["Seconds"] >= 0).all()
+        assert frame["AllocatedBytes"][0] >= 800_000
+        assert frame["PeakBytes"][0] >= frame["AllocatedBytes"][0]
+        assert not tracemalloc.is_tracing()
+
+        summary = profiler.summary()
+        assert list(summary.index) == ["allocate", "idle"]
+        assert abs(summary["Share"].sum() - 1) < 1e-9
+
+    def test_without_memory(self):
+        """Test that allocations are not traced when disabled."""
+        profiler = PhaseProfiler(memory=False)
+        profiler.start()
+        with profiler.phase(0, "allocate", lambda: 0):
+            [0] * 1000
+        profiler.stop()
+        assert profiler.frame()["PeakBytes"].tolist() == [0]
@@ -0,0 +1,86 @@
+from cowsim.environment.recorder import Recorder
+import numpy as np
+
+
+class RecorderTest:
+    """Tests for the Recorder class."""
+
+    def test_record(self):
+        """Test recording per-entity metrics in long format."""
+        recorder = Recorder()
+        recorder.record("Cow", "milk", 0, np.array([0, 1]), np.array([1.0, 2.0]))
+        recorder.record("Cow", "milk", 1, np.array([1, 2]), np.array([3.0, 4.0]))
+
+        frame = recorder.long_frame("Cow", "milk")
+        assert frame["Step"].tolist() == [0, 0, 1, 1]
+        assert frame["Id"].tolist() == [0, 1, 1, 2]
+        assert frame["Value"].tolist() == [1.0, 2.0, 3.0, 4.0]
+        assert recorder.entity_metrics("Cow") == ["milk"]
+
+    def test_typed_values(self):
+        """Test that the type of the first recorded values is kept."""
+        recorder = Recorder()
+        recorder.record("Cow", "feeding", 0, np.array([0]), np.array([3]))
+        assert recorder.long_frame("Cow", "feeding")["Value"].dtype == np.int64
+
+    def test_wide_frame(self):
+        """Test pivoting a metric to one column per entity."""
+        recorder = Recorder()
+        recorder.record("Cow", "milk", 0, np.array([0, 1]), np.array([1.0, 2.0]))
+        recorder.record("Cow", "milk", 1, np.array([1]), np.array([3.0]))
+
+        frame = recorder.wide_frame("Cow", "milk", 3)
+        assert frame.index.name == "Step"
+        assert list(frame.index) == [0, 1, 2]
+        assert list(frame.columns) == [0, 1]
+        assert frame[1].tolist()[:2] == [2.0, 3.0]
+        assert np.isnan(frame[0][1])
+        assert frame.loc[2].isna().all()
+
+        assert recorder.wide_frame("Cow", "methane", 2).shape == (2, 0)
+
+    def test_register(self):
+        """Test that registered entities are reported without records."""
+        recorder = Recorder()
+        recorder.register("Cow", 0, np.array([0, 1]))
+        recorder.register("Cow", 1, np.array([2]))
+        recorder.record("Cow", "milk", 1, np.array([1]), np.array([3.0]))
+
+        assert recorder.registered("Cow").tolist() == [0, 1, 2]
+        assert recorder.registry_frame("Cow")["Step"].tolist() == [0, 0, 1]
+
+        frame = recorder.wide_frame("Cow", "milk", 2)
+        assert list(frame.columns) == [0, 1, 2]
+        assert frame[2].isna().all()
+        assert frame[1][1] == 3.0
+
+    def test_aggregate_series(self):
+        """Test recording herd-level metrics."""
+        recorder = Recorder()
+        recorder.record_aggregate("Cow", "population", 0, 10)
+        recorder.record_aggregate("Cow", "population", 1, 12)
+
+        series = recorder.aggregate_series("Cow", "population", 3)
+        assert series.name == "Cow"
+        assert series.tolist()[:2] == [10, 12]
+        assert np.isnan(series[2])
+        assert recorder.aggregate_metrics("Cow") == ["population"]
+
+    def test_snapshot(self):
+        """Test rebuilding a recorder from its snapshot."""
+        recorder = Recorder()
+        recorder.register("Cow", 0, np.array([0, 1]))
+        recorder.record("Cow", "feeding", 0, np.array([0, 1]), np.array([3, 4]))
+        recorder.record_aggregate("Cow", "population", 0, 2)
+
+        restored = Recorder.from_snapshot(recorder.snapshot())
+        assert restored.keys() == ["Cow"]
+        assert restored.registered("Cow").tolist() == [0, 1]
+        assert restored.long_frame("Cow", "feeding").equals(
+            recorder.long_frame("Cow", "feeding")
+        )
+        assert restored.aggregate_series("Cow", "population", 1).tolist() == [2]
+
+        # Restored buffers keep recording.
+        restored.record("Cow", "feeding", 1, np.array([1]), np.array([5]))
+        assert restored.long_frame("Cow", "feeding")["Value"].tolist() == [3, 4, 5]
@@ -0,0 +1,62 @@
+from cowsim.environment import report
+from cowsim.environment.cowpen import CowPen
+from cowsim.entity.cow.purple_angus import PurpleAngus
+import json
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def cowpen():
+    cowpen = CowPen([(PurpleAngus, 10)], max_steps=3)
+    cowpen.run()
+    return cowpen
+
+
+class ReportTest:
+    """Tests for the report backends."""
+
+    def test_csv(self, cowpen, tmp_path):
+        """Test that CSV remains the default format."""
+        cowpen.report(tmp_path)
+        for table in ("population", "entities", "feeding", "milk", "methane"):
+            assert (tmp_path / f"PurpleAngus_{table}.csv").is_file()
+
+    def test_parquet(self, cowpen, tmp_path):
+        """Test the Parquet format."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        cowpen.report(tmp_path, report.PARQUET_FORMAT)
+
+        table = pq.read_table(tmp_path / "PurpleAngus_milk.parquet")
+        assert table.column_names == ["Step", "Id", "Value"]
+        assert str(table.schema.field("Step").type) == "int32"
+        assert str(table.schema.field("Value").type) == "double"
+        metadata = json.loads(table.schema.metadata[b"cowsim"])
+        assert metadata == cowpen.parameters
+
+        registry = pq.read_table(tmp_path / "PurpleAngus_registry.parquet")
+        assert registry.num_rows == len(cowpen.recorder.registered("PurpleAngus"))
+
+    def test_npz(self, cowpen, tmp_path):
+        """Test the NumPy archive format."""
+        cowpen.report(tmp_path, report.NPZ_FORMAT)
+
+        with np.load(tmp_path / "PurpleAngus.npz") as archive:
+            assert archive["feeding__Value"].dtype == np.int64
+            assert archive["population__Value"][0] == 10
+            metadata = json.loads(str(archive["metadata"]))
+        assert metadata["max_steps"] == 3
+
+    def test_columnar_fallback(self, monkeypatch):
+        """Test that the columnar format falls back to NumPy archives."""
+        monkeypatch.setattr(report, "pyarrow", None)
+        assert isinstance(
+            report.report_backend(report.COLUMNAR_FORMAT), report.NpzReport
+        )
+        with pytest.raises(RuntimeError):
+            report.report_backend(report.PARQUET_FORMAT)
+
+    def test_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(RuntimeError):
+            report.report_backend("xlsx")
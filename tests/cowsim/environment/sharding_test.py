@@ -0,0 +1,55 @@
+from cowsim.entity.cow.purple_angus import PurpleAngus
+from cowsim.entity.population import Population
+from cowsim.environment.sharding import ShardPool
+import numpy as np
+import pytest
+
+
+def make_population(quantity: int) -> Population:
+    population = Population(PurpleAngus)
+    population.extend(
+        np.arange(quantity, dtype=np.int64), *PurpleAngus.generate_batch(quantity)
+    )
+    return population
+
+
+class ShardPoolTest:
+    """Tests for the ShardPool class."""
+
+    def test_bounds(self):
+        """Test that shards cover the herd with near equal sizes."""
+        bounds = ShardPool(3).bounds(10)
+        assert bounds[0][0] == 0
+        assert bounds[-1][1] == 10
+        assert all(a[1] == b[0] for a, b in zip(bounds[:-1], bounds[1:]))
+        assert {stop - start for start, stop in bounds} <= {3, 4}
+        assert ShardPool(4).bounds(2) == [(0, 0), (0, 1), (1, 1), (1, 2)]
+
+    def test_map(self, monkeypatch):
+        """Test that threaded and serial shards give the same results."""
+        population = make_population(1000)
+        pool = ShardPool(4)
+
+        def kernel(shard, rng, offset):
+            shard.calories[:] = 0
+            return shard.ids + offset + rng.integers(0, 1)
+
+        offsets = np.arange(1000)
+        rngs = [np.random.default_rng(i) for i in range(4)]
+        serial = pool.map(kernel, population, rngs, [offsets])
+        assert np.array_equal(serial, 2 * np.arange(1000))
+        assert np.all(population.calories == 0)
+
+        monkeypatch.setattr(ShardPool, "MIN_PARALLEL_SIZE", 0)
+        threaded = pool.map(kernel, population, rngs, [offsets])
+        assert pool._executor is not None
+        pool.close()
+        assert pool._executor is None
+        assert np.array_equal(threaded, serial)
+
+    def test_invalid(self):
+        """Test rejecting empty pools."""
+        with pytest.raises(ValueError):
+            ShardPool(0)
+        with pytest.raises(ValueError):
+            ShardPool(2, workers=0)
@@ -0,0 +1,20 @@
+from cowsim.environment.sink import CsvSink
+import numpy as np
+import pandas as pd
+
+
+class CsvSinkTest:
+    """Tests for the CsvSink class."""
+
+    def test_write(self, tmp_path):
+        """Test that chunks are appended below a single header."""
+        sink = CsvSink(tmp_path / "out")
+        sink.write("Cow_milk", {"Step": np.array([0, 0]), "Value": np.array([1, 2])})
+        sink.write("Cow_milk", {"Step": np.array([1]), "Value": np.array([3])})
+
+        # Written rows are readable before the sink is closed.
+        frame = pd.read_csv(tmp_path / "out" / "Cow_milk.csv")
+        assert frame["Step"].tolist() == [0, 0, 1]
+        assert frame["Value"].tolist() == [1, 2, 3]
+
+        sink.close()
@@ -0,0 +1,37 @@
+from cowsim.utils.buffer import ColumnBuffer
+import numpy as np
+import pytest
+
+
+class ColumnBufferTest:
+    """Tests for the ColumnBuffer class."""
+
+    def test_append(self):
+        """Test appending arrays and scalars across growth."""
+        buffer = ColumnBuffer({"Step": np.int32, "Value": np.float64}, capacity=2)
+        buffer.append(3, Step=0, Value=np.array([1.0, 2.0, 3.0]))
+        buffer.append(2, Step=1, Value=np.array([4.0, 5.0]))
+
+        assert len(buffer) == 5
+        assert buffer.capacity >= 5
+        assert buffer.column("Step").dtype == np.int32
+        assert np.array_equal(buffer.column("Step"), [0, 0, 0, 1, 1])
+        assert np.array_equal(buffer.column("Value"), [1, 2, 3, 4, 5])
+
+    def test_unknown_column(self):
+        """Test that rows must provide exactly the buffer's columns."""
+        buffer = ColumnBuffer({"Step": np.int32})
+        with pytest.raises(KeyError):
+            buffer.append(1, Step=0, Value=1.0)
+
+    def test_to_frame(self):
+        """Test copying rows into a data frame."""
+        buffer = ColumnBuffer({"Step": np.int32, "Value": np.float64})
+        buffer.append(2, Step=np.array([0, 1]), Value=np.array([0.5, 1.5]))
+        frame = buffer.to_frame()
+        assert list(frame.columns) == ["Step", "Value"]
+        assert frame["Value"].tolist() == [0.5, 1.5]
+
+        buffer.clear()
+        assert len(buffer) == 0
+        assert len(frame) == 2
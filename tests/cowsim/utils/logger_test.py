@@ -0,0 +1,70 @@
+from cowsim.utils.logger import (
+    LogFormatter,
+    instantiate_logger,
+    set_level,
+    start_async_logging,
+    stop_async_logging,
+)
+import logging
+import logging.handlers
+import pytest
+
+
+class LogFormatterTest:
+    """Tests for the LogFormatter class."""
+
+    def test_format(self):
+        """Test formatting records with the formatter of their level."""
+        formatter = LogFormatter()
+        debug = logging.LogRecord(
+            "test", logging.DEBUG, "file.py", 3, "a %d", (1,), None
+        )
+        info = logging.LogRecord(
+            "test", logging.INFO, "file.py", 3, "b %s", ("x",), None
+        )
+        assert "file.py:3" in formatter.format(debug)
+        assert "a 1" in formatter.format(debug)
+        assert "file.py:3" not in formatter.format(info)
+        assert "b x" in formatter.format(info)
+
+        custom = logging.LogRecord("test", 25, "file.py", 3, "c", (), None)
+        assert "c" in formatter.format(custom)
+
+
+class LoggerTest:
+    """Tests for the logger configuration helpers."""
+
+    def test_set_level(self):
+        """Test setting the logged level by name."""
+        logger = instantiate_logger("cowsim-test-level")
+        set_level("warning", logger)
+        assert not logger.isEnabledFor(logging.INFO)
+        set_level("DEBUG", logger)
+        assert logger.isEnabledFor(logging.DEBUG)
+
+        with pytest.raises(KeyError):
+            set_level("verbose", logger)
+
+    def test_async_logging(self):
+        """Test that queued records reach the original handlers."""
+        logger = logging.getLogger("cowsim-test-async")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger.addHandler(handler)
+
+        listener = start_async_logging(logger)
+        assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+        for step in range(3):
+            logger.info("Step %d", step)
+        logger.debug("Not logged")
+        stop_async_logging(listener, logger)
+
+        assert [record.getMessage() for record in records] == [
+            "Step 0",
+            "Step 1",
+            "Step 2",
+        ]
+        assert logger.handlers == [handler]
@@ -0,0 +1,73 @@
+from cowsim.utils.rng import (
+    RandomStreams,
+    as_generator,
+    default_generator,
+    hash_uniform,
+)
+import numpy as np
+
+
+class RandomStreamsTest:
+    """Tests for the RandomStreams class."""
+
+    def test_reproducible(self):
+        """Test that streams of the same seed and name draw the same values."""
+        a = RandomStreams(42).generator("feeding").random(5)
+        b = RandomStreams(42).generator("feeding").random(5)
+        assert np.array_equal(a, b)
+
+    def test_independent(self):
+        """Test that a stream does not depend on draws from other streams."""
+        streams = RandomStreams(42)
+        streams.generator("reproduction").random(1000)
+        a = streams.generator("feeding").random(5)
+        b = RandomStreams(42).generator("feeding").random(5)
+        assert np.array_equal(a, b)
+
+        c = RandomStreams(42).generator("pruning").random(5)
+        assert not np.array_equal(a, c)
+
+    def test_shared_generator(self):
+        """Test that a stream's generator is created once."""
+        streams = RandomStreams(0)
+        assert streams.generator("feeding") is streams.generator("feeding")
+
+    def test_seed(self):
+        """Test that an unseeded tree exposes the entropy it was seeded with."""
+        streams = RandomStreams()
+        again = RandomStreams(streams.seed)
+        assert np.array_equal(
+            streams.generator("setup").random(5), again.generator("setup").random(5)
+        )
+        assert RandomStreams(7).seed == 7
+
+    def test_as_generator(self):
+        """Test the fallback to the default generator."""
+        rng = np.random.default_rng(0)
+        assert as_generator(rng) is rng
+        assert as_generator() is default_generator()
+
+    def test_state(self):
+        """Test restoring the state of the streams."""
+        streams = RandomStreams(1)
+        streams.generator("feeding").random(10)
+        state = streams.state()
+        expected = streams.generator("feeding").random(5)
+
+        restored = RandomStreams(1)
+        restored.set_state(state)
+        assert np.array_equal(restored.generator("feeding").random(5), expected)
+
+
+class HashUniformTest:
+    """Tests for the hash_uniform function."""
+
+    def test_hash_uniform(self):
+        """Test that hashes are stable, salted and uniform over [0, 1)."""
+        values = np.arange(100000)
+        u = hash_uniform(values, 7)
+        assert np.array_equal(u, hash_uniform(values, 7))
+        assert np.array_equal(u[10:20], hash_uniform(values[10:20], 7))
+        assert not np.array_equal(u, hash_uniform(values, 8))
+        assert np.all((u >= 0) & (u < 1))
+        assert abs(np.mean(u < 0.1) - 0.1) < 0.01